@@ -1,70 +1,183 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from httpx import Response
+from httpx import AsyncBaseTransport, BaseTransport, Response
 
-from src.api_clients.base import APIClient
-from src.config import config
+from src.api_clients.base import APIClient, AsyncAPIClient, HTTPClientRegistry
+from src.api_clients.batching import ChunkedFilterResult, chunk_filter_body, merge_filter_responses
+from src.api_clients.capture import CaptureWriter
+from src.api_clients.encoding import JSON_CONTENT_TYPE
+from src.api_clients.timing import TimingRecorder
+from src.config import DEFAULT_MAX_CONNECTIONS, AuthServiceConfig, config
 
 HEADERS_KEY = "headers"
 JSON_KEY = "json"
+CONTENT_KEY = "content"
+CONTENT_TYPE_KEY = "Content-Type"
 X_TELEGRAM_USER_ID_KEY = "X-Telegram-User-Id"
 AUTHORIZATION_KEY = "Authorization"
 
+METRICS_PATH = "/metrics"
+HEALTH_PATH = "/api/v0/health"
+FILTER_NOTES_PATH = "/api/v0/auth/notes/filter"
+LOGIN_PATH = "/api/v0/auth/login"
+UPDATE_RESOURCE_PATH = "/api/v0/resources/update"
+
+
+def _build_request_kwargs(
+    token: str | None = None,
+    body: dict[str, Any] | bytes | None = None,
+    x_telegram_user_id: str | None = None,
+) -> dict[str, Any]:
+    """
+    Собирает заголовки и тело запроса, общие для sync- и async-клиентов.
+    Тело bytes считается уже сериализованным JSON и отправляется без повторного кодирования.
+    """
+    kwargs: dict = {HEADERS_KEY: {}}
+
+    if token is not None:
+        kwargs[HEADERS_KEY][AUTHORIZATION_KEY] = f"Bearer {token}"
+
+    if x_telegram_user_id is not None:
+        kwargs[HEADERS_KEY][X_TELEGRAM_USER_ID_KEY] = x_telegram_user_id
+
+    if isinstance(body, bytes):
+        kwargs[CONTENT_KEY] = body
+        kwargs[HEADERS_KEY][CONTENT_TYPE_KEY] = JSON_CONTENT_TYPE
+    elif body is not None:
+        kwargs[JSON_KEY] = body
+    return kwargs
+
+
 class AuthServiceAPIClient(APIClient):
     """Клиент для работы с API сервиса авторизации"""
 
-    def __init__(self) -> None:
-        super().__init__()
-        self.client.base_url = str(config.auth_service.base_url)
-        self.client.timeout = config.auth_service.timeout
+    def __init__(
+        self,
+        timing_recorder: TimingRecorder | None = None,
+        registry: HTTPClientRegistry | None = None,
+        capture_writer: CaptureWriter | None = None,
+        transport: BaseTransport | None = None,
+    ) -> None:
+        super().__init__(config.auth_service, timing_recorder, registry, capture_writer, transport)
 
     def get_metrics(self) -> Response:
-        return self.client.get("/metrics")
+        return self.client.get(METRICS_PATH)
 
 class AuthServiceV0APIClient(AuthServiceAPIClient):
     """Клиент для работы с API сервиса авторизации v0"""
 
     def get_health(self) -> Response:
-        return self.client.get("/api/v0/health")
+        return self.client.get(HEALTH_PATH)
 
-    def filter_notes(self, 
-    token: str | None = None, 
-    body: dict | None = None, 
+    def filter_notes(self,
+    token: str | None = None,
+    body: dict | bytes | None = None,
     x_telegram_user_id: str | None = None) -> Response:
         """
         Фильтрует заметки по заданным параметрам.
         """
+        kwargs = _build_request_kwargs(token, body, x_telegram_user_id)
+        return self.client.post(FILTER_NOTES_PATH, **kwargs)
 
-        kwargs: dict = {HEADERS_KEY: {}}
-
-        if token is not None:
-            kwargs[HEADERS_KEY][AUTHORIZATION_KEY] = f"Bearer {token}"
-
-        if x_telegram_user_id is not None:
-            kwargs[HEADERS_KEY][X_TELEGRAM_USER_ID_KEY] = x_telegram_user_id
-
-        if body is not None:
-            kwargs[JSON_KEY] = body
-        return self.client.post("/api/v0/auth/notes/filter", **kwargs)
+    def filter_notes_chunked(
+        self,
+        body: dict[str, Any],
+        token: str | None = None,
+        x_telegram_user_id: str | None = None,
+        chunk_size: int | None = None,
+    ) -> ChunkedFilterResult:
+        """
+        Фильтрует большой список note_ids параллельными запросами по chunk_size id
+        (по умолчанию auth_service.filter_notes_chunk_size) и объединяет notes.
+        """
+        bodies = chunk_filter_body(body, chunk_size or config.auth_service.filter_notes_chunk_size)
+        # потоков не больше, чем соединений в пуле клиента: лишние всё равно ждали бы соединение
+        max_workers = min(len(bodies), config.auth_service.http.max_connections or DEFAULT_MAX_CONNECTIONS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(executor.map(
+                lambda chunk_body: self.filter_notes(token, chunk_body, x_telegram_user_id),
+                bodies,
+            ))
+        return merge_filter_responses(responses)
 
     def login(self, req: dict[str, Any] | None) -> Response:
-        return self.client.post("/api/v0/auth/login", json=req)
+        return self.client.post(LOGIN_PATH, json=req)
 
     def update_resource(
         self,
-        req: dict[str, Any] | None,
+        req: dict[str, Any] | bytes | None,
         token: str | None = None,
         x_telegram_user_id: str | None = None
     ) -> Response:
-        kwargs: dict = {HEADERS_KEY: {}}
+        kwargs = _build_request_kwargs(token, req, x_telegram_user_id)
+        return self.client.post(UPDATE_RESOURCE_PATH, **kwargs)
+
+
+class AsyncAuthServiceAPIClient(AsyncAPIClient):
+    """
+    Асинхронный клиент для работы с API сервиса авторизации.
+
+    service_config подменяет секцию auth_service конфигурации, например адрес при воспроизведении трафика.
+    """
+
+    def __init__(
+        self,
+        timing_recorder: TimingRecorder | None = None,
+        capture_writer: CaptureWriter | None = None,
+        transport: AsyncBaseTransport | None = None,
+        service_config: AuthServiceConfig | None = None,
+    ) -> None:
+        super().__init__(service_config or config.auth_service, timing_recorder, capture_writer, transport)
+
+    async def get_metrics(self) -> Response:
+        return await self.client.get(METRICS_PATH)
+
+
+class AsyncAuthServiceV0APIClient(AsyncAuthServiceAPIClient):
+    """Асинхронный клиент для работы с API сервиса авторизации v0"""
+
+    async def get_health(self) -> Response:
+        return await self.client.get(HEALTH_PATH)
+
+    async def filter_notes(
+        self,
+        token: str | None = None,
+        body: dict | bytes | None = None,
+        x_telegram_user_id: str | None = None,
+    ) -> Response:
+        """
+        Фильтрует заметки по заданным параметрам.
+        """
+        kwargs = _build_request_kwargs(token, body, x_telegram_user_id)
+        return await self.client.post(FILTER_NOTES_PATH, **kwargs)
 
-        if token is not None:
-            kwargs[HEADERS_KEY][AUTHORIZATION_KEY] = f"Bearer {token}"
+    async def filter_notes_chunked(
+        self,
+        body: dict[str, Any],
+        token: str | None = None,
+        x_telegram_user_id: str | None = None,
+        chunk_size: int | None = None,
+    ) -> ChunkedFilterResult:
+        """
+        Фильтрует большой список note_ids конкурентными запросами по chunk_size id
+        (по умолчанию auth_service.filter_notes_chunk_size) и объединяет notes.
+        """
+        bodies = chunk_filter_body(body, chunk_size or config.auth_service.filter_notes_chunk_size)
+        responses = await asyncio.gather(*(
+            self.filter_notes(token, chunk_body, x_telegram_user_id) for chunk_body in bodies
+        ))
+        return merge_filter_responses(responses)
 
-        if req is not None:
-            kwargs[JSON_KEY] = req
-        
-        if x_telegram_user_id is not None:
-            kwargs[HEADERS_KEY][X_TELEGRAM_USER_ID_KEY] = x_telegram_user_id
+    async def login(self, req: dict[str, Any] | None) -> Response:
+        return await self.client.post(LOGIN_PATH, json=req)
 
-        return self.client.post("/api/v0/resources/update", **kwargs)
+    async def update_resource(
+        self,
+        req: dict[str, Any] | bytes | None,
+        token: str | None = None,
+        x_telegram_user_id: str | None = None,
+    ) -> Response:
+        kwargs = _build_request_kwargs(token, req, x_telegram_user_id)
+        return await self.client.post(UPDATE_RESOURCE_PATH, **kwargs)
@@ -1,16 +1,227 @@
-from typing import Any
+import threading
+from types import TracebackType
+from typing import Any, Self
 
 import httpx
 
+from src.api_clients.capture import CaptureWriter, async_capture_event_hooks, capture_event_hooks
+from src.api_clients.rate_limit import (
+    RateLimiter,
+    async_rate_limit_event_hooks,
+    rate_limit_event_hooks,
+)
+from src.api_clients.timing import TimingRecorder, async_timing_event_hooks, timing_event_hooks
+from src.config import HTTPClientConfig, HTTPServiceConfig
+
+
+def build_timeout(timeout: float, http_config: HTTPClientConfig) -> httpx.Timeout:
+    """Собирает httpx.Timeout: раздельные таймауты переопределяют общий."""
+    return httpx.Timeout(
+        timeout,
+        connect=_or_default(http_config.connect_timeout, timeout),
+        read=_or_default(http_config.read_timeout, timeout),
+        write=_or_default(http_config.write_timeout, timeout),
+        pool=_or_default(http_config.pool_timeout, timeout),
+    )
+
+
+def build_limits(http_config: HTTPClientConfig) -> httpx.Limits:
+    """Собирает лимиты пула соединений из конфигурации."""
+    return httpx.Limits(
+        max_connections=http_config.max_connections,
+        max_keepalive_connections=http_config.max_keepalive_connections,
+        keepalive_expiry=http_config.keepalive_expiry,
+    )
+
+
+def client_options(service_config: HTTPServiceConfig | None) -> dict[str, Any]:
+    """Параметры конструктора httpx.Client/httpx.AsyncClient для сервиса."""
+    if service_config is None:
+        return {}
+
+    return {
+        "base_url": str(service_config.base_url),
+        "timeout": build_timeout(service_config.timeout, service_config.http),
+        "limits": build_limits(service_config.http),
+        "http2": service_config.http.http2,
+    }
+
+
+def _or_default(configured: float | None, default: float) -> float:
+    return default if configured is None else configured
+
+
+def _rate_limiter(service_config: HTTPServiceConfig | None) -> RateLimiter | None:
+    if service_config is None or service_config.rate_limit is None:
+        return None
+    return RateLimiter.from_config(service_config.rate_limit)
+
+
+def merge_event_hooks(
+    *hook_sets: dict[str, list[Any]],
+) -> dict[str, list[Any]]:
+    """Объединяет event hooks; порядок наборов сохраняется."""
+    merged: dict[str, list[Any]] = {"request": [], "response": []}
+    for hooks in hook_sets:
+        for event, event_hooks in hooks.items():
+            merged[event].extend(event_hooks)
+    return merged
+
+
+def build_client(
+    service_config: HTTPServiceConfig | None,
+    timing_recorder: TimingRecorder | None = None,
+    capture_writer: CaptureWriter | None = None,
+    transport: httpx.BaseTransport | None = None,
+) -> httpx.Client:
+    """
+    Собирает httpx.Client сервиса с лимитом частоты, замером таймингов и записью трафика.
+
+    transport подменяет сетевой транспорт, например заглушкой сервиса из src.standins.
+    """
+    hook_sets = []
+    # лимит выдерживается до старта замера, чтобы ожидание не попадало в задержку
+    rate_limiter = _rate_limiter(service_config)
+    if rate_limiter is not None:
+        hook_sets.append(rate_limit_event_hooks(rate_limiter))
+    if timing_recorder is not None:
+        hook_sets.append(timing_event_hooks(timing_recorder))
+    if capture_writer is not None:
+        hook_sets.append(capture_event_hooks(capture_writer))
+    return httpx.Client(
+        **client_options(service_config),
+        event_hooks=merge_event_hooks(*hook_sets),
+        transport=transport,
+    )
+
+
+def build_async_client(
+    service_config: HTTPServiceConfig | None,
+    timing_recorder: TimingRecorder | None = None,
+    capture_writer: CaptureWriter | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Собирает httpx.AsyncClient сервиса с лимитом частоты, замером таймингов и записью трафика."""
+    hook_sets = []
+    rate_limiter = _rate_limiter(service_config)
+    if rate_limiter is not None:
+        hook_sets.append(async_rate_limit_event_hooks(rate_limiter))
+    if timing_recorder is not None:
+        hook_sets.append(async_timing_event_hooks(timing_recorder))
+    if capture_writer is not None:
+        hook_sets.append(async_capture_event_hooks(capture_writer))
+    return httpx.AsyncClient(
+        **client_options(service_config),
+        event_hooks=merge_event_hooks(*hook_sets),
+        transport=transport,
+    )
+
+
+class HTTPClientRegistry:
+    """
+    Общие httpx.Client: один пул соединений на конфигурацию сервиса
+    (base_url, пул, таймауты, лимиты), регистратор таймингов и запись трафика.
+
+    Клиенты живут до close(); APIClient, взявший клиент из реестра, его не закрывает.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[tuple[str, int, int, int], httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        service_config: HTTPServiceConfig,
+        timing_recorder: TimingRecorder | None = None,
+        capture_writer: CaptureWriter | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ) -> httpx.Client:
+        key = (
+            service_config.model_dump_json(),
+            id(timing_recorder),
+            id(capture_writer),
+            id(transport),
+        )
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = build_client(service_config, timing_recorder, capture_writer, transport)
+                self._clients[key] = client
+            return client
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+# общий на процесс реестр: сессия pytest закрывает его в фикстуре http_client_registry
+http_clients = HTTPClientRegistry()
+
 
 class APIClient:
     """Клиент для работы с API"""
 
-    def __init__(self) -> None:
-        self.client = httpx.Client()
+    def __init__(
+        self,
+        service_config: HTTPServiceConfig | None = None,
+        timing_recorder: TimingRecorder | None = None,
+        registry: HTTPClientRegistry | None = None,
+        capture_writer: CaptureWriter | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        if registry is not None and service_config is not None:
+            self.client = registry.get(service_config, timing_recorder, capture_writer, transport)
+            self._owns_client = False
+        else:
+            self.client = build_client(service_config, timing_recorder, capture_writer, transport)
+            self._owns_client = True
 
     def get(self, url: str, **kwargs: Any) -> httpx.Response:
         return self.client.get(url, **kwargs)
 
     def post(self, url: str, **kwargs: Any) -> httpx.Response:
         return self.client.post(url, **kwargs)
+
+    def close(self) -> None:
+        """Закрывает собственный клиент; общий клиент закрывает реестр."""
+        if self._owns_client:
+            self.client.close()
+
+
+class AsyncAPIClient:
+    """Асинхронный клиент для работы с API (несколько запросов в полёте из одного потока)"""
+
+    def __init__(
+        self,
+        service_config: HTTPServiceConfig | None = None,
+        timing_recorder: TimingRecorder | None = None,
+        capture_writer: CaptureWriter | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.client = build_async_client(service_config, timing_recorder, capture_writer, transport)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.client.get(url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.client.post(url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
@@ -0,0 +1,69 @@
+"""Разбиение большого списка note_ids для filter_notes на параллельные чанки."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from src.common.fields import NOTE_IDS_FIELD, NOTES_FIELD
+
+
+def split_note_ids(note_ids: Sequence[str], chunk_size: int) -> list[list[str]]:
+    """Делит список на чанки не длиннее chunk_size, сохраняя порядок."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    return [
+        list(note_ids[offset:offset + chunk_size])
+        for offset in range(0, len(note_ids), chunk_size)
+    ]
+
+
+def chunk_filter_body(
+    body: dict[str, Any],
+    chunk_size: int,
+) -> list[dict[str, Any]]:
+    """
+    Тела запросов filter_notes: все поля body, note_ids по чанкам.
+    Тело без note_ids отправляется как есть, чтобы сервис вернул свою ошибку.
+    """
+    if not body.get(NOTE_IDS_FIELD):
+        return [body]
+    return [
+        {**body, NOTE_IDS_FIELD: chunk}
+        for chunk in split_note_ids(body[NOTE_IDS_FIELD], chunk_size)
+    ]
+
+
+@dataclass(frozen=True)
+class ChunkedFilterResult:
+    """Ответы по всем чанкам и объединённый словарь notes успешных ответов."""
+
+    responses: tuple[httpx.Response, ...]
+    notes: dict[str, Any]
+
+    @property
+    def failed(self) -> tuple[httpx.Response, ...]:
+        return tuple(response for response in self.responses if not response.is_success)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def merge_filter_responses(responses: Sequence[httpx.Response]) -> ChunkedFilterResult:
+    """
+    Объединяет notes из ответов чанков; неуспешные ответы остаются в failed.
+    Успешный ответ без notes — ошибка формата ответа сервиса, а не пустой результат.
+    """
+    notes: dict[str, Any] = {}
+    for response in responses:
+        if not response.is_success:
+            continue
+        payload = response.json()
+        if NOTES_FIELD not in payload:
+            raise ValueError(
+                f"filter_notes response {response.status_code} has no {NOTES_FIELD!r} field: {response.text}",
+            )
+        notes.update(payload[NOTES_FIELD])
+    return ChunkedFilterResult(responses=tuple(responses), notes=notes)
@@ -0,0 +1,238 @@
+"""
+Запись трафика API-клиентов для последующего воспроизведения.
+
+Каждый обмен (запрос и ответ) дописывается одной строкой JSON в файл,
+открытый на добавление. Тела в UTF-8 пишутся как текст, остальные — в base64.
+Значения заголовков с учётными данными (Authorization, Cookie, Set-Cookie)
+и полей client_secret и access_token в JSON-телах в файл не попадают: вместо
+них пишется REDACTED, при воспроизведении Authorization выставляется заново
+из актуального токена.
+"""
+
+import base64
+import binascii
+import json
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+import httpx
+
+from src.common import fields
+
+CAPTURE_EXTENSION = "capture_started"
+
+BODY_UTF8 = "utf-8"
+BODY_BASE64 = "base64"
+REDACTED = "<redacted>"
+AUTHORIZATION_HEADER = "authorization"
+
+# заголовки, которые httpx выставляет сам при повторной отправке
+_TRANSPORT_HEADERS = frozenset(("host", "content-length", "transfer-encoding", "connection"))
+_SECRET_HEADERS = frozenset((AUTHORIZATION_HEADER, "proxy-authorization", "cookie", "set-cookie"))
+_SECRET_FIELDS = frozenset((fields.CLIENT_SECRET_FIELD, fields.ACCESS_TOKEN_FIELD))
+
+
+@dataclass(frozen=True)
+class CapturedExchange:
+    """
+    Записанный обмен.
+
+    offset — момент отправки в секундах от начала записи, duration — время
+    до полного чтения тела ответа.
+    """
+
+    offset: float
+    base_url: str
+    method: str
+    path: str
+    request_headers: list[tuple[str, str]]
+    request_body: str
+    request_body_encoding: str
+    status_code: int
+    response_headers: list[tuple[str, str]]
+    response_body: str
+    response_body_encoding: str
+    duration: float
+
+    def request_content(self) -> bytes:
+        return decode_body(self.request_body, self.request_body_encoding)
+
+    @property
+    def authorized(self) -> bool:
+        """Запрос был с Authorization, значение которого вырезано при записи."""
+        return any(name.lower() == AUTHORIZATION_HEADER for name, _ in self.request_headers)
+
+    def replay_headers(self, token: str | None = None) -> list[tuple[str, str]]:
+        """Заголовки для повторной отправки; Authorization — Bearer token, если он передан."""
+        headers = [
+            (name, header_value) for name, header_value in self.request_headers
+            if name.lower() not in _TRANSPORT_HEADERS | _SECRET_HEADERS
+        ]
+        if token is not None and self.authorized:
+            headers.append((AUTHORIZATION_HEADER, f"Bearer {token}"))
+        return headers
+
+
+def redact_headers(headers: httpx.Headers) -> list[tuple[str, str]]:
+    """Заголовки для записи: значения с учётными данными заменены на REDACTED."""
+    return [
+        (name, REDACTED if name.lower() in _SECRET_HEADERS else header_value)
+        for name, header_value in headers.multi_items()
+    ]
+
+
+def _redact_json(payload: Any) -> Any:
+    if isinstance(payload, dict):
+        return {
+            key: REDACTED if key in _SECRET_FIELDS else _redact_json(field_value)
+            for key, field_value in payload.items()
+        }
+    if isinstance(payload, list):
+        return [_redact_json(element) for element in payload]
+    return payload
+
+
+def redact_body(raw_body: bytes) -> bytes:
+    """Тело для записи: в JSON значения client_secret и access_token заменены на REDACTED."""
+    try:
+        payload = json.loads(raw_body)
+    except ValueError:
+        return raw_body
+    redacted = _redact_json(payload)
+    if redacted == payload:
+        return raw_body
+    return json.dumps(redacted, ensure_ascii=False).encode(BODY_UTF8)
+
+
+def encode_body(raw_body: bytes) -> tuple[str, str]:
+    try:
+        return raw_body.decode(BODY_UTF8), BODY_UTF8
+    except UnicodeDecodeError:
+        return base64.b64encode(raw_body).decode("ascii"), BODY_BASE64
+
+
+def decode_body(body: str, encoding: str) -> bytes:
+    if encoding == BODY_UTF8:
+        return body.encode(BODY_UTF8)
+    if encoding == BODY_BASE64:
+        try:
+            return base64.b64decode(body, validate=True)
+        except binascii.Error as exc:
+            raise ValueError(f"invalid base64 body: {exc}") from exc
+    raise ValueError(f"unknown body encoding: {encoding}")
+
+
+class CaptureWriter:
+    """Потокобезопасная запись обменов в JSONL; каждая строка сбрасывается на диск сразу."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._stream: TextIO = path.open("a", encoding=BODY_UTF8)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def offset(self) -> float:
+        """Секунды от начала записи."""
+        return time.perf_counter() - self._started
+
+    def write(self, exchange: CapturedExchange) -> None:
+        line = json.dumps(asdict(exchange), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._stream.write(f"{line}\n")
+            self._stream.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._stream.close()
+
+
+def read_capture(path: Path) -> Iterator[CapturedExchange]:
+    """Читает записанные обмены по порядку записи; пустые строки пропускаются."""
+    with path.open(encoding=BODY_UTF8) as capture:
+        for line_number, line in enumerate(capture, start=1):
+            if not line.strip():
+                continue
+            try:
+                exchange = _parse_exchange(line)
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ValueError(f"{path}:{line_number}: invalid captured exchange: {exc!r}") from exc
+            yield exchange
+
+
+def _parse_exchange(line: str) -> CapturedExchange:
+    payload = json.loads(line)
+    payload["request_headers"] = [tuple(header) for header in payload["request_headers"]]
+    payload["response_headers"] = [tuple(header) for header in payload["response_headers"]]
+    return CapturedExchange(**payload)
+
+
+def base_url_of(url: httpx.URL) -> str:
+    """Схема, хост и порт URL без пути — как base_url в записи."""
+    root = url.copy_with(path="/", query=None, fragment=None)
+    return str(root).rstrip("/")
+
+
+def _exchange(response: httpx.Response, started: float, offset: float) -> CapturedExchange:
+    request = response.request
+    request_body, request_body_encoding = encode_body(redact_body(request.content))
+    response_body, response_body_encoding = encode_body(redact_body(response.content))
+    return CapturedExchange(
+        offset=offset,
+        base_url=base_url_of(request.url),
+        method=request.method,
+        path=request.url.raw_path.decode("ascii"),
+        request_headers=redact_headers(request.headers),
+        request_body=request_body,
+        request_body_encoding=request_body_encoding,
+        status_code=response.status_code,
+        response_headers=redact_headers(response.headers),
+        response_body=response_body,
+        response_body_encoding=response_body_encoding,
+        duration=time.perf_counter() - started,
+    )
+
+
+class _CaptureHooks:
+    """Event hooks httpx.Client: отметка начала по запросу, запись обмена по ответу."""
+
+    def __init__(self, writer: CaptureWriter) -> None:
+        self._writer = writer
+
+    def on_request(self, request: httpx.Request) -> None:
+        request.extensions[CAPTURE_EXTENSION] = (time.perf_counter(), self._writer.offset())
+
+    def on_response(self, response: httpx.Response) -> None:
+        response.read()
+        started, offset = response.request.extensions[CAPTURE_EXTENSION]
+        self._writer.write(_exchange(response, started, offset))
+
+
+class _AsyncCaptureHooks:
+    """То же для httpx.AsyncClient."""
+
+    def __init__(self, writer: CaptureWriter) -> None:
+        self._writer = writer
+
+    async def on_request(self, request: httpx.Request) -> None:
+        request.extensions[CAPTURE_EXTENSION] = (time.perf_counter(), self._writer.offset())
+
+    async def on_response(self, response: httpx.Response) -> None:
+        await response.aread()
+        started, offset = response.request.extensions[CAPTURE_EXTENSION]
+        self._writer.write(_exchange(response, started, offset))
+
+
+def capture_event_hooks(writer: CaptureWriter) -> dict[str, list[Any]]:
+    """Event hooks для httpx.Client, дописывающие каждый обмен в writer."""
+    hooks = _CaptureHooks(writer)
+    return {"request": [hooks.on_request], "response": [hooks.on_response]}
+
+
+def async_capture_event_hooks(writer: CaptureWriter) -> dict[str, list[Any]]:
+    """Event hooks для httpx.AsyncClient, дописывающие каждый обмен в writer."""
+    hooks = _AsyncCaptureHooks(writer)
+    return {"request": [hooks.on_request], "response": [hooks.on_response]}
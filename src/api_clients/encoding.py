@@ -0,0 +1,41 @@
+"""Заранее сериализованные JSON-тела запросов для горячих циклов нагрузки."""
+
+import json
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+def encode_json(payload: Any) -> bytes:
+    """Кодирует payload так же, как httpx для json=: компактно и без экранирования не-ASCII."""
+    return json.dumps(
+        payload,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        allow_nan=False,
+    ).encode("utf-8")
+
+
+class EncodedBodyCache:
+    """
+    Кэш тел запросов по ключу варианта: каждый вариант сериализуется один раз,
+    дальше клиенту передаётся тот же буфер bytes.
+    """
+
+    def __init__(self) -> None:
+        self._bodies: dict[Hashable, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> bytes:
+        """Возвращает тело варианта key, при первом обращении собирая его через build()."""
+        body = self._bodies.get(key)
+        if body is not None:
+            return body
+        encoded = encode_json(build())
+        with self._lock:
+            return self._bodies.setdefault(key, encoded)
+
+    def __len__(self) -> int:
+        return len(self._bodies)
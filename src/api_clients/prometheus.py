@@ -0,0 +1,356 @@
+"""
+Разбор текстового формата Prometheus (ответ get_metrics) и сравнение двух снимков.
+
+Снимок хранит семейства метрик с типом из ``# TYPE``; сравнение считает приращения
+счётчиков, их скорость за интервал между снимками и квантили гистограмм по
+приращениям бакетов (как histogram_quantile в Prometheus).
+"""
+
+import math
+import re
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+SUMMARY = "summary"
+UNTYPED = "untyped"
+
+BUCKET_SUFFIX = "_bucket"
+SUM_SUFFIX = "_sum"
+COUNT_SUFFIX = "_count"
+TOTAL_SUFFIX = "_total"
+LE_LABEL = "le"
+
+# суффиксы служебных рядов по типу семейства
+_FAMILY_SUFFIXES = (
+    (HISTOGRAM, (BUCKET_SUFFIX, SUM_SUFFIX, COUNT_SUFFIX)),
+    (SUMMARY, (SUM_SUFFIX, COUNT_SUFFIX)),
+    (COUNTER, (TOTAL_SUFFIX,)),
+)
+_COMMENT_KEYWORDS = frozenset(("HELP", "TYPE"))
+_ESCAPES = MappingProxyType({"\\": "\\", '"': '"', "n": "\n"})
+# [,]name="value" с экранированием \\, \" и \n внутри кавычек и необязательной запятой после
+_LABEL_PATTERN = re.compile(r'[\s,]*([^=\s,]+)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+_ESCAPE_PATTERN = re.compile(r"\\(.)")
+
+Labels = tuple[tuple[str, str], ...]
+SeriesKey = tuple[str, Labels]
+Bucket = tuple[float, float]
+Buckets = tuple[Bucket, ...]
+
+
+@dataclass(frozen=True)
+class Sample:
+    name: str
+    labels: Labels
+    value: float  # noqa: WPS110 # так называется значение ряда в формате Prometheus
+
+    def label(self, name: str) -> str | None:
+        return dict(self.labels).get(name)
+
+
+@dataclass
+class MetricFamily:
+    name: str
+    type: str = UNTYPED
+    help: str = ""
+    samples: list[Sample] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Histogram:
+    """Ряд гистограммы: накопленные счётчики по верхним границам (le), сумма и число наблюдений."""
+
+    labels: Labels
+    buckets: Buckets
+    sum: float
+    count: float
+
+    def quantile(self, quantile: float) -> float:
+        return bucket_quantile(quantile, self.buckets)
+
+
+def _labels_without(labels: Labels, excluded: str) -> Labels:
+    return tuple((name, label_value) for name, label_value in labels if name != excluded)
+
+
+def _parse_value(raw_value: str) -> float:
+    # float() понимает +Inf, -Inf и NaN в записи Prometheus
+    return float(raw_value)
+
+
+def _unescape(escape: re.Match[str]) -> str:
+    return _ESCAPES.get(escape[1], escape[1])
+
+
+def _parse_labels(raw_labels: str, line: str) -> Labels:
+    labels = []
+    position = 0
+    raw_labels = raw_labels.strip()
+    while position < len(raw_labels):
+        label = _LABEL_PATTERN.match(raw_labels, position)
+        if label is None:
+            raise ValueError(f"invalid label value in line: {line}")
+        label_value = _ESCAPE_PATTERN.sub(_unescape, label[2])
+        labels.append((label[1], label_value))
+        position = label.end()
+    return tuple(sorted(labels))
+
+
+def _split_sample(line: str) -> Sample:
+    if "{" in line:
+        name, rest = line.split("{", 1)
+        raw_labels, rest = rest.rsplit("}", 1)
+        labels = _parse_labels(raw_labels, line)
+    else:
+        name, rest = line.split(maxsplit=1)
+        labels = ()
+    raw_value = rest.split()[0]
+    return Sample(name=name.strip(), labels=labels, value=_parse_value(raw_value))
+
+
+def parse_sample(line: str) -> Sample:
+    """Разбирает строку ряда ``name{labels} value [timestamp]``."""
+    try:
+        return _split_sample(line)
+    except (ValueError, IndexError) as exc:
+        raise ValueError(f"invalid metrics line: {line}") from exc
+
+
+def _family_name(sample_name: str, families: Mapping[str, MetricFamily]) -> str:
+    if sample_name in families:
+        return sample_name
+    for family_type, suffixes in _FAMILY_SUFFIXES:
+        for suffix in suffixes:
+            base = sample_name.removesuffix(suffix)
+            family = families.get(base)
+            if base != sample_name and family is not None and family.type == family_type:
+                return base
+    return sample_name
+
+
+def _parse_comment(line: str, families: dict[str, MetricFamily]) -> None:
+    """Применяет ``# HELP`` и ``# TYPE`` к семейству; прочие комментарии пропускаются."""
+    parts = line.split(maxsplit=3)
+    if len(parts) < 3 or parts[1] not in _COMMENT_KEYWORDS:
+        return
+    keyword, name = parts[1], parts[2]
+    family = families.setdefault(name, MetricFamily(name))
+    description = parts[3] if len(parts) > 3 else ""
+    if keyword == "TYPE":
+        family.type = description
+    else:
+        family.help = description
+
+
+def _add_sample(sample: Sample, families: dict[str, MetricFamily]) -> None:
+    name = _family_name(sample.name, families)
+    families.setdefault(name, MetricFamily(name)).samples.append(sample)
+
+
+def parse_metrics(text: str) -> dict[str, MetricFamily]:
+    """Разбирает текстовый формат Prometheus в семейства метрик."""
+    families: dict[str, MetricFamily] = {}
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if line.startswith("#"):
+            _parse_comment(line, families)
+        elif line:
+            _add_sample(parse_sample(line), families)
+    return families
+
+
+def _histograms(name: str, samples: Iterable[Sample]) -> list[Histogram]:
+    """Ряды гистограммы name из её служебных рядов _bucket, _sum и _count."""
+    buckets: dict[Labels, list[Bucket]] = {}
+    totals: dict[SeriesKey, float] = {}
+    for sample in samples:
+        if sample.name == name + BUCKET_SUFFIX:
+            series_labels = _labels_without(sample.labels, LE_LABEL)
+            buckets.setdefault(series_labels, []).append(_bucket(sample))
+        else:
+            totals[sample.name, sample.labels] = sample.value
+    return [
+        _histogram(name, series_labels, tuple(sorted(series_buckets)), totals)
+        for series_labels, series_buckets in buckets.items()
+    ]
+
+
+def _bucket(sample: Sample) -> Bucket:
+    return _parse_value(sample.label(LE_LABEL) or "+Inf"), sample.value
+
+
+def _histogram(name: str, labels: Labels, buckets: Buckets, totals: Mapping[SeriesKey, float]) -> Histogram:
+    # без _count число наблюдений — наибольший накопленный счётчик бакетов
+    observed = max(cumulative for _bound, cumulative in buckets)
+    return Histogram(
+        labels=labels,
+        buckets=buckets,
+        sum=totals.get((name + SUM_SUFFIX, labels), 0),
+        count=totals.get((name + COUNT_SUFFIX, labels), observed),
+    )
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Семейства метрик и момент снятия (time.monotonic)."""
+
+    families: dict[str, MetricFamily]
+    taken_at: float
+
+    def series(self, family_type: str | None = None) -> dict[SeriesKey, float]:
+        """Значения рядов семейств заданного типа (для гистограмм и summary — все служебные ряды)."""
+        return {
+            (sample.name, sample.labels): sample.value
+            for family in self.families.values()
+            if family_type is None or family.type == family_type
+            for sample in family.samples
+        }
+
+    def histograms(self, name: str) -> list[Histogram]:
+        family = self.families.get(name)
+        if family is None or family.type != HISTOGRAM:
+            return []
+        return _histograms(name, family.samples)
+
+
+def snapshot(text: str, taken_at: float | None = None) -> MetricsSnapshot:
+    return MetricsSnapshot(
+        families=parse_metrics(text),
+        taken_at=time.monotonic() if taken_at is None else taken_at,
+    )
+
+
+def bucket_quantile(quantile: float, buckets: Buckets) -> float:
+    """
+    Квантиль (0..1) по накопленным бакетам с линейной интерполяцией внутри бакета.
+
+    Если квантиль попадает в бакет +Inf, возвращается верхняя конечная граница.
+    """
+    if not buckets or buckets[-1][1] <= 0:
+        return math.nan
+    rank = quantile * buckets[-1][1]
+    lower_bound: float = 0
+    lower_count: float = 0
+    for upper_bound, cumulative in buckets:
+        if cumulative >= rank:
+            if math.isinf(upper_bound):
+                return lower_bound
+            if cumulative == lower_count:
+                return upper_bound
+            return lower_bound + (upper_bound - lower_bound) * (rank - lower_count) / (cumulative - lower_count)
+        lower_bound, lower_count = upper_bound, cumulative
+    return lower_bound
+
+
+def _delta(before: float | None, after: float) -> float:
+    """Приращение счётчика; сброс (after < before) считается рестартом сервиса."""
+    if before is None:
+        return after
+    return after if after < before else after - before
+
+
+def _series_delta(after: Histogram, before: Histogram | None) -> Histogram:
+    """Наблюдения ряда между снимками; сброс счётчиков (рестарт сервиса) — наблюдения с нуля."""
+    if before is None or after.count < before.count:
+        return after
+    previous = dict(before.buckets)
+    return Histogram(
+        labels=after.labels,
+        buckets=tuple(
+            (upper_bound, _delta(previous.get(upper_bound), cumulative))
+            for upper_bound, cumulative in after.buckets
+        ),
+        sum=_delta(before.sum, after.sum),
+        count=_delta(before.count, after.count),
+    )
+
+
+def _merge_buckets(series: Iterable[Histogram]) -> Buckets:
+    merged: dict[float, float] = {}
+    for histogram in series:
+        for upper_bound, observed in histogram.buckets:
+            merged[upper_bound] = merged.get(upper_bound, 0) + observed
+    return tuple(sorted(merged.items()))
+
+
+@dataclass(frozen=True)
+class HistogramDelta:
+    """Наблюдения гистограммы между снимками, объединённые по всем рядам семейства."""
+
+    name: str
+    count: float
+    sum: float
+    buckets: Buckets
+
+    def quantile(self, quantile: float) -> float:
+        return bucket_quantile(quantile, self.buckets)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else math.nan
+
+
+@dataclass(frozen=True)
+class MetricsDiff:
+    """Разница двух снимков одного сервиса."""
+
+    before: MetricsSnapshot
+    after: MetricsSnapshot
+
+    @property
+    def elapsed(self) -> float:
+        return self.after.taken_at - self.before.taken_at
+
+    def counter_deltas(self) -> dict[SeriesKey, float]:
+        before = self.before.series(COUNTER)
+        return {
+            key: _delta(before.get(key), after_value)
+            for key, after_value in self.after.series(COUNTER).items()
+        }
+
+    def counter_rates(self) -> dict[SeriesKey, float]:
+        elapsed = self.elapsed
+        return {
+            key: delta / elapsed if elapsed > 0 else math.nan
+            for key, delta in self.counter_deltas().items()
+        }
+
+    def gauge_changes(self) -> dict[SeriesKey, tuple[float, float]]:
+        """Изменившиеся gauge: (было, стало); ряды, появившиеся после первого снимка, идут от nan."""
+        before = self.before.series(GAUGE)
+        return {
+            key: (before.get(key, math.nan), after_value)
+            for key, after_value in self.after.series(GAUGE).items()
+            if before.get(key) != after_value
+        }
+
+    def histogram(self, name: str) -> HistogramDelta:
+        before = {histogram.labels: histogram for histogram in self.before.histograms(name)}
+        series = [
+            _series_delta(histogram, before.get(histogram.labels))
+            for histogram in self.after.histograms(name)
+        ]
+        return HistogramDelta(
+            name=name,
+            count=sum(histogram.count for histogram in series),
+            sum=sum(histogram.sum for histogram in series),
+            buckets=_merge_buckets(series),
+        )
+
+    def histograms(self) -> Iterator[HistogramDelta]:
+        for family in self.after.families.values():
+            if family.type == HISTOGRAM:
+                yield self.histogram(family.name)
+
+
+def format_series(key: SeriesKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    rendered = ",".join(f'{label_name}="{label_value}"' for label_name, label_value in labels)
+    return f"{name}{{{rendered}}}"
@@ -0,0 +1,109 @@
+"""
+Ограничение частоты запросов API-клиентов алгоритмом token bucket.
+
+Лимиты задаются в секции ``rate_limit`` сервиса: общий (rps/burst) и по путям
+ручек (endpoints). Ожидание выполняется в request hook клиента httpx.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from src.config import RateLimitConfig
+
+
+class TokenBucket:
+    """
+    Потокобезопасное ведро токенов: rate токенов в секунду, не больше burst подряд.
+
+    Токен резервируется сразу, поэтому одно ведро можно делить между потоками
+    и корутинами: каждый вызывающий получает свой момент отправки.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Резервирует токен и возвращает, сколько секунд нужно подождать перед запросом."""
+        with self._lock:
+            now = time.monotonic()
+            refilled = self._tokens + (now - self._updated) * self.rate
+            self._tokens = min(self.burst, refilled)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Общий лимит и лимиты по путям; запрос ждёт самого строгого из подходящих вёдер."""
+
+    def __init__(
+        self,
+        global_bucket: TokenBucket | None = None,
+        endpoint_buckets: dict[str, TokenBucket] | None = None,
+    ) -> None:
+        self.global_bucket = global_bucket
+        self.endpoint_buckets = endpoint_buckets or {}
+
+    @classmethod
+    def from_config(cls, rate_limit: RateLimitConfig) -> "RateLimiter":
+        global_bucket = None
+        if rate_limit.rps is not None:
+            global_bucket = TokenBucket(rate_limit.rps, rate_limit.burst)
+        return cls(
+            global_bucket=global_bucket,
+            endpoint_buckets={
+                path: TokenBucket(rule.rps, rule.burst)
+                for path, rule in rate_limit.endpoints.items()
+            },
+        )
+
+    def reserve(self, path: str) -> float:
+        delays: list[float] = [0]
+        if self.global_bucket is not None:
+            delays.append(self.global_bucket.reserve())
+        endpoint_bucket = self.endpoint_buckets.get(path)
+        if endpoint_bucket is not None:
+            delays.append(endpoint_bucket.reserve())
+        return max(delays)
+
+    def acquire(self, path: str) -> None:
+        delay = self.reserve(path)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, path: str) -> None:
+        delay = self.reserve(path)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_request(self, request: httpx.Request) -> None:
+        """Request hook httpx.Client."""
+        self.acquire(request.url.path)
+
+    async def on_async_request(self, request: httpx.Request) -> None:
+        """Request hook httpx.AsyncClient."""
+        await self.acquire_async(request.url.path)
+
+
+def rate_limit_event_hooks(limiter: RateLimiter) -> dict[str, list[Any]]:
+    """Event hooks для httpx.Client, выдерживающие лимит перед отправкой."""
+    return {"request": [limiter.on_request]}
+
+
+def async_rate_limit_event_hooks(limiter: RateLimiter) -> dict[str, list[Any]]:
+    """Event hooks для httpx.AsyncClient, выдерживающие лимит перед отправкой."""
+    return {"request": [limiter.on_async_request]}
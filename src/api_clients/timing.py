@@ -0,0 +1,174 @@
+"""
+Замер фаз HTTP-запроса: подключение, TLS, время до первого байта, загрузка тела.
+
+Отметки снимаются через trace-расширение httpcore, которое подключается
+event hooks клиента httpx. Готовые замеры складываются в TimingRecorder.
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Protocol
+
+import httpx
+
+TRACE_EXTENSION = "trace"
+
+# события httpcore без префикса транспорта (connection./http11./http2.)
+_CONNECT_STARTED = "connect_tcp.started"
+_CONNECT_COMPLETE = "connect_tcp.complete"
+_TLS_STARTED = "start_tls.started"
+_TLS_COMPLETE = "start_tls.complete"
+_SEND_HEADERS_STARTED = "send_request_headers.started"
+_HEADERS_RECEIVED = "receive_response_headers.complete"
+
+
+@dataclass(frozen=True)
+class RequestTiming:
+    """
+    Замер одного запроса, все длительности в секундах.
+
+    connect и tls равны None, если соединение взято из пула;
+    ttfb — от отправки заголовков до получения заголовков ответа.
+    """
+
+    method: str
+    path: str
+    status_code: int
+    started_at: float
+    connect: float | None
+    tls: float | None
+    ttfb: float | None
+    download: float
+    total: float
+
+
+class TimingRecorder(Protocol):
+    """Приёмник замеров; реализация должна быть потокобезопасной."""
+
+    def record(self, timing: RequestTiming) -> None: ...
+
+
+class InMemoryTimingRecorder:
+    """Хранит замеры в памяти процесса."""
+
+    def __init__(self) -> None:
+        self._records: list[RequestTiming] = []
+        self._lock = threading.Lock()
+
+    def record(self, timing: RequestTiming) -> None:
+        with self._lock:
+            self._records.append(timing)
+
+    def records(self, start: int = 0) -> list[RequestTiming]:
+        """Копия замеров, начиная с позиции start."""
+        with self._lock:
+            return self._records[start:]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+def timings_to_json(timings: list[RequestTiming]) -> str:
+    """Сериализует замеры в JSON-массив."""
+    return json.dumps([asdict(timing) for timing in timings], indent=2)
+
+
+class _RequestTrace:
+    """Отметки времени trace-событий httpcore для одного запроса."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.marks: dict[str, float] = {}
+
+    def mark(self, event_name: str, _event_info: dict[str, Any]) -> None:
+        _transport, _sep, event = event_name.partition(".")
+        self.marks[event] = time.perf_counter()
+
+    def build(self, response: httpx.Response, headers_received: float) -> RequestTiming:
+        finished = time.perf_counter()
+        headers_received = self.marks.get(_HEADERS_RECEIVED, headers_received)
+        return RequestTiming(
+            method=response.request.method,
+            path=response.request.url.path,
+            status_code=response.status_code,
+            started_at=self.started_at,
+            connect=self._between(_CONNECT_STARTED, _CONNECT_COMPLETE),
+            tls=self._between(_TLS_STARTED, _TLS_COMPLETE),
+            ttfb=self._between(_SEND_HEADERS_STARTED, _HEADERS_RECEIVED),
+            download=finished - headers_received,
+            total=finished - self.started,
+        )
+
+    def _between(self, start_event: str, end_event: str) -> float | None:
+        if start_event not in self.marks or end_event not in self.marks:
+            return None
+        return self.marks[end_event] - self.marks[start_event]
+
+
+class _AsyncRequestTrace(_RequestTrace):
+    """Вариант для httpx.AsyncClient: httpcore ожидает корутину."""
+
+    async def amark(self, event_name: str, event_info: dict[str, Any]) -> None:
+        self.mark(event_name, event_info)
+
+
+class _TimingHooks:
+    """Event hooks httpx.Client: трасса на каждый запрос, замер по ответу."""
+
+    def __init__(self, recorder: TimingRecorder) -> None:
+        self._recorder = recorder
+
+    def on_request(self, request: httpx.Request) -> None:
+        trace = _RequestTrace()
+        request.extensions[TRACE_EXTENSION] = trace.mark
+
+    def on_response(self, response: httpx.Response) -> None:
+        headers_received = time.perf_counter()
+        trace = _trace_of(response)
+        response.read()
+        if trace is not None:
+            self._recorder.record(trace.build(response, headers_received))
+
+
+class _AsyncTimingHooks:
+    """То же для httpx.AsyncClient."""
+
+    def __init__(self, recorder: TimingRecorder) -> None:
+        self._recorder = recorder
+
+    async def on_request(self, request: httpx.Request) -> None:
+        trace = _AsyncRequestTrace()
+        request.extensions[TRACE_EXTENSION] = trace.amark
+
+    async def on_response(self, response: httpx.Response) -> None:
+        headers_received = time.perf_counter()
+        trace = _trace_of(response)
+        await response.aread()
+        if trace is not None:
+            self._recorder.record(trace.build(response, headers_received))
+
+
+def timing_event_hooks(recorder: TimingRecorder) -> dict[str, list[Any]]:
+    """Event hooks для httpx.Client, записывающие замеры в recorder."""
+    hooks = _TimingHooks(recorder)
+    return {"request": [hooks.on_request], "response": [hooks.on_response]}
+
+
+def async_timing_event_hooks(recorder: TimingRecorder) -> dict[str, list[Any]]:
+    """Event hooks для httpx.AsyncClient, записывающие замеры в recorder."""
+    hooks = _AsyncTimingHooks(recorder)
+    return {"request": [hooks.on_request], "response": [hooks.on_response]}
+
+
+def _trace_of(response: httpx.Response) -> _RequestTrace | None:
+    callback = response.request.extensions.get(TRACE_EXTENSION)
+    owner = getattr(callback, "__self__", None)
+    return owner if isinstance(owner, _RequestTrace) else None
@@ -0,0 +1,254 @@
+"""
+Кэш access_token для grant_type=client_credentials с заблаговременным обновлением.
+
+Токен кэшируется по (client_id, scope) и обновляется в фоне за refresh_skew
+секунд до истечения expires_in. Одновременные запросы обновления одного
+ключа сводятся к одному вызову login.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import partial
+
+import httpx
+
+from src.api_clients.auth_service import AsyncAuthServiceV0APIClient, AuthServiceV0APIClient
+from src.common import fields
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_SKEW = 60.0
+
+TokenKey = tuple[str, str]
+
+
+@dataclass(frozen=True)
+class ClientCredentials:
+    """Учётные данные сервисного клиента для grant_type=client_credentials."""
+
+    client_id: str
+    client_secret: str
+    scope: str
+
+    @property
+    def key(self) -> TokenKey:
+        return self.client_id, self.scope
+
+    def login_request(self) -> dict[str, str]:
+        return {
+            fields.GRANT_TYPE_FIELD: fields.GRANT_TYPE_CLIENT_CREDENTIALS,
+            fields.CLIENT_ID_FIELD: self.client_id,
+            fields.CLIENT_SECRET_FIELD: self.client_secret,
+            fields.SCOPE_FIELD: self.scope,
+        }
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """Токен и моменты (time.monotonic) плановой замены и истечения."""
+
+    access_token: str
+    refresh_at: float
+    expires_at: float
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.refresh_at
+
+
+def parse_login_response(response: httpx.Response, refresh_skew: float) -> CachedToken:
+    """Достаёт access_token и expires_in из ответа login."""
+    if response.status_code != httpx.codes.OK:
+        raise httpx.HTTPStatusError(
+            f"login failed with status {response.status_code}: {response.text}",
+            request=response.request,
+            response=response,
+        )
+    payload = response.json()
+    lifetime = float(payload[fields.EXPIRES_IN_FIELD])
+    expires_at = time.monotonic() + lifetime
+    return CachedToken(
+        access_token=payload[fields.ACCESS_TOKEN_FIELD],
+        # короткоживущий токен обновляем не раньше середины срока, иначе login пойдёт на каждый запрос
+        refresh_at=expires_at - min(refresh_skew, lifetime / 2),
+        expires_at=expires_at,
+    )
+
+
+class TokenProvider:
+    """Потокобезопасный кэш токенов поверх AuthServiceV0APIClient.login."""
+
+    def __init__(
+        self,
+        client: AuthServiceV0APIClient,
+        refresh_skew: float = DEFAULT_REFRESH_SKEW,
+    ) -> None:
+        self.client = client
+        self.refresh_skew = refresh_skew
+        self._tokens: dict[TokenKey, CachedToken] = {}
+        self._in_flight: dict[TokenKey, Future[str]] = {}
+        self._timers: dict[TokenKey, threading.Timer] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def get_token(self, credentials: ClientCredentials) -> str:
+        with self._lock:
+            cached = self._tokens.get(credentials.key)
+            if cached is not None and cached.is_fresh():
+                return cached.access_token
+            future, is_leader = self._join_refresh(credentials.key)
+
+        if is_leader:
+            self._refresh(credentials, future)
+        return future.result()
+
+    def close(self) -> None:
+        """Останавливает фоновые обновления."""
+        with self._lock:
+            self._closed = True
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+
+    def _join_refresh(self, key: TokenKey) -> tuple[Future[str], bool]:
+        """Возвращает текущее обновление ключа или заводит новое (вызывать под блокировкой)."""
+        future = self._in_flight.get(key)
+        if future is not None:
+            return future, False
+        future = Future()
+        self._in_flight[key] = future
+        return future, True
+
+    def _refresh(self, credentials: ClientCredentials, future: Future[str]) -> None:
+        try:
+            token = parse_login_response(
+                self.client.login(credentials.login_request()),
+                self.refresh_skew,
+            )
+        except Exception as exc:
+            with self._lock:
+                self._in_flight.pop(credentials.key, None)
+            future.set_exception(exc)
+            return
+
+        with self._lock:
+            self._tokens[credentials.key] = token
+            self._in_flight.pop(credentials.key, None)
+            self._schedule(credentials, token)
+        future.set_result(token.access_token)
+
+    def _schedule(self, credentials: ClientCredentials, token: CachedToken) -> None:
+        """Заводит фоновое обновление к моменту refresh_at (вызывать под блокировкой)."""
+        if self._closed:
+            return
+        timer = threading.Timer(
+            max(token.refresh_at - time.monotonic(), 0),
+            self._refresh_in_background,
+            args=(credentials,),
+        )
+        timer.daemon = True
+        previous = self._timers.pop(credentials.key, None)
+        if previous is not None:
+            previous.cancel()
+        self._timers[credentials.key] = timer
+        timer.start()
+
+    def _refresh_in_background(self, credentials: ClientCredentials) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            future, is_leader = self._join_refresh(credentials.key)
+        if not is_leader:
+            return
+        self._refresh(credentials, future)
+        if future.exception() is not None:
+            logger.warning(
+                "background token refresh failed for %s: %s",
+                credentials.key,
+                future.exception(),
+            )
+
+
+class AsyncTokenProvider:
+    """Кэш токенов поверх AsyncAuthServiceV0APIClient.login для одного event loop."""
+
+    def __init__(
+        self,
+        client: AsyncAuthServiceV0APIClient,
+        refresh_skew: float = DEFAULT_REFRESH_SKEW,
+    ) -> None:
+        self.client = client
+        self.refresh_skew = refresh_skew
+        self._tokens: dict[TokenKey, CachedToken] = {}
+        self._in_flight: dict[TokenKey, asyncio.Task[str]] = {}
+        self._timers: dict[TokenKey, asyncio.TimerHandle] = {}
+        self._closed = False
+
+    async def get_token(self, credentials: ClientCredentials) -> str:
+        cached = self._tokens.get(credentials.key)
+        if cached is not None and cached.is_fresh():
+            return cached.access_token
+        # shield: отмена одного ожидающего не должна отменять общий login
+        return await asyncio.shield(self._join_refresh(credentials))
+
+    def close(self) -> None:
+        """Останавливает фоновые обновления и отменяет незавершённые login."""
+        self._closed = True
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for task in self._in_flight.values():
+            task.cancel()
+        self._in_flight.clear()
+
+    def _join_refresh(self, credentials: ClientCredentials) -> asyncio.Task[str]:
+        task = self._in_flight.get(credentials.key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(credentials))
+            task.add_done_callback(partial(_forget_refresh, self._in_flight, credentials.key))
+            self._in_flight[credentials.key] = task
+        return task
+
+    async def _refresh(self, credentials: ClientCredentials) -> str:
+        token = parse_login_response(
+            await self.client.login(credentials.login_request()),
+            self.refresh_skew,
+        )
+        self._tokens[credentials.key] = token
+        self._schedule(credentials, token)
+        return token.access_token
+
+    def _schedule(self, credentials: ClientCredentials, token: CachedToken) -> None:
+        if self._closed:
+            return
+        previous = self._timers.pop(credentials.key, None)
+        if previous is not None:
+            previous.cancel()
+        self._timers[credentials.key] = asyncio.get_running_loop().call_later(
+            max(token.refresh_at - time.monotonic(), 0),
+            self._refresh_in_background,
+            credentials,
+        )
+
+    def _refresh_in_background(self, credentials: ClientCredentials) -> None:
+        if self._closed:
+            return
+        self._join_refresh(credentials).add_done_callback(_log_background_failure)
+
+
+def _forget_refresh(
+    in_flight: dict[TokenKey, asyncio.Task[str]],
+    key: TokenKey,
+    task: asyncio.Task[str],
+) -> None:
+    """Убирает завершённый login из ожидающих, если его ещё не заменил новый."""
+    if in_flight.get(key) is task:
+        in_flight.pop(key)
+
+
+def _log_background_failure(task: asyncio.Task[str]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("background token refresh failed: %s", task.exception())
@@ -1,29 +1,77 @@
-from httpx import Response
+from typing import Any
 
-from src.api_clients.base import APIClient
+from httpx import AsyncBaseTransport, BaseTransport, Response
+
+from src.api_clients.base import APIClient, AsyncAPIClient, HTTPClientRegistry
+from src.api_clients.capture import CaptureWriter
+from src.api_clients.encoding import JSON_CONTENT_TYPE
+from src.api_clients.timing import TimingRecorder
 from src.config import config
 
+METRICS_PATH = "/metrics"
+HEALTH_PATH = "/api/v0/health"
+CREATE_NOTE_PATH = "/api/v0/spaces/notes/create"
+
+
+def _note_kwargs(note: dict | bytes) -> dict[str, Any]:
+    """Тело create_note: bytes уходит как готовый JSON, dict сериализует httpx."""
+    if isinstance(note, bytes):
+        return {"content": note, "headers": {"Content-Type": JSON_CONTENT_TYPE}}
+    return {"json": note}
+
 
 class WebServerAPIClient(APIClient):
     """Клиент для работы с API веб-сервера"""
 
-    def __init__(self) -> None:
-        super().__init__()
-        self.client.base_url = str(config.webserver.base_url)
-        self.client.timeout = config.webserver.timeout
+    def __init__(
+        self,
+        timing_recorder: TimingRecorder | None = None,
+        registry: HTTPClientRegistry | None = None,
+        capture_writer: CaptureWriter | None = None,
+        transport: BaseTransport | None = None,
+    ) -> None:
+        super().__init__(config.webserver, timing_recorder, registry, capture_writer, transport)
 
     def get_metrics(self) -> Response:
-        return self.client.get("/metrics")
+        return self.client.get(METRICS_PATH)
 
 
 class WebServerV0APIClient(WebServerAPIClient):
     """Клиент для работы с API веб-сервера v0"""
 
     def get_health(self) -> Response:
-        return self.client.get("/api/v0/health")
+        return self.client.get(HEALTH_PATH)
 
-    def create_note(self, note: dict) -> Response:
+    def create_note(self, note: dict | bytes) -> Response:
         return self.client.post(
-            "/api/v0/spaces/notes/create",
-            json=note,
+            CREATE_NOTE_PATH,
+            **_note_kwargs(note),
+        )
+
+
+class AsyncWebServerAPIClient(AsyncAPIClient):
+    """Асинхронный клиент для работы с API веб-сервера"""
+
+    def __init__(
+        self,
+        timing_recorder: TimingRecorder | None = None,
+        capture_writer: CaptureWriter | None = None,
+        transport: AsyncBaseTransport | None = None,
+    ) -> None:
+        super().__init__(config.webserver, timing_recorder, capture_writer, transport)
+
+    async def get_metrics(self) -> Response:
+        return await self.client.get(METRICS_PATH)
+
+
+class AsyncWebServerV0APIClient(AsyncWebServerAPIClient):
+    """Асинхронный клиент для работы с API веб-сервера v0"""
+
+    async def get_health(self) -> Response:
+        return await self.client.get(HEALTH_PATH)
+
+    async def create_note(self, note: dict | bytes) -> Response:
+        return await self.client.post(
+            CREATE_NOTE_PATH,
+            **_note_kwargs(note),
         )
@@ -0,0 +1,78 @@
+"""
+Кольцевой буфер сообщений аудита с вытеснением по числу сообщений и возрасту.
+
+Буфер не потокобезопасен: его блокировку держит AuditCollector.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+
+from src.common.audit import AuditMessage
+
+AuditPredicate = Callable[[AuditMessage], bool]
+
+
+@dataclass(frozen=True)
+class CollectedAudit:
+    """Сообщение аудита; sequence — сквозной номер сообщения в сборщике."""
+
+    sequence: int
+    received_at: float
+    body: bytes
+    message: AuditMessage
+
+
+@dataclass(frozen=True)
+class AuditSnapshot:
+    """Сообщения в буфере и счётчики вытесненных и не разобранных на момент снимка."""
+
+    messages: list[CollectedAudit]
+    evicted: int
+    invalid: int
+
+
+class AuditBuffer:
+    """Сообщения по возрастанию sequence; старые вытесняются по max_messages и max_age секунд."""
+
+    def __init__(self, max_messages: int, max_age: float | None = None) -> None:
+        if max_messages < 1:
+            raise ValueError("max_messages must be positive")
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self.evicted = 0
+        self.next_sequence = 0
+        self._messages: deque[CollectedAudit] = deque()
+
+    def append(self, body: bytes, message: AuditMessage, received_at: float) -> CollectedAudit:
+        collected = CollectedAudit(self.next_sequence, received_at, body, message)
+        self.next_sequence += 1
+        self._messages.append(collected)
+        if len(self._messages) > self.max_messages:
+            self._messages.popleft()
+            self.evicted += 1
+        self.evict_expired(received_at)
+        return collected
+
+    def since(self, sequence: int) -> Iterator[CollectedAudit]:
+        """Сообщения с номером не меньше sequence; уже проверенные пропускаются без перебора."""
+        first = self._messages[0].sequence if self._messages else self.next_sequence
+        return islice(self._messages, max(sequence - first, 0), None)
+
+    def find(self, predicate: AuditPredicate, since: int) -> CollectedAudit | None:
+        """Первое сообщение с номером не меньше since, подходящее под predicate."""
+        for collected in self.since(since):
+            if predicate(collected.message):
+                return collected
+        return None
+
+    def evict_expired(self, now: float) -> None:
+        if self.max_age is None:
+            return
+        while self._messages and now - self._messages[0].received_at > self.max_age:
+            self._messages.popleft()
+            self.evicted += 1
+
+    def __len__(self) -> int:
+        return len(self._messages)
@@ -0,0 +1,176 @@
+"""
+Сбор сообщений аудита из очереди ошибок auth-service одним потребителем на всю сессию или прогон.
+
+Сообщения разбираются в AuditMessage и хранятся в кольцевом буфере, ограниченном числом
+сообщений и возрастом; ожидание идёт по предикату, начиная с курсора — номера сообщения,
+с которого интересны события (например, взятого до запроса теста).
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+
+from pydantic import ValidationError
+
+from src.brokers.audit_buffer import AuditBuffer, AuditPredicate, AuditSnapshot, CollectedAudit
+from src.brokers.consumer import Binding, QueueConsumer
+from src.brokers.rabbitmq import ConnectionFactory
+from src.common.audit import AuditMessage
+from src.config import RabbitMQConfig
+
+logger = logging.getLogger(__name__)
+
+# получает тело и момент получения каждого сообщения очереди, в том числе не разобранного
+Listener = Callable[[bytes, float], object]
+
+
+class AuditCollector:
+    """
+    Потокобезопасный сборщик сообщений аудита в кольцевой буфер с вытеснением по числу и возрасту.
+
+    Если поток, читающий очередь, упал, ожидание сообщений сразу пробрасывает его ошибку.
+    """
+
+    def __init__(self, max_messages: int, max_age: float | None = None) -> None:
+        self.invalid = 0
+        self.error: Exception | None = None
+        self._buffer = AuditBuffer(max_messages, max_age)
+        self._listeners: list[Listener] = []
+        self._condition = threading.Condition()
+
+    def add(self, body: bytes, received_at: float | None = None) -> CollectedAudit | None:
+        """Разбирает и сохраняет сообщение; не AuditMessage только учитываются в invalid."""
+        received_at = time.monotonic() if received_at is None else received_at
+        with self._condition:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(body, received_at)
+        try:
+            message = AuditMessage.model_validate_json(body)
+        except ValidationError:
+            logger.warning("unexpected audit message: %r", body)
+            with self._condition:
+                self.invalid += 1
+            return None
+
+        with self._condition:
+            collected = self._buffer.append(body, message, received_at)
+            self._condition.notify_all()
+        return collected
+
+    def fail(self, error: Exception) -> None:
+        """Поток, читающий очередь, упал: новых сообщений не будет, ожидающие получают error."""
+        with self._condition:
+            self.error = error
+            self._condition.notify_all()
+
+    def cursor(self) -> int:
+        """Номер следующего сообщения: ожидание с этим курсором не увидит уже собранные."""
+        with self._condition:
+            return self._buffer.next_sequence
+
+    def snapshot(self, since: int = 0) -> AuditSnapshot:
+        """Собранные сообщения не раньше since и счётчики вытесненных и не разобранных."""
+        with self._condition:
+            self._buffer.evict_expired(time.monotonic())
+            messages = list(self._buffer.since(since))
+            return AuditSnapshot(messages, self._buffer.evicted, self.invalid)
+
+    def wait_for(
+        self,
+        predicate: AuditPredicate,
+        timeout: float,
+        since: int = 0,
+    ) -> CollectedAudit | None:
+        """
+        Первое сообщение не раньше since, подходящее под predicate; None, если не пришло за timeout секунд.
+
+        Если поток, читающий очередь, упал, а подходящего сообщения нет, бросает RuntimeError.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            checked = since
+            while True:
+                found = self._buffer.find(predicate, checked)
+                if found is not None:
+                    return found
+                if self.error is not None:
+                    raise RuntimeError("audit consumer failed") from self.error
+                checked = max(checked, self._buffer.next_sequence)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    @contextmanager
+    def forward_to(self, listener: Listener) -> Iterator[None]:
+        """Передаёт listener сырые сообщения, пока открыт контекст."""
+        with self._condition:
+            self._listeners.append(listener)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._listeners.remove(listener)
+
+
+class AuditCollectorConsumer(QueueConsumer):
+    """
+    Поток, читающий очередь ошибок auth-service в AuditCollector;
+    с private_queue — собственную очередь, привязанную к обменнику ошибок.
+    """
+
+    def __init__(
+        self,
+        rabbitmq_config: RabbitMQConfig,
+        collector: AuditCollector,
+        connection_factory: ConnectionFactory | None = None,
+        private_queue: str | None = None,
+    ) -> None:
+        bindings: Iterable[Binding] = ()
+        if private_queue is not None:
+            bindings = (auth_service_error_binding(rabbitmq_config),)
+        super().__init__(
+            rabbitmq_config,
+            private_queue or rabbitmq_config.auth_service_error_queue,
+            connection_factory,
+            name="audit-collector",
+            bindings=bindings,
+        )
+        self.collector = collector
+
+    def process_message(self, body: bytes, received_at: float) -> None:
+        self.collector.add(body, received_at)
+
+    def process_failure(self, error: Exception) -> None:
+        self.collector.fail(error)
+
+
+def auth_service_error_binding(rabbitmq_config: RabbitMQConfig) -> Binding:
+    return Binding(
+        rabbitmq_config.auth_service_error_exchange,
+        rabbitmq_config.auth_service_error_routing_key,
+    )
+
+
+def collect_audit(
+    rabbitmq_config: RabbitMQConfig,
+    ready_timeout: float,
+    connection_factory: ConnectionFactory | None = None,
+    private_queue: str | None = None,
+) -> tuple[AuditCollector, AuditCollectorConsumer]:
+    """Сборщик с размерами из конфига и запущенный, уже подписанный на очередь поток."""
+    collector = AuditCollector(
+        rabbitmq_config.audit_buffer_max_messages,
+        rabbitmq_config.audit_buffer_max_age,
+    )
+    consumer = AuditCollectorConsumer(rabbitmq_config, collector, connection_factory, private_queue)
+    consumer.start()
+    try:
+        consumer.wait_ready(ready_timeout)
+    except (TimeoutError, RuntimeError):
+        consumer.stop()
+        raise
+    return collector, consumer
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from src.brokers.rabbitmq import ConnectionFactory, RabbitMQ
+from src.config import RabbitMQConfig
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_POLL_INTERVAL = 0.1
+
+
+@dataclass(frozen=True)
+class Binding:
+    """Привязка очереди к обменнику, в который публикует сервис."""
+
+    exchange: str
+    routing_key: str
+
+
+class QueueConsumer(threading.Thread, ABC):
+    """
+    Поток, читающий очередь через собственное соединение RabbitMQ
+    (BlockingConnection нельзя делить между потоками).
+
+    Каждое сообщение передаётся в process_message вместе с моментом получения по time.monotonic().
+    С bindings поток сам объявляет queue_name эксклюзивной auto-delete очередью и привязывает
+    её к обменникам: так у каждого воркера своя копия сообщений сервиса, а очередь
+    исчезает вместе с соединением потока.
+
+    Ошибка до подписки пробрасывается из wait_ready, после неё — передаётся в process_failure:
+    поток не переподключается, и ожидающие сообщений должны упасть сразу, а не по таймауту.
+    """
+
+    def __init__(
+        self,
+        rabbitmq_config: RabbitMQConfig,
+        queue_name: str,
+        connection_factory: ConnectionFactory | None = None,
+        name: str | None = None,
+        bindings: Iterable[Binding] = (),
+    ) -> None:
+        super().__init__(name=name or f"{queue_name}-consumer", daemon=True)
+        self.rabbitmq_config = rabbitmq_config
+        self.queue_name = queue_name
+        self.bindings = tuple(bindings)
+        self.connection_factory = connection_factory
+        self.error: BaseException | None = None
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+
+    @abstractmethod
+    def process_message(self, body: bytes, received_at: float) -> None:
+        """Разбирает тело сообщения, полученного в момент received_at."""
+
+    def process_failure(self, error: Exception) -> None:
+        """Поток остановился с ошибкой; error также остаётся в self.error."""
+
+    def run(self) -> None:
+        try:
+            with RabbitMQ(self.rabbitmq_config, self.connection_factory) as rabbitmq:
+                if rabbitmq.connection is None:
+                    raise RuntimeError("RabbitMQ connection is not established")
+                channel = rabbitmq.connection.channel()
+                if self.bindings:
+                    _declare_private_queue(channel, self.queue_name, self.bindings)
+                channel.basic_consume(self.queue_name, self._on_message, auto_ack=True)
+                self._ready.set()
+                while not self._stopping.is_set():
+                    rabbitmq.connection.process_data_events(time_limit=CONSUMER_POLL_INTERVAL)
+        except Exception as exc:
+            self.error = exc
+            logger.exception("consumer of %s failed", self.queue_name)
+            self.process_failure(exc)
+        finally:
+            self._ready.set()
+
+    def wait_ready(self, timeout: float) -> None:
+        """Ждёт подписки на очередь; ошибку подключения пробрасывает в вызывающий поток."""
+        if not self._ready.wait(timeout):
+            raise TimeoutError(f"consumer of {self.queue_name} is not ready after {timeout}s")
+        if self.error is not None:
+            raise RuntimeError(f"consumer of {self.queue_name} failed") from self.error
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.join()
+
+    def _on_message(self, _channel: Any, _method: Any, _properties: Any, body: bytes) -> None:
+        self.process_message(body, time.monotonic())
+
+
+@contextmanager
+def consuming(consumer: QueueConsumer, ready_timeout: float) -> Iterator[QueueConsumer]:
+    """
+    Запускает поток и ждёт подписки; на выходе из контекста останавливает его.
+
+    Если поток упал во время контекста, ошибка пробрасывается: прочитанное им неполно.
+    """
+    consumer.start()
+    with ExitStack() as stack:
+        stack.callback(consumer.stop)
+        consumer.wait_ready(ready_timeout)
+        yield consumer
+    if consumer.error is not None:
+        raise RuntimeError(f"consumer of {consumer.queue_name} failed, its messages are incomplete") from consumer.error
+
+
+def _declare_private_queue(channel: Any, queue_name: str, bindings: Iterable[Binding]) -> None:
+    # эксклюзивную очередь может читать только объявившее её соединение
+    channel.queue_declare(queue_name, exclusive=True, auto_delete=True)
+    for binding in bindings:
+        channel.queue_bind(queue_name, binding.exchange, binding.routing_key)
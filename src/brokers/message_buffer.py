@@ -0,0 +1,139 @@
+"""
+Буфер сообщений очереди с индексом по полям корреляции (request_id, trace_id, user_id).
+
+Сообщения не разбираются «первое из очереди — моё»: каждое ложится в буфер, а тест
+ждёт своё по ключу. Так параллельные запросы проверяются каждый по своему событию,
+а случайные и запоздавшие сообщения других тестов не мешают.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from src.brokers.consumer import Binding, QueueConsumer
+from src.brokers.rabbitmq import ConnectionFactory
+from src.config import RabbitMQConfig
+
+REQUEST_ID = "request_id"
+TRACE_ID = "trace_id"
+USER_ID = "user_id"
+CORRELATION_FIELDS = (REQUEST_ID, TRACE_ID, USER_ID)
+
+# (поле, значение); значения сравниваются строками, так user_id 123 и "123" совпадают
+CorrelationKey = tuple[str, str]
+
+
+def correlation_key(field: str, field_value: object) -> CorrelationKey:
+    return field, str(field_value)
+
+
+@dataclass(frozen=True)
+class BufferedMessage:
+    """Сообщение очереди; payload — разобранный JSON-объект или None, если тело не JSON-объект."""
+
+    body: bytes
+    received_at: float
+    payload: dict[str, Any] | None
+
+    def correlation_keys(self, fields: Iterable[str]) -> list[CorrelationKey]:
+        if self.payload is None:
+            return []
+        return [
+            correlation_key(field, self.payload[field])
+            for field in fields
+            if self.payload.get(field) not in {None, ""}
+        ]
+
+
+def _payload(body: bytes) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class MessageBuffer:
+    """Потокобезопасный буфер сообщений; поиск по ключу корреляции за O(1)."""
+
+    def __init__(self, fields: Iterable[str] = CORRELATION_FIELDS) -> None:
+        self.fields = tuple(fields)
+        self._messages: list[BufferedMessage] = []
+        self._index: dict[CorrelationKey, list[BufferedMessage]] = {}
+        self.error: Exception | None = None
+        self._condition = threading.Condition()
+
+    def add(self, body: bytes, received_at: float | None = None) -> BufferedMessage:
+        message = BufferedMessage(
+            body=body,
+            received_at=time.monotonic() if received_at is None else received_at,
+            payload=_payload(body),
+        )
+        with self._condition:
+            self._messages.append(message)
+            for key in message.correlation_keys(self.fields):
+                self._index.setdefault(key, []).append(message)
+            self._condition.notify_all()
+        return message
+
+    def get(self, key: CorrelationKey) -> list[BufferedMessage]:
+        """Сообщения с ключом в порядке получения."""
+        with self._condition:
+            return list(self._index.get(key, ()))
+
+    def fail(self, error: Exception) -> None:
+        """Поток, читающий очередь, упал: новых сообщений не будет, ожидающие получают error."""
+        with self._condition:
+            self.error = error
+            self._condition.notify_all()
+
+    def wait_for(self, key: CorrelationKey, timeout: float) -> BufferedMessage | None:
+        """
+        Первое сообщение с ключом; ждёт его не дольше timeout секунд, иначе None.
+
+        Если поток, читающий очередь, упал, а сообщения с ключом нет, бросает RuntimeError.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                messages = self._index.get(key)
+                if messages:
+                    return messages[0]
+                if self.error is not None:
+                    raise RuntimeError("queue consumer failed") from self.error
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    def messages(self) -> list[BufferedMessage]:
+        with self._condition:
+            return list(self._messages)
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._messages)
+
+
+class BufferingConsumer(QueueConsumer):
+    """Поток, складывающий все сообщения очереди в MessageBuffer."""
+
+    def __init__(
+        self,
+        rabbitmq_config: RabbitMQConfig,
+        queue_name: str,
+        buffer: MessageBuffer,
+        connection_factory: ConnectionFactory | None = None,
+        bindings: Iterable[Binding] = (),
+    ) -> None:
+        super().__init__(rabbitmq_config, queue_name, connection_factory, bindings=bindings)
+        self.buffer = buffer
+
+    def process_message(self, body: bytes, received_at: float) -> None:
+        self.buffer.add(body, received_at)
+
+    def process_failure(self, error: Exception) -> None:
+        self.buffer.fail(error)
@@ -0,0 +1,309 @@
+"""
+Публикация большого числа сообщений с подтверждениями брокера (publisher confirms).
+
+BlockingChannel в режиме подтверждений ждёт ответ брокера на каждое сообщение, поэтому
+публикатор держит SelectConnection с ioloop в отдельном потоке. Подтверждения ждут
+одновременно до window сообщений, брокер подтверждает их пачками (Basic.Ack с multiple),
+а вызывающий поток ждёт только при заполненном окне и в wait_for_confirms.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import partial
+from itertools import takewhile
+from types import TracebackType
+from typing import Any
+
+from pika import BasicProperties, SelectConnection, frame, spec
+
+from src.brokers.rabbitmq import connection_parameters
+from src.config import RabbitMQConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_CLOSE_TIMEOUT = 5.0
+
+# SelectConnection(parameters, on_open_callback, on_open_error_callback, on_close_callback)
+SelectConnectionFactory = Callable[..., Any]
+
+
+@dataclass(frozen=True)
+class OutgoingMessage:
+    exchange: str
+    routing_key: str
+    body: bytes
+    properties: BasicProperties | None = None
+
+
+@dataclass(frozen=True)
+class PublishStats:
+    """Счётчики публикатора; elapsed — секунды от подключения."""
+
+    published: int
+    acked: int
+    nacked: int
+    elapsed: float
+
+    @property
+    def unconfirmed(self) -> int:
+        return self.published - self.acked - self.nacked
+
+    @property
+    def confirmed_rate(self) -> float:
+        if self.elapsed <= 0:
+            return 0
+        return (self.acked + self.nacked) / self.elapsed
+
+
+def _raise_if_failed(error: BaseException | None) -> None:
+    if error is not None:
+        raise RuntimeError("publisher connection failed") from error
+
+
+class _ConfirmWindow:
+    """Окно неподтверждённых сообщений и счётчики; общие для вызывающего потока и потока ioloop."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.error: BaseException | None = None
+        self._condition = threading.Condition()
+        self._outgoing: list[OutgoingMessage] = []
+        self._drain_scheduled = False
+        # занятые места окна: ждущие публикации и неподтверждённые сообщения
+        self._in_flight = 0
+        self._published = 0
+        self._acked = 0
+        self._nacked = 0
+
+    def put(self, message: OutgoingMessage, timeout: float | None) -> bool:
+        """Ждёт места в окне не дольше timeout секунд; True — проход ioloop для публикации ещё не запланирован."""
+        with self._condition:
+            has_room = self._condition.wait_for(
+                lambda: self._in_flight < self.size or self.error is not None,
+                timeout,
+            )
+            _raise_if_failed(self.error)
+            if not has_room:
+                raise TimeoutError(f"no room in the confirm window of {self.size} after {timeout}s")
+            self._in_flight += 1
+            self._outgoing.append(message)
+            schedule = not self._drain_scheduled
+            self._drain_scheduled = True
+        return schedule
+
+    def take(self) -> list[OutgoingMessage]:
+        """Сообщения, накопившиеся к проходу ioloop; после ошибки соединения они не публикуются."""
+        with self._condition:
+            batch = list(self._outgoing) if self.error is None else []
+            self._outgoing.clear()
+            self._drain_scheduled = False
+            self._published += len(batch)
+        return batch
+
+    def settle(self, count: int, acked: bool) -> None:
+        with self._condition:
+            if acked:
+                self._acked += count
+            else:
+                self._nacked += count
+            self._in_flight -= count
+            self._condition.notify_all()
+
+    def wait_confirmed(self, timeout: float | None) -> None:
+        with self._condition:
+            confirmed = self._condition.wait_for(
+                lambda: self._in_flight == 0 or self.error is not None,
+                timeout,
+            )
+            _raise_if_failed(self.error)
+            if not confirmed:
+                raise TimeoutError(f"{self._in_flight} messages are not confirmed after {timeout}s")
+
+    def fail(self, error: BaseException) -> None:
+        with self._condition:
+            if self.error is None:
+                self.error = error
+            self._condition.notify_all()
+
+    def stats(self, elapsed: float) -> PublishStats:
+        with self._condition:
+            return PublishStats(
+                published=self._published,
+                acked=self._acked,
+                nacked=self._nacked,
+                elapsed=elapsed,
+            )
+
+
+class _ConfirmChannel:
+    """Канал в режиме подтверждений; трогается только из потока ioloop."""
+
+    def __init__(self, channel: Any, window: _ConfirmWindow) -> None:
+        self.channel = channel
+        self.window = window
+        # delivery tag -> None в порядке публикации
+        self._unconfirmed: dict[int, None] = {}
+        self._delivery_tag = 0
+
+    def publish_pending(self) -> None:
+        for message in self.window.take():
+            self.channel.basic_publish(message.exchange, message.routing_key, message.body, message.properties)
+            self._delivery_tag += 1
+            self._unconfirmed[self._delivery_tag] = None
+
+    def on_confirmation(self, confirmation: frame.Method) -> None:
+        method = confirmation.method
+        if method.multiple:
+            settled = list(takewhile(lambda tag: tag <= method.delivery_tag, self._unconfirmed))
+        else:
+            settled = [method.delivery_tag] if method.delivery_tag in self._unconfirmed else []
+        for tag in settled:
+            self._unconfirmed.pop(tag)
+        acked = isinstance(method, spec.Basic.Ack)
+        self.window.settle(len(settled), acked)
+
+
+def _open_channel(on_channel_open: Callable[[Any], None], connection: Any) -> None:
+    connection.channel(on_open_callback=on_channel_open)
+
+
+def _close_connection(connection: Any) -> None:
+    if connection.is_open:
+        connection.close()
+    else:
+        connection.ioloop.stop()
+
+
+class _PublisherLoop:
+    """SelectConnection с ioloop в отдельном потоке; колбэки _on_* выполняются в потоке ioloop."""
+
+    def __init__(self, window: _ConfirmWindow) -> None:
+        self.window = window
+        self._connection: Any = None
+        self._channel: _ConfirmChannel | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._closing = False
+
+    def start(self, connection_factory: SelectConnectionFactory, config: RabbitMQConfig, timeout: float) -> None:
+        """Подключается и включает подтверждения; ошибку подключения пробрасывает."""
+        self._connection = connection_factory(
+            parameters=connection_parameters(config),
+            on_open_callback=partial(_open_channel, self._on_channel_open),
+            on_open_error_callback=self._on_connection_closed,
+            on_close_callback=self._on_connection_closed,
+        )
+        self._thread = threading.Thread(
+            target=self._connection.ioloop.start,
+            name="rabbitmq-publisher",
+            daemon=True,
+        )
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            self.stop(DEFAULT_CLOSE_TIMEOUT)
+            raise TimeoutError(f"publisher is not ready after {timeout}s")
+        _raise_if_failed(self.window.error)
+
+    def schedule_publish(self) -> None:
+        if self._channel is not None:
+            self._connection.ioloop.add_callback_threadsafe(self._channel.publish_pending)
+
+    def stop(self, timeout: float) -> None:
+        if self._thread is None:
+            return
+        self._closing = True
+        if self._thread.is_alive():
+            self._connection.ioloop.add_callback_threadsafe(lambda: _close_connection(self._connection))
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning("publisher ioloop did not stop after %ss", timeout)
+
+    def _on_connection_closed(self, connection: Any, reason: BaseException) -> None:
+        # и ошибка подключения, и закрытие соединения останавливают ioloop
+        if not self._closing:
+            logger.error("publisher connection closed: %r", reason)
+            self.window.fail(reason)
+            self._ready.set()
+        connection.ioloop.stop()
+
+    def _on_channel_open(self, channel: Any) -> None:
+        self._channel = _ConfirmChannel(channel, self.window)
+        channel.add_on_close_callback(self._on_channel_closed)
+        channel.confirm_delivery(self._channel.on_confirmation, callback=lambda _frame: self._ready.set())
+
+    def _on_channel_closed(self, _channel: Any, reason: BaseException) -> None:
+        if not self._closing:
+            logger.error("publisher channel closed: %r", reason)
+            self.window.fail(reason)
+            self._ready.set()
+        if self._connection.is_open:
+            self._connection.close()
+
+
+class ConfirmingPublisher:
+    """
+    Публикатор с окном неподтверждённых сообщений; подключается на время контекста with.
+
+    publish потокобезопасен и блокируется, пока в окне нет места; сообщения,
+    накопившиеся между проходами ioloop, публикуются одним проходом.
+    """
+
+    def __init__(
+        self,
+        config: RabbitMQConfig,
+        window: int | None = None,
+        connection_factory: SelectConnectionFactory | None = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    ) -> None:
+        self.config = config
+        self.window = window or config.publisher_confirm_window
+        if self.window < 1:
+            raise ValueError("window must be positive")
+        self.connection_factory = connection_factory or SelectConnection
+        self.connect_timeout = connect_timeout
+        self._confirms = _ConfirmWindow(self.window)
+        self._loop = _PublisherLoop(self._confirms)
+        self._started_at: float = 0
+
+    def __enter__(self) -> "ConfirmingPublisher":
+        self._started_at = time.monotonic()
+        self._loop.start(self.connection_factory, self.config, self.connect_timeout)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self._loop.stop(DEFAULT_CLOSE_TIMEOUT)
+
+    def publish(
+        self,
+        exchange: str,
+        routing_key: str,
+        body: bytes,
+        properties: BasicProperties | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Ставит сообщение в публикацию; ждёт места в окне не дольше timeout секунд (None — без предела)."""
+        if self._confirms.put(OutgoingMessage(exchange, routing_key, body, properties), timeout):
+            self._loop.schedule_publish()
+
+    def publish_many(self, messages: Iterable[OutgoingMessage], timeout: float | None = None) -> PublishStats:
+        """Публикует все сообщения и ждёт подтверждения последних из них."""
+        for message in messages:
+            self.publish(message.exchange, message.routing_key, message.body, message.properties, timeout)
+        self.wait_for_confirms(timeout)
+        return self.stats()
+
+    def wait_for_confirms(self, timeout: float | None = None) -> None:
+        """Ждёт подтверждения всех опубликованных сообщений."""
+        self._confirms.wait_confirmed(timeout)
+
+    def stats(self) -> PublishStats:
+        return self._confirms.stats(time.monotonic() - self._started_at)
@@ -0,0 +1,276 @@
+"""
+Глубина очередей и отставание потребителей во время прогона.
+
+Поток QueueMonitor раз в интервал снимает число сообщений и потребителей очередей:
+пассивным queue_declare (только глубина) или через management API RabbitMQ, который
+отдаёт ещё и накопленные счётчики публикаций и выдач — по ним считаются скорости
+поступления и разбора очереди, а по глубине и скорости разбора — отставание в секундах.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Protocol
+from urllib.parse import quote
+
+import httpx
+import pika
+
+from src.brokers.rabbitmq import ConnectionFactory, connection_parameters
+from src.config import RabbitMQConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SAMPLE_INTERVAL = 1.0
+MANAGEMENT_API_TIMEOUT = 5.0
+
+
+@dataclass(frozen=True)
+class QueueSample:
+    """
+    Состояние очереди; at — секунды от запуска монитора.
+
+    published и delivered — накопленные брокером счётчики, None, если источник их не даёт.
+    """
+
+    queue: str
+    at: float
+    messages: int
+    consumers: int
+    published: int | None = None
+    delivered: int | None = None
+
+
+@dataclass(frozen=True)
+class QueueInterval:
+    """Очередь за интервал между двумя замерами; скорости — сообщений в секунду."""
+
+    queue: str
+    start: float
+    end: float
+    messages: int
+    consumers: int
+    net_rate: float
+    enqueue_rate: float | None
+    dequeue_rate: float | None
+
+    @property
+    def lag(self) -> float | None:
+        """Секунды на разбор накопленного при текущей скорости разбора."""
+        if self.dequeue_rate is None:
+            return None
+        if self.messages == 0:
+            return 0
+        return self.messages / self.dequeue_rate if self.dequeue_rate > 0 else float("inf")
+
+
+class QueueStatsSource(Protocol):
+    def sample(self, queue: str, at: float) -> QueueSample: ...
+
+    def close(self) -> None: ...
+
+
+class PassiveDeclareSource:
+    """Глубина и число потребителей пассивным queue_declare через собственное соединение."""
+
+    def __init__(self, config: RabbitMQConfig, connection_factory: ConnectionFactory | None = None) -> None:
+        connect = connection_factory or pika.BlockingConnection
+        self._connection = connect(connection_parameters(config))
+        self._channel: Any = None
+
+    def sample(self, queue: str, at: float) -> QueueSample:
+        # брокер закрывает канал, если очереди нет: следующий замер идёт через новый
+        if self._channel is None or self._channel.is_closed:
+            self._channel = self._connection.channel()
+        declared = self._channel.queue_declare(queue, passive=True).method
+        return QueueSample(queue, at, declared.message_count, declared.consumer_count)
+
+    def close(self) -> None:
+        if self._connection.is_open:
+            self._connection.close()
+
+
+class ManagementAPISource:
+    """Состояние очереди из management API (GET /api/queues/{vhost}/{queue})."""
+
+    def __init__(self, config: RabbitMQConfig, transport: httpx.BaseTransport | None = None) -> None:
+        if config.management_url is None:
+            raise ValueError("rabbitmq.management_url is not configured")
+        self.virtual_host = config.virtual_host
+        # "/" в имени vhost (по умолчанию vhost и есть "/") кодируется, чтобы не стать разделителем пути
+        self._queues_path = f"/api/queues/{quote(config.virtual_host, safe='')}"
+        self.client = httpx.Client(
+            base_url=config.management_url,
+            auth=(config.username, config.password),
+            timeout=MANAGEMENT_API_TIMEOUT,
+            transport=transport,
+        )
+
+    def sample(self, queue: str, at: float) -> QueueSample:
+        response = self.client.get(f"{self._queues_path}/{quote(queue, safe='')}")
+        response.raise_for_status()
+        payload = response.json()
+        # message_stats появляется только после первой публикации в очередь
+        message_stats = payload.get("message_stats", {})
+        return QueueSample(
+            queue,
+            at,
+            payload.get("messages", 0),
+            payload.get("consumers", 0),
+            published=message_stats.get("publish", 0),
+            delivered=message_stats.get("deliver_get", 0),
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class QueueMonitor(threading.Thread):
+    """
+    Фоновые замеры очередей; source_factory вызывается в потоке монитора,
+    так как BlockingConnection нельзя делить между потоками.
+    """
+
+    def __init__(
+        self,
+        queue_names: Iterable[str],
+        source_factory: Callable[[], QueueStatsSource],
+        interval: float = DEFAULT_QUEUE_SAMPLE_INTERVAL,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        super().__init__(name="queue-monitor", daemon=True)
+        self.queue_names = tuple(queue_names)
+        self.source_factory = source_factory
+        self.interval = interval
+        self.error: BaseException | None = None
+        self._samples: list[QueueSample] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._started_at: float = 0
+
+    def samples(self) -> list[QueueSample]:
+        with self._lock:
+            return list(self._samples)
+
+    def run(self) -> None:
+        self._started_at = time.monotonic()
+        try:
+            source = self.source_factory()
+        except Exception as exc:
+            self.error = exc
+            logger.exception("queue monitor failed to connect")
+            return
+        try:
+            self._sample_until_stopped(source)
+        except Exception as exc:
+            self.error = exc
+            logger.exception("queue monitor failed")
+        finally:
+            source.close()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
+
+    def __enter__(self) -> "QueueMonitor":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def _sample_until_stopped(self, source: QueueStatsSource) -> None:
+        """Замеры раз в interval; последний замер начинается уже после stop."""
+        next_sample = self._started_at
+        while True:
+            stopping = self._stopped.is_set()
+            samples = _sample_queues(source, self.queue_names, self._started_at)
+            with self._lock:
+                self._samples.extend(samples)
+            if stopping:
+                return
+            next_sample = max(next_sample + self.interval, time.monotonic())
+            self._stopped.wait(next_sample - time.monotonic())
+
+
+def _sample_queues(source: QueueStatsSource, queue_names: Iterable[str], started_at: float) -> list[QueueSample]:
+    """Замер каждой очереди; ошибка замера одной очереди пропускает только её."""
+    samples = []
+    for queue in queue_names:
+        try:
+            samples.append(source.sample(queue, time.monotonic() - started_at))
+        except (httpx.HTTPError, pika.exceptions.AMQPError) as exc:
+            logger.warning("queue %s sample failed: %r", queue, exc)
+    return samples
+
+
+def _rate(first: int | None, last: int | None, duration: float) -> float | None:
+    if first is None or last is None:
+        return None
+    return (last - first) / duration
+
+
+def _by_queue(samples: Iterable[QueueSample]) -> dict[str, list[QueueSample]]:
+    by_queue: dict[str, list[QueueSample]] = {}
+    for sample in samples:
+        by_queue.setdefault(sample.queue, []).append(sample)
+    return by_queue
+
+
+def _thinned(samples: list[QueueSample], max_intervals: int | None) -> list[QueueSample]:
+    """Каждый step-й замер и последний, чтобы интервалов между ними было не больше max_intervals."""
+    gaps = len(samples) - 1
+    if max_intervals is None or gaps <= max_intervals:
+        return samples
+    points = samples[::-(-gaps // max_intervals)]
+    if points[-1] is not samples[-1]:
+        points.append(samples[-1])
+    return points
+
+
+def _interval(first: QueueSample, last: QueueSample) -> QueueInterval:
+    duration = last.at - first.at
+    return QueueInterval(
+        queue=last.queue,
+        start=first.at,
+        end=last.at,
+        messages=last.messages,
+        consumers=last.consumers,
+        net_rate=(last.messages - first.messages) / duration,
+        enqueue_rate=_rate(first.published, last.published, duration),
+        dequeue_rate=_rate(first.delivered, last.delivered, duration),
+    )
+
+
+def _intervals_between(points: list[QueueSample]) -> list[QueueInterval]:
+    intervals = []
+    for first, last in zip(points, points[1:]):
+        # замеры в один и тот же момент интервала не дают
+        if last.at > first.at:
+            intervals.append(_interval(first, last))
+    return intervals
+
+
+def queue_intervals(
+    samples: Iterable[QueueSample],
+    max_intervals: int | None = None,
+) -> dict[str, list[QueueInterval]]:
+    """
+    Интервалы между замерами по очередям в порядке времени.
+
+    При max_intervals соседние замеры объединяются так, чтобы интервалов было не больше.
+    """
+    intervals = {}
+    for queue, queue_samples in _by_queue(samples).items():
+        intervals[queue] = _intervals_between(_thinned(queue_samples, max_intervals))
+    return intervals
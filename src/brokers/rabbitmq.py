@@ -1,4 +1,7 @@
 import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, ExitStack, contextmanager
 from typing import Any, Optional
 
 import pika
@@ -8,29 +11,184 @@ from src.config import RabbitMQConfig
 logger = logging.getLogger(__name__)
 
 
+ConnectionFactory = Callable[[pika.ConnectionParameters], Any]
+
+
+def connection_parameters(config: RabbitMQConfig) -> pika.ConnectionParameters:
+    """Параметры подключения к брокеру из конфига."""
+    credentials = pika.PlainCredentials(
+        username=config.username, password=config.password
+    )
+    return pika.ConnectionParameters(
+        host=config.host,
+        port=config.port,
+        credentials=credentials,
+        virtual_host=config.virtual_host,
+        heartbeat=config.heartbeat,
+        blocked_connection_timeout=config.blocked_connection_timeout,
+        connection_attempts=config.connection_attempts,
+        retry_delay=config.retry_delay,
+    )
+
+
+class PooledChannel:
+    """
+    Канал из пула: атрибуты и методы делегируются каналу pika.
+
+    Режим подтверждений и транзакций на канале не сбросить, поэтому после
+    confirm_delivery или tx_select канал в пул не возвращается.
+    """
+
+    def __init__(self, channel: Any) -> None:
+        self.channel = channel
+        self.reusable = True
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.channel, name)
+
+    def confirm_delivery(self, *args: Any, **kwargs: Any) -> Any:
+        self.reusable = False
+        return self.channel.confirm_delivery(*args, **kwargs)
+
+    def tx_select(self) -> Any:
+        self.reusable = False
+        return self.channel.tx_select()
+
+
+class ChannelPool:
+    """
+    Открытые каналы соединения для повторного использования.
+
+    Канал возвращается в пул, только если он открыт, не переведён в режим подтверждений
+    или транзакций, на нём не осталось подписок и блок with завершился без исключения;
+    иначе он закрывается. Перед выдачей канала из пула соединение обрабатывает пришедшие
+    кадры, так что канал, закрытый брокером (Channel.Close), отбрасывается. Как и
+    BlockingConnection, пул нельзя делить между потоками.
+    """
+
+    def __init__(self, connection: Any, max_idle: int) -> None:
+        if max_idle < 1:
+            raise ValueError("max_idle must be positive")
+        self.connection = connection
+        self.max_idle = max_idle
+        self.opened = 0
+        self.reused = 0
+        self._idle: list[Any] = []
+
+    @contextmanager
+    def channel(self) -> Iterator[PooledChannel]:
+        pooled = PooledChannel(self._acquire())
+        try:
+            yield pooled
+        except BaseException:
+            self._discard(pooled.channel)
+            raise
+        self._release(pooled)
+
+    def close(self) -> None:
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def _acquire(self) -> Any:
+        if self._idle:
+            # Channel.Close, пришедший от брокера, клиент обрабатывает только при обращении к соединению
+            self.connection.process_data_events(time_limit=0)
+        while self._idle:
+            channel = self._idle.pop()
+            if channel.is_open:
+                self.reused += 1
+                return channel
+        self.opened += 1
+        return self.connection.channel()
+
+    def _release(self, pooled: PooledChannel) -> None:
+        channel = pooled.channel
+        reusable = pooled.reusable and channel.is_open and not channel.consumer_tags
+        if reusable and len(self._idle) < self.max_idle:
+            self._idle.append(channel)
+        else:
+            self._discard(channel)
+
+    def _discard(self, channel: Any) -> None:
+        if channel.is_open:
+            channel.close()
+
+
+class _FirstMessage:
+    """Колбэк basic_consume: подтверждает первое сообщение, следующие возвращает в очередь."""
+
+    def __init__(self) -> None:
+        self.body: bytes | None = None
+
+    def __call__(self, channel: Any, method: Any, _properties: Any, body: bytes) -> None:
+        if self.body is not None:
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            return
+        self.body = body
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+
+    def wait(self, connection: Any, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while self.body is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            connection.process_data_events(time_limit=remaining)
+
+
+def _cancel_if_open(channel: Any, consumer_tag: str) -> None:
+    # у подписки без auto_ack basic_cancel сам возвращает в очередь сообщения, не переданные колбэку
+    if channel.is_open:
+        channel.basic_cancel(consumer_tag)
+
+
+def receive_one(channel: Any, queue_name: str, timeout: float) -> bytes | None:
+    """
+    Ждёт одно сообщение очереди подпиской (basic_consume) не дольше timeout секунд.
+
+    С prefetch_count=1 брокер не выдаёт второе сообщение, пока первое не подтверждено,
+    а пришедшие до отмены подписки возвращаются в очередь: канал остаётся без
+    неподтверждённых сообщений и может вернуться в пул.
+    """
+    first = _FirstMessage()
+    channel.basic_qos(prefetch_count=1)
+    consumer_tag = channel.basic_consume(queue=queue_name, on_message_callback=first)
+    with ExitStack() as stack:
+        stack.callback(_cancel_if_open, channel, consumer_tag)
+        first.wait(channel.connection, timeout)
+    return first.body
+
+
 class RabbitMQ:
-    def __init__(self, config: RabbitMQConfig) -> None:
+    def __init__(
+        self,
+        config: RabbitMQConfig,
+        connection_factory: Optional[ConnectionFactory] = None,
+    ) -> None:
+        """
+        connection_factory создаёт соединение по параметрам подключения;
+        по умолчанию pika.BlockingConnection, для брокера в памяти — InMemoryBroker.connect.
+        """
         self.config = config
+        self.connection_factory = connection_factory or pika.BlockingConnection
         self.connection: Optional[pika.BlockingConnection] = None
+        self.channels: ChannelPool | None = None
 
     def __enter__(self) -> "RabbitMQ":
         """Поддержка контекстного менеджера - вход"""
-        credentials = pika.PlainCredentials(
-            username=self.config.username, password=self.config.password
-        )
-        connection_params = pika.ConnectionParameters(
-            host=self.config.host, 
-            port=self.config.port, 
-            credentials=credentials,
-            virtual_host=self.config.virtual_host,
-            heartbeat=self.config.heartbeat,
-            blocked_connection_timeout=self.config.blocked_connection_timeout,
-            connection_attempts=self.config.connection_attempts,
-            retry_delay=self.config.retry_delay,
-        )
-        self.connection = pika.BlockingConnection(connection_params)
+        self.connection = self.connection_factory(connection_parameters(self.config))
+        self.channels = ChannelPool(self.connection, self.config.channel_pool_size)
         return self
 
+    def channel(self) -> AbstractContextManager[PooledChannel]:
+        """Канал из пула соединения; после блока with канал возвращается в пул."""
+        if self.channels is None:
+            raise RuntimeError("RabbitMQ connection is not established")
+        return self.channels.channel()
+
     def __exit__(
         self,
         exc_type: Optional[type],
@@ -38,5 +196,7 @@ class RabbitMQ:
         exc_tb: Optional[Any],
     ) -> None:
         """Поддержка контекстного менеджера - выход"""
+        if self.channels is not None:
+            self.channels.close()
         if self.connection is not None and not self.connection.is_closed:
             self.connection.close()
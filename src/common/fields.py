@@ -10,6 +10,8 @@ USER_AGENT_FIELD = "user_agent"
 USER_ID_FIELD = "user_id"
 GRANT_TYPE_FIELD = "grant_type"
 CLIENT_ID_FIELD = "client_id"
+CLIENT_SECRET_FIELD = "client_secret"
+ACCESS_TOKEN_FIELD = "access_token"
 TOKEN_PAYLOAD_FIELD = "token_payload"
 
 # AUTH FIELDS
@@ -18,6 +18,10 @@ EDITOR_USER_ID="33333"
 VIEWER_USER_ID="44444"
 INVALID_USER_ID="00001234567890"
 
+# WEBSERVER: пользователь и его пространство в БД веб-сервера
+NOTES_USER_ID = 123456789
+NOTES_SPACE_ID = "869dc163-62aa-4889-9019-07f9c764ce38"
+
 # SPACES
 SHARED_SPACE_ID="7cc54caa-1753-4839-aa0c-6f2a76a08e93"
 PERSONAL_SPACE_ID="c7adddae-4949-49e6-b57e-1aa4e8be7fdb"
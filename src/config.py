@@ -2,7 +2,11 @@
 Конфигурация для тестов
 """
 
-from pydantic import AnyUrl, Field
+import warnings
+from importlib.util import find_spec
+from typing import Any, Self
+
+from pydantic import AnyUrl, Field, field_validator, model_validator
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
@@ -17,22 +21,93 @@ DEFAULT_HEARTBEAT = 300
 DEFAULT_BLOCKED_CONNECTION_TIMEOUT = 300
 DEFAULT_CONNECTION_ATTEMPTS = 3
 DEFAULT_RETRY_DELAY = 5
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+DEFAULT_FILTER_NOTES_CHUNK_SIZE = 250
+DEFAULT_RATE_LIMIT_BURST = 1
+
+
+class HTTPClientConfig(BaseSettings):
+    """
+    Настройки пула соединений и таймаутов HTTP-клиента.
+
+    Таймауты со значением None берутся из общего ``timeout`` сервиса.
+    Для ``http2: true`` нужен пакет ``h2`` (``httpx[http2]``).
+    """
+
+    max_connections: int | None = Field(default=DEFAULT_MAX_CONNECTIONS)
+    max_keepalive_connections: int | None = Field(default=DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+    keepalive_expiry: float | None = Field(default=DEFAULT_KEEPALIVE_EXPIRY)
+    http2: bool = Field(default=False)
+    connect_timeout: float | None = Field(default=None)
+    read_timeout: float | None = Field(default=None)
+    write_timeout: float | None = Field(default=None)
+    pool_timeout: float | None = Field(default=None)
+
+    @field_validator("http2")
+    @classmethod
+    def _h2_installed(cls, http2: bool) -> bool:
+        if http2 and find_spec("h2") is None:
+            raise ValueError("http2: true requires the h2 package, install httpx[http2]")
+        return http2
 
 
-class WebServerConfig(BaseSettings):
-    """Конфигурация для веб-сервера"""
+class RateLimitRule(BaseSettings):
+    """Лимит запросов: rps в секунду, не больше burst подряд"""
+
+    rps: float = Field(gt=0)
+    burst: int = Field(default=DEFAULT_RATE_LIMIT_BURST, ge=1)
+
+
+class RateLimitConfig(BaseSettings):
+    """
+    Ограничение частоты запросов клиента к сервису.
+
+    rps/burst — общий лимит на все ручки (None — без общего лимита),
+    endpoints — лимиты по путям, например ``/api/v0/auth/notes/filter``.
+    """
+
+    rps: float | None = Field(default=None, gt=0)
+    burst: int = Field(default=DEFAULT_RATE_LIMIT_BURST, ge=1)
+    endpoints: dict[str, RateLimitRule] = Field(default_factory=dict)
+
+
+class HTTPServiceConfig(BaseSettings):
+    """Общая конфигурация HTTP-сервиса: адрес, таймаут, пул соединений и лимит частоты"""
 
     base_url: AnyUrl = Field(default=AnyUrl("http://localhost:8080"))
     timeout: int = Field(default=API_TIMEOUT)
+    http: HTTPClientConfig = Field(default_factory=HTTPClientConfig)
+    rate_limit: RateLimitConfig | None = Field(default=None)
+
+    def with_base_url(self, base_url: str | None) -> Self:
+        """Копия конфигурации с другим base_url (None — без изменений), например при воспроизведении трафика."""
+        if base_url is None:
+            return self
+        return self.model_copy(update={"base_url": AnyUrl(base_url)})
+
 
-class AuthServiceConfig(BaseSettings):
+class WebServerConfig(HTTPServiceConfig):
+    """Конфигурация для веб-сервера"""
+
+class AuthServiceConfig(HTTPServiceConfig):
     """Конфигурация для сервиса авторизации"""
 
-    base_url: AnyUrl = Field(default=AnyUrl("http://localhost:8080"))
-    timeout: int = Field(default=API_TIMEOUT)
     secret_key: str = Field()
-
-_DEFAULT_QUEUE_POLL_ATTEMPTS = 30
+    filter_notes_chunk_size: int = Field(default=DEFAULT_FILTER_NOTES_CHUNK_SIZE)
+
+# секунды ожидания сообщения в очереди фикстурами RabbitMQ
+DEFAULT_QUEUE_WAIT_TIMEOUT = 1.0
+# устаревший queue_poll_attempts переводится в queue_wait_timeout по столько секунд на попытку
+QUEUE_POLL_ATTEMPT_SECONDS = 0.1
+# границы буфера сборщика сообщений аудита: число сообщений и возраст в секундах
+DEFAULT_AUDIT_BUFFER_MAX_MESSAGES = 10000
+DEFAULT_AUDIT_BUFFER_MAX_AGE = 300.0
+# сколько опубликованных сообщений могут одновременно ждать подтверждения брокера
+DEFAULT_PUBLISHER_CONFIRM_WINDOW = 1000
+# сколько свободных каналов держит пул соединения RabbitMQ
+DEFAULT_CHANNEL_POOL_SIZE = 4
 
 class RabbitMQConfig(BaseSettings):
     """Конфигурация для RabbitMQ"""
@@ -44,12 +119,38 @@ class RabbitMQConfig(BaseSettings):
     virtual_host: str = Field(default="/")
     notes_queue: str = Field(default="notes")
     notes_exchange: str = Field(default="notes")
+    # ключи и обменник, с которыми сервисы публикуют события: по ним привязываются собственные очереди тестов
+    notes_routing_key: str = Field(default="notes")
     heartbeat: int = Field(default=DEFAULT_HEARTBEAT)
     blocked_connection_timeout: int = Field(default=DEFAULT_BLOCKED_CONNECTION_TIMEOUT)
     connection_attempts: int = Field(default=DEFAULT_CONNECTION_ATTEMPTS)
     retry_delay: int = Field(default=DEFAULT_RETRY_DELAY)
     auth_service_error_queue: str = Field(default="errors.auth-service")
-    queue_poll_attempts: int = Field(default=_DEFAULT_QUEUE_POLL_ATTEMPTS)
+    auth_service_error_exchange: str = Field(default="errors")
+    auth_service_error_routing_key: str = Field(default="auth-service")
+    queue_wait_timeout: float = Field(default=DEFAULT_QUEUE_WAIT_TIMEOUT, gt=0)
+    audit_buffer_max_messages: int = Field(default=DEFAULT_AUDIT_BUFFER_MAX_MESSAGES, ge=1)
+    audit_buffer_max_age: float | None = Field(default=DEFAULT_AUDIT_BUFFER_MAX_AGE, gt=0)
+    publisher_confirm_window: int = Field(default=DEFAULT_PUBLISHER_CONFIRM_WINDOW, ge=1)
+    channel_pool_size: int = Field(default=DEFAULT_CHANNEL_POOL_SIZE, ge=1)
+    # адрес management API (http://localhost:15672); без него очереди замеряются пассивным queue_declare
+    management_url: str | None = Field(default=None)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _queue_poll_attempts(cls, settings: Any) -> Any:
+        """Старые конфиги с queue_poll_attempts: попытки basic_get переводятся в queue_wait_timeout."""
+        if not isinstance(settings, dict) or "queue_poll_attempts" not in settings:
+            return settings
+        settings = dict(settings)
+        attempts = settings.pop("queue_poll_attempts")
+        warnings.warn(
+            "rabbitmq.queue_poll_attempts is deprecated, set rabbitmq.queue_wait_timeout in seconds",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        settings.setdefault("queue_wait_timeout", attempts * QUEUE_POLL_ATTEMPT_SECONDS)
+        return settings
 
 
 class VaultConfig(BaseSettings):
@@ -72,6 +173,20 @@ class PostgresConfig(BaseSettings):
     dbname: str = Field(default="postgres")
 
 
+# число замеров и прогревочных вызовов теста с маркером latency
+DEFAULT_LATENCY_RUNS = 100
+DEFAULT_LATENCY_WARMUP = 10
+
+
+class LatencyBudgetConfig(BaseSettings):
+    """Бюджет задержки для тестов с маркером latency; пороги в миллисекундах, None — без ограничения"""
+
+    runs: int = Field(default=DEFAULT_LATENCY_RUNS, ge=1)
+    warmup: int = Field(default=DEFAULT_LATENCY_WARMUP, ge=0)
+    p50_ms: float | None = Field(default=None, gt=0)
+    p99_ms: float | None = Field(default=None, gt=0)
+
+
 class Config(BaseSettings):
     """Конфигурация для тестов"""
 
@@ -81,6 +196,8 @@ class Config(BaseSettings):
     vault: VaultConfig = Field(default_factory=VaultConfig)
     postgres: PostgresConfig = Field(default_factory=PostgresConfig)
     auth_service: AuthServiceConfig
+    # бюджеты по имени из маркера: @pytest.mark.latency("filter_notes")
+    latency_budgets: dict[str, LatencyBudgetConfig] = Field(default_factory=dict)
 
     model_config = SettingsConfigDict(
         yaml_file="config.yaml", env_file_encoding="utf-8", extra="ignore"
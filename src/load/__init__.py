@@ -0,0 +1,5 @@
+"""
+Нагрузочные сценарии для сервисов bot-zanuda.
+
+Запуск: ``python -m src.load --help``.
+"""
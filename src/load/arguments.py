@@ -0,0 +1,292 @@
+"""
+Аргументы подкоманд CLI нагрузочных прогонов.
+
+Общие группы аргументов (учётные данные, заглушка auth-service, опрос /metrics, аудит
+и мониторинг очередей) добавляются к подкомандам, которые их используют.
+"""
+
+import argparse
+from functools import partial
+from pathlib import Path
+
+from src.brokers.queue_monitor import DEFAULT_QUEUE_SAMPLE_INTERVAL
+from src.common import fields, ids
+from src.load.inject import KINDS, NOTES
+from src.load.metrics_sampler import DEFAULT_SAMPLE_INTERVAL
+from src.load.scenarios import AUTH_SERVICE_OPERATIONS, CREATE_NOTE, FILTER_NOTES
+from src.load.service_metrics import AUTH_SERVICE, WEBSERVER
+
+CLOSED = "closed"
+OPEN = "open"
+CHUNKS = "chunks"
+ENQUEUE = "enqueue"
+RESOURCES = "resources"
+TRAFFIC = "traffic"
+PUBLISH = "publish"
+
+DEFAULT_USERS = 10
+DEFAULT_CHUNK_SIZES = (50, 100, 250, 500, 1000)
+DEFAULT_REPEATS = 20
+DEFAULT_CONCURRENCY = 10
+# секунды
+DEFAULT_SUBSCRIBE_TIMEOUT = 10
+DEFAULT_DRAIN = 5
+DEFAULT_CONFIRM_TIMEOUT = 60
+
+_STORE_TRUE = "store_true"
+_DURATION_HELP = "длительность, секунды"
+_RATE_HELP = "запросов в секунду"
+
+
+def _csv(raw_value: str) -> tuple[str, ...]:
+    parts = (part.strip() for part in raw_value.split(","))
+    return tuple(part for part in parts if part)
+
+
+def _int_csv(raw_value: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in _csv(raw_value))
+
+
+def _service_base_url(raw_value: str) -> tuple[str, str]:
+    """Аргумент вида SERVICE=URL."""
+    service, _sep, base_url = raw_value.partition("=")
+    if service not in {AUTH_SERVICE, WEBSERVER} or not base_url:
+        raise argparse.ArgumentTypeError(f"expected {AUTH_SERVICE}=URL or {WEBSERVER}=URL, got {raw_value!r}")
+    return service, base_url
+
+
+def _add_credentials_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--client-id", default=fields.CLIENT_ID_BOT)
+    parser.add_argument("--scope", default=fields.SCOPE_BOT)
+    parser.add_argument(
+        "--client-secret",
+        default=None,
+        help="client_secret для login; по умолчанию берётся из Vault",
+    )
+
+
+def _add_standin_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--standin",
+        action=_STORE_TRUE,
+        help="вместо auth-service из config.yaml отвечает заглушка в процессе",
+    )
+    parser.add_argument("--standin-latency", type=float, default=0, help="задержка заглушки, секунды")
+    parser.add_argument("--standin-jitter", type=float, default=0, help="разброс задержки, секунды")
+    parser.add_argument("--standin-error-rate", type=float, default=0, help="доля ответов 500")
+
+
+def _add_auth_service_arguments(parser: argparse.ArgumentParser) -> None:
+    """Учётные данные client_credentials и заглушка auth-service."""
+    _add_credentials_arguments(parser)
+    _add_standin_arguments(parser)
+
+
+def _add_sampling_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--sample-metrics",
+        type=Path,
+        default=None,
+        help="каталог для временных рядов /metrics, снимаемых в фоне во время прогона",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=DEFAULT_SAMPLE_INTERVAL,
+        help="период опроса /metrics, секунды",
+    )
+
+
+def _add_audit_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--collect-audit",
+        action=_STORE_TRUE,
+        help="собирать сообщения аудита из очереди ошибок auth-service и добавить их сводку к отчёту",
+    )
+    parser.add_argument(
+        "--audit-connect-timeout",
+        type=float,
+        default=DEFAULT_SUBSCRIBE_TIMEOUT,
+        help="ожидание подписки на очередь ошибок, секунды",
+    )
+
+
+def _add_queue_monitor_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--monitor-queues",
+        action=_STORE_TRUE,
+        help=(
+            "снимать глубину очередей заметок и ошибок auth-service и добавить её динамику к отчёту; "
+            + "скорости поступления и разбора и отставание — только с --queue-management-api"
+        ),
+    )
+    parser.add_argument(
+        "--queue-interval",
+        type=float,
+        default=DEFAULT_QUEUE_SAMPLE_INTERVAL,
+        help="период замеров очередей, секунды",
+    )
+    parser.add_argument(
+        "--queue-management-api",
+        action=_STORE_TRUE,
+        help="замерять через management API (rabbitmq.management_url), с ним в отчёте скорости и отставание",
+    )
+
+
+def _add_observation_arguments(parser: argparse.ArgumentParser) -> None:
+    """Опрос /metrics, сбор аудита и мониторинг очередей на время прогона."""
+    _add_sampling_arguments(parser)
+    _add_audit_arguments(parser)
+    _add_queue_monitor_arguments(parser)
+
+
+def _require_closed_loop_limit(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.duration is None and args.requests is None:
+        parser.error("either --duration or --requests is required")
+
+
+def _add_closed_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--duration", type=float, default=None, help=_DURATION_HELP)
+    parser.add_argument("--requests", type=int, default=None, help="общее число запросов")
+    parser.add_argument(
+        "--endpoints",
+        type=_csv,
+        default=AUTH_SERVICE_OPERATIONS,
+        help=f"ручки через запятую, по умолчанию {','.join(AUTH_SERVICE_OPERATIONS)}",
+    )
+    _add_auth_service_arguments(parser)
+    _add_observation_arguments(parser)
+    parser.set_defaults(validate=partial(_require_closed_loop_limit, parser))
+
+
+def _add_open_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rate", type=float, required=True, help=_RATE_HELP)
+    parser.add_argument("--duration", type=float, required=True, help=_DURATION_HELP)
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="предел одновременных запросов; слоты сверх него учитываются как пропущенные",
+    )
+    parser.add_argument(
+        "--endpoints",
+        type=_csv,
+        default=(FILTER_NOTES, CREATE_NOTE),
+        help=f"ручки через запятую, по умолчанию {FILTER_NOTES},{CREATE_NOTE}",
+    )
+    _add_auth_service_arguments(parser)
+    _add_observation_arguments(parser)
+
+
+def _add_chunks_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--list-size", type=int, default=len(ids.BIG_LIST_WITH_EXISTING_PERSONAL_NOTES))
+    parser.add_argument("--chunk-sizes", type=_int_csv, default=DEFAULT_CHUNK_SIZES)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    _add_auth_service_arguments(parser)
+    _add_observation_arguments(parser)
+
+
+def _add_enqueue_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rate", type=float, required=True, help=_RATE_HELP)
+    parser.add_argument("--duration", type=float, required=True, help=_DURATION_HELP)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument(
+        "--drain",
+        type=float,
+        default=DEFAULT_DRAIN,
+        help="сколько секунд после прогона ждать оставшиеся сообщения",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=DEFAULT_SUBSCRIBE_TIMEOUT,
+        help="ожидание подписки на очередь, секунды",
+    )
+    _add_sampling_arguments(parser)
+    _add_queue_monitor_arguments(parser)
+    # очередь заметок читает сам прогон, аудит в нём не собирается
+    parser.set_defaults(collect_audit=False)
+
+
+def _add_resources_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--corpus", type=Path, required=True, help="JSONL с сообщениями")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="сообщений в секунду; без параметра — с максимальной скоростью",
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument(
+        "--fresh-request-ids",
+        action=_STORE_TRUE,
+        help="новый request_id для каждого сообщения",
+    )
+    parser.add_argument("--x-telegram-user-id", default=ids.SHARED_SPACE_OWNER_USER_ID)
+    _add_auth_service_arguments(parser)
+    _add_observation_arguments(parser)
+
+
+def _add_traffic_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--capture", type=Path, required=True, help="JSONL записанного трафика")
+    parser.add_argument("--speed", type=float, default=1, help="ускорение относительно записи")
+    parser.add_argument(
+        "--base-url",
+        type=_service_base_url,
+        action="append",
+        default=[],
+        help=f"SERVICE=URL: адрес сервиса ({AUTH_SERVICE} или {WEBSERVER}) вместо записанного, можно повторять",
+    )
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    _add_credentials_arguments(parser)
+    _add_observation_arguments(parser)
+    parser.set_defaults(standin=False)
+
+
+def _add_publish_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--kind", choices=KINDS, default=NOTES, help="FullMessage или ResourceChangeMessage")
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--exchange", default=None, help="по умолчанию notes_exchange из конфига")
+    parser.add_argument("--routing-key", default="")
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=None,
+        help="сколько сообщений могут ждать подтверждения, по умолчанию publisher_confirm_window из конфига",
+    )
+    parser.add_argument(
+        "--confirm-timeout",
+        type=float,
+        default=DEFAULT_CONFIRM_TIMEOUT,
+        help="ожидание подтверждений после публикации, секунды",
+    )
+    _add_observation_arguments(parser)
+
+
+# имя подкоманды, справка и добавление её аргументов
+_SUBCOMMANDS = (
+    (CLOSED, "замкнутый прогон auth-service: N пользователей, запрос за запросом", _add_closed_arguments),
+    (OPEN, "открытый прогон: постоянная частота запросов, задержка от запланированного момента", _add_open_arguments),
+    (CHUNKS, "подбор размера чанка filter_notes для списка note_ids заданной длины", _add_chunks_arguments),
+    (ENQUEUE, "задержка create_note от ответа 202 до сообщения в очереди заметок", _add_enqueue_arguments),
+    (RESOURCES, "воспроизведение корпуса ResourceChangeMessage (JSONL) через update_resource", _add_resources_arguments),
+    (TRAFFIC, "воспроизведение трафика, записанного pytest --capture-traffic", _add_traffic_arguments),
+    (PUBLISH, "публикация событий напрямую в RabbitMQ с подтверждениями брокера", _add_publish_arguments),
+)
+
+
+def build_parser(description: str | None = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.load", description=description)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, help_text, add_arguments in _SUBCOMMANDS:
+        add_arguments(subparsers.add_parser(name, help=help_text))
+    return parser
+
+
+def parse_args(argv: list[str] | None = None, description: str | None = None) -> argparse.Namespace:
+    """Аргументы подкоманды; args.command — её имя."""
+    args = build_parser(description).parse_args(argv)
+    if "validate" in args:
+        args.validate(args)
+    return args
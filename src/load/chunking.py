@@ -0,0 +1,116 @@
+import math
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+import httpx
+
+from src.api_clients.auth_service import AsyncAuthServiceV0APIClient, ChunkedFilterResult
+from src.common import fields, ids
+from src.load.report import MS_IN_SECOND
+from src.load.stats import percentile
+
+MEDIAN = 50
+TAIL = 99
+# ошибка вызова: транспорт и успешный ответ без notes (merge_filter_responses)
+_CALL_ERRORS = (httpx.HTTPError, ValueError)
+
+
+@dataclass(frozen=True)
+class ChunkSizeMeasurement:
+    """Сквозная задержка filter_notes_chunked для одного размера чанка (секунды)."""
+
+    chunk_size: int
+    chunks: int
+    p50: float
+    p99: float
+    errors: int
+
+
+def personal_note_ids(list_size: int) -> list[str]:
+    """Список из list_size id: существующие личные заметки, дополненные случайными."""
+    note_ids = list(ids.PERSONAL_NOTES[:list_size])
+    missing = list_size - len(note_ids)
+    note_ids.extend(str(uuid.uuid4()) for _ in range(missing))
+    return note_ids
+
+
+async def _measure_latencies(
+    filter_notes: Callable[[], Awaitable[ChunkedFilterResult]],
+    repeats: int,
+) -> tuple[list[float], int]:
+    """Отсортированные задержки успешных вызовов и число вызовов с ошибкой."""
+    latencies: list[float] = []
+    errors = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        try:
+            chunked = await filter_notes()
+        except _CALL_ERRORS:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        if not chunked.ok:
+            errors += 1
+    latencies.sort()
+    return latencies, errors
+
+
+async def _warm_up(filter_notes: Callable[[], Awaitable[ChunkedFilterResult]]) -> None:
+    """Прогревочный вызов; его ошибка не прерывает подбор, ошибки считают замеры."""
+    try:
+        await filter_notes()
+    except _CALL_ERRORS:
+        return
+
+
+async def benchmark_chunk_sizes(  # noqa: WPS211 # параметры вызова filter_notes + параметры замера
+    client: AsyncAuthServiceV0APIClient,
+    body: dict[str, Any],
+    chunk_sizes: Sequence[int],
+    repeats: int,
+    token: str | None = None,
+    x_telegram_user_id: str | None = None,
+) -> list[ChunkSizeMeasurement]:
+    """Замеряет filter_notes_chunked для каждого размера чанка после одного прогревочного вызова."""
+    measurements = []
+    for chunk_size in chunk_sizes:
+        filter_notes = partial(client.filter_notes_chunked, body, token, x_telegram_user_id, chunk_size)
+        await _warm_up(filter_notes)
+        latencies, errors = await _measure_latencies(filter_notes, repeats)
+        measurements.append(ChunkSizeMeasurement(
+            chunk_size=chunk_size,
+            chunks=math.ceil(len(body[fields.NOTE_IDS_FIELD]) / chunk_size),
+            p50=percentile(latencies, MEDIAN),
+            p99=percentile(latencies, TAIL),
+            errors=errors,
+        ))
+    return measurements
+
+
+def best_chunk_size(measurements: Sequence[ChunkSizeMeasurement]) -> ChunkSizeMeasurement | None:
+    """Размер чанка с минимальной медианой среди прогонов без ошибок; None, если ошибки были у всех."""
+    candidates = [
+        measurement for measurement in measurements
+        if measurement.errors == 0 and not math.isnan(measurement.p50)
+    ]
+    return min(candidates, key=lambda measurement: measurement.p50, default=None)
+
+
+def format_chunk_report(measurements: Sequence[ChunkSizeMeasurement], list_size: int) -> str:
+    lines = [f"note_ids: {list_size}", "chunk_size    chunks       p50       p99    errors"]
+    for measurement in measurements:
+        lines.append(
+            f"{measurement.chunk_size:>10}{measurement.chunks:>10}"
+            f"{measurement.p50 * MS_IN_SECOND:>10.2f}{measurement.p99 * MS_IN_SECOND:>10.2f}"
+            f"{measurement.errors:>10}",
+        )
+    best = best_chunk_size(measurements)
+    if best is None:
+        lines.append("best chunk size: none, every chunk size had errors")
+    else:
+        lines.append(f"best chunk size: {best.chunk_size}")
+    return "\n".join(lines)
@@ -0,0 +1,44 @@
+"""
+CLI нагрузочных прогонов.
+
+Примеры:
+``python -m src.load closed --users 50 --duration 30``,
+``python -m src.load open --rate 200 --duration 60``,
+``python -m src.load chunks --list-size 1003``,
+``python -m src.load enqueue --rate 50 --duration 30``,
+``python -m src.load resources --corpus changes.jsonl --rate 100 --concurrency 20``,
+``python -m src.load traffic --capture traffic.jsonl --speed 5``,
+``python -m src.load publish --kind notes --count 200000 --window 2000``.
+
+С ``--sample-metrics DIR`` любой прогон в фоне опрашивает /metrics сервисов и пишет временные ряды в DIR,
+с ``--collect-audit`` к отчёту добавляются сообщения аудита auth-service, пришедшие в RabbitMQ за прогон,
+с ``--monitor-queues`` — глубина очередей заметок и ошибок и отставание их потребителей во времени.
+"""
+
+import argparse
+import logging
+from collections.abc import Callable
+from types import MappingProxyType
+
+from src.load import arguments
+from src.load.commands import chunks, closed_loop, enqueue, open_loop, publish, resources, traffic
+
+# подкоманда -> прогон, возвращающий отчёт
+COMMANDS: MappingProxyType[str, Callable[[argparse.Namespace], str]] = MappingProxyType({
+    arguments.CLOSED: closed_loop.run,
+    arguments.OPEN: open_loop.run,
+    arguments.CHUNKS: chunks.run,
+    arguments.ENQUEUE: enqueue.run,
+    arguments.RESOURCES: resources.run,
+    arguments.TRAFFIC: traffic.run,
+    arguments.PUBLISH: publish.run,
+})
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    # httpx пишет INFO на каждый запрос: строки забивают отчёт и замедляют прогон
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    args = arguments.parse_args(argv, description=__doc__)
+    print(COMMANDS[args.command](args))  # noqa: WPS421 # отчёт CLI
+    return 0
@@ -0,0 +1,73 @@
+"""
+Клиенты сервисов для нагрузочных прогонов: учётные данные, заглушка auth-service и клиенты /metrics.
+"""
+
+import argparse
+
+from src.api_clients.auth_service import AsyncAuthServiceV0APIClient, AuthServiceV0APIClient
+from src.api_clients.token_provider import ClientCredentials
+from src.api_clients.webserver import WebServerV0APIClient
+from src.config import AuthServiceConfig, config
+from src.load.service_metrics import AUTH_SERVICE, WEBSERVER
+from src.standins.auth_service import DEFAULT_CLIENT_SECRET, AuthServiceStandIn, StandInSettings
+from src.storages.vault_client import VaultClient
+
+MetricsClient = AuthServiceV0APIClient | WebServerV0APIClient
+
+
+def _vault_client_secret(client_id: str) -> str:
+    with VaultClient(
+        base_url=str(config.vault.base_url),
+        token=config.vault.token,
+        timeout=config.vault.timeout,
+        mount_point=config.vault.mount_point,
+    ) as vault_client:
+        return vault_client.get_client_secret(client_id, secrets_path=config.vault.auth_clients_path)
+
+
+def client_credentials(args: argparse.Namespace) -> ClientCredentials:
+    """Учётные данные из аргументов; секрет по умолчанию читается из Vault."""
+    client_secret = args.client_secret
+    if client_secret is None and args.standin:
+        client_secret = DEFAULT_CLIENT_SECRET
+    if client_secret is None:
+        client_secret = _vault_client_secret(args.client_id)
+    return ClientCredentials(
+        client_id=args.client_id,
+        client_secret=client_secret,
+        scope=args.scope,
+    )
+
+
+def auth_service_standin(args: argparse.Namespace) -> AuthServiceStandIn | None:
+    """Заглушка auth-service, если задан --standin."""
+    if not args.standin:
+        return None
+    return AuthServiceStandIn(StandInSettings(
+        latency=args.standin_latency,
+        jitter=args.standin_jitter,
+        error_rate=args.standin_error_rate,
+    ))
+
+
+def auth_service_client(
+    standin: AuthServiceStandIn | None = None,
+    service_config: AuthServiceConfig | None = None,
+) -> AsyncAuthServiceV0APIClient:
+    """Клиент auth-service из конфига (или service_config), со standin запросы уходят в заглушку."""
+    transport = None if standin is None else standin.async_transport()
+    return AsyncAuthServiceV0APIClient(transport=transport, service_config=service_config)
+
+
+def metrics_clients(
+    services: tuple[str, ...],
+    standin: AuthServiceStandIn | None = None,
+) -> dict[str, MetricsClient]:
+    """Синхронные клиенты /metrics выбранных сервисов для фонового опроса; закрывает вызывающий."""
+    clients: dict[str, MetricsClient] = {}
+    if AUTH_SERVICE in services:
+        transport = None if standin is None else standin.transport()
+        clients[AUTH_SERVICE] = AuthServiceV0APIClient(transport=transport)
+    if WEBSERVER in services:
+        clients[WEBSERVER] = WebServerV0APIClient()
+    return clients
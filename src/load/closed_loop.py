@@ -0,0 +1,87 @@
+import asyncio
+import itertools
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from src.load.measure import measure
+from src.load.scenarios import Operation
+from src.load.stats import LoadStats
+
+
+@dataclass(frozen=True)
+class ClosedLoopSettings:
+    """
+    Параметры замкнутого прогона: users виртуальных пользователей,
+    каждый отправляет следующий запрос только после ответа на предыдущий.
+    Прогон ограничен длительностью (секунды) и/или общим числом запросов.
+    """
+
+    users: int
+    duration: float | None = None
+    max_requests: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.users < 1:
+            raise ValueError("users must be positive")
+        if self.duration is None and self.max_requests is None:
+            raise ValueError("either duration or max_requests is required")
+
+
+class _RequestBudget:
+    """Общий на всех пользователей счётчик оставшихся запросов."""
+
+    def __init__(self, max_requests: int | None) -> None:
+        self.remaining = max_requests
+
+    def take(self) -> bool:
+        if self.remaining is None:
+            return True
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+class _ClosedLoopRun:
+    """Общее состояние виртуальных пользователей одного прогона."""
+
+    def __init__(
+        self,
+        operations: Mapping[str, Operation],
+        stats: LoadStats,
+        budget: _RequestBudget,
+        deadline: float | None,
+    ) -> None:
+        self.operations = operations
+        self.stats = stats
+        self.budget = budget
+        self.deadline = deadline
+
+    def has_budget(self) -> bool:
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return False
+        return self.budget.take()
+
+    async def virtual_user(self, index: int) -> None:
+        names = list(self.operations)
+        # сдвиг, чтобы пользователи не били в одну ручку синхронно
+        offset = index % len(names)
+        order = itertools.islice(itertools.cycle(names), offset, None)
+        while self.has_budget():
+            name = next(order)
+            await measure(name, self.operations[name], self.stats)
+
+
+async def run_closed_loop(
+    operations: Mapping[str, Operation],
+    settings: ClosedLoopSettings,
+    stats: LoadStats,
+) -> float:
+    """Запускает замкнутый прогон и возвращает его длительность в секундах."""
+    started = time.perf_counter()
+    deadline = None if settings.duration is None else started + settings.duration
+    closed_loop = _ClosedLoopRun(operations, stats, _RequestBudget(settings.max_requests), deadline)
+    users = [closed_loop.virtual_user(index) for index in range(settings.users)]
+    await asyncio.gather(*users)
+    return time.perf_counter() - started
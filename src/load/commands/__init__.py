@@ -0,0 +1,3 @@
+"""
+Подкоманды ``python -m src.load``: run(args) каждой проводит прогон и возвращает отчёт.
+"""
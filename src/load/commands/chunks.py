@@ -0,0 +1,52 @@
+"""
+Подбор размера чанка filter_notes для списка note_ids заданной длины.
+"""
+
+import argparse
+import asyncio
+
+from src.common import fields, ids
+from src.load.chunking import benchmark_chunk_sizes, format_chunk_report, personal_note_ids
+from src.load.clients import auth_service_client, auth_service_standin, client_credentials
+from src.load.observation import observed_report
+from src.load.report import format_sections
+from src.load.scenarios import AuthServiceScenario
+from src.load.service_metrics import AUTH_SERVICE, with_service_metrics
+from src.standins.auth_service import AuthServiceStandIn
+
+
+def _filter_body(list_size: int) -> dict:
+    return {
+        fields.NOTE_IDS_FIELD: personal_note_ids(list_size),
+        fields.SPACE_ID_FIELD: ids.PERSONAL_SPACE_ID,
+    }
+
+
+async def _chunk_sizes(args: argparse.Namespace, standin: AuthServiceStandIn | None) -> str:
+    async with (
+        auth_service_client(standin) as client,
+        AuthServiceScenario(client, client_credentials(args)) as scenario,
+    ):
+        token = await scenario.token()
+        measurements, service_reports = await with_service_metrics(
+            {AUTH_SERVICE: client},
+            benchmark_chunk_sizes(
+                client,
+                _filter_body(args.list_size),
+                args.chunk_sizes,
+                args.repeats,
+                token=token,
+                x_telegram_user_id=ids.PERSONAL_SPACE_OWNER_USER_ID,
+            ),
+        )
+    return format_sections(format_chunk_report(measurements, args.list_size), *service_reports)
+
+
+def run(args: argparse.Namespace) -> str:
+    standin = auth_service_standin(args)
+    return observed_report(
+        args,
+        (AUTH_SERVICE,),
+        lambda: asyncio.run(_chunk_sizes(args, standin)),
+        standin,
+    )
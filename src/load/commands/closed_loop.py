@@ -0,0 +1,46 @@
+"""
+Замкнутый прогон auth-service: N пользователей, запрос за запросом.
+"""
+
+import argparse
+import asyncio
+
+from src.load.clients import auth_service_client, auth_service_standin, client_credentials
+from src.load.closed_loop import ClosedLoopSettings, run_closed_loop
+from src.load.observation import observed_report
+from src.load.report import format_report, format_sections
+from src.load.scenarios import AuthServiceScenario
+from src.load.service_metrics import AUTH_SERVICE, with_service_metrics
+from src.load.stats import LoadStats
+from src.standins.auth_service import AuthServiceStandIn
+
+
+def _settings(args: argparse.Namespace) -> ClosedLoopSettings:
+    return ClosedLoopSettings(
+        users=args.users,
+        duration=args.duration,
+        max_requests=args.requests,
+    )
+
+
+async def _closed_loop(args: argparse.Namespace, standin: AuthServiceStandIn | None) -> str:
+    stats = LoadStats()
+    async with (
+        auth_service_client(standin) as client,
+        AuthServiceScenario(client, client_credentials(args)) as scenario,
+    ):
+        elapsed, service_reports = await with_service_metrics(
+            {AUTH_SERVICE: client},
+            run_closed_loop(scenario.operations(args.endpoints), _settings(args), stats),
+        )
+    return format_sections(format_report(stats.summarize(elapsed), elapsed), *service_reports)
+
+
+def run(args: argparse.Namespace) -> str:
+    standin = auth_service_standin(args)
+    return observed_report(
+        args,
+        (AUTH_SERVICE,),
+        lambda: asyncio.run(_closed_loop(args, standin)),
+        standin,
+    )
@@ -0,0 +1,41 @@
+"""
+Задержка create_note от ответа 202 до сообщения в очереди заметок.
+"""
+
+import argparse
+import asyncio
+
+from src.api_clients.webserver import AsyncWebServerV0APIClient
+from src.brokers.consumer import consuming
+from src.config import config
+from src.load.commands.open_loop import settings_from
+from src.load.enqueue import format_enqueue_report, run_enqueue_latency
+from src.load.enqueue_tracking import EnqueueTracker, NotesQueueConsumer
+from src.load.observation import observed_report
+from src.load.report import format_open_loop_report, format_sections
+from src.load.service_metrics import WEBSERVER, with_service_metrics
+from src.load.stats import LoadStats
+
+
+async def _enqueue_latency(args: argparse.Namespace, tracker: EnqueueTracker) -> str:
+    settings = settings_from(args)
+    stats = LoadStats()
+    async with AsyncWebServerV0APIClient() as client:
+        outcome, service_reports = await with_service_metrics(
+            {WEBSERVER: client},
+            run_enqueue_latency(client, settings, tracker, stats, args.drain),
+        )
+    return format_sections(
+        "\n".join((
+            format_open_loop_report(stats.summarize(outcome.elapsed), outcome, settings),
+            format_enqueue_report(tracker.summarize()),
+        )),
+        *service_reports,
+    )
+
+
+def run(args: argparse.Namespace) -> str:
+    tracker = EnqueueTracker()
+    # очередь заметок читает сам прогон: поток подписывается до первого запроса
+    with consuming(NotesQueueConsumer(config.rabbitmq, tracker), args.connect_timeout):
+        return observed_report(args, (WEBSERVER,), lambda: asyncio.run(_enqueue_latency(args, tracker)))
@@ -0,0 +1,77 @@
+"""
+Открытый прогон: постоянная частота запросов к обоим сервисам, задержка от запланированного момента.
+"""
+
+import argparse
+import asyncio
+from contextlib import AsyncExitStack
+
+from src.api_clients.webserver import AsyncWebServerV0APIClient
+from src.load.clients import auth_service_client, auth_service_standin, client_credentials
+from src.load.observation import observed_report
+from src.load.open_loop import OpenLoopSettings, run_open_loop
+from src.load.report import format_open_loop_report, format_sections
+from src.load.scenarios import AUTH_SERVICE_OPERATIONS, WEBSERVER_OPERATIONS, Operation, mixed_operations
+from src.load.service_metrics import AUTH_SERVICE, WEBSERVER, MetricsSource, with_service_metrics
+from src.load.stats import LoadStats
+from src.standins.auth_service import AuthServiceStandIn
+
+
+def settings_from(args: argparse.Namespace) -> OpenLoopSettings:
+    """Расписание открытого прогона из --rate, --duration и --max-in-flight."""
+    return OpenLoopSettings(
+        rate=args.rate,
+        duration=args.duration,
+        max_in_flight=args.max_in_flight,
+    )
+
+
+def _services(endpoints: tuple[str, ...]) -> tuple[str, ...]:
+    """Сервисы, к которым обращаются выбранные операции."""
+    services = []
+    if any(name in AUTH_SERVICE_OPERATIONS for name in endpoints):
+        services.append(AUTH_SERVICE)
+    if any(name in WEBSERVER_OPERATIONS for name in endpoints):
+        services.append(WEBSERVER)
+    return tuple(services)
+
+
+async def _measure(
+    args: argparse.Namespace,
+    operations: dict[str, Operation],
+    clients: dict[str, MetricsSource],
+) -> str:
+    """Открытый прогон operations со снимками /metrics сервисов, к которым они обращаются."""
+    settings = settings_from(args)
+    stats = LoadStats()
+    outcome, service_reports = await with_service_metrics(
+        {service: clients[service] for service in _services(args.endpoints)},
+        run_open_loop(operations, settings, stats),
+    )
+    return format_sections(
+        format_open_loop_report(stats.summarize(outcome.elapsed), outcome, settings),
+        *service_reports,
+    )
+
+
+async def _open_loop(args: argparse.Namespace, standin: AuthServiceStandIn | None) -> str:
+    async with (
+        auth_service_client(standin) as auth_client,
+        AsyncWebServerV0APIClient() as webserver_client,
+        AsyncExitStack() as scenarios,
+    ):
+        operations = await mixed_operations(
+            args.endpoints, auth_client, webserver_client, lambda: client_credentials(args), scenarios,
+        )
+        clients: dict[str, MetricsSource] = {AUTH_SERVICE: auth_client, WEBSERVER: webserver_client}
+        return await _measure(args, operations, clients)
+
+
+def run(args: argparse.Namespace) -> str:
+    standin = auth_service_standin(args)
+    return observed_report(
+        args,
+        _services(args.endpoints),
+        lambda: asyncio.run(_open_loop(args, standin)),
+        standin,
+    )
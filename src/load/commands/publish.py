@@ -0,0 +1,34 @@
+"""
+Публикация событий напрямую в RabbitMQ с подтверждениями брокера.
+"""
+
+import argparse
+from collections.abc import Iterable
+from functools import partial
+
+from src.brokers.publisher import ConfirmingPublisher, OutgoingMessage
+from src.config import config
+from src.load.inject import format_publish_report, outgoing_messages
+from src.load.observation import observed_report
+from src.load.service_metrics import AUTH_SERVICE, WEBSERVER
+
+
+def _publish_all(publisher: ConfirmingPublisher, messages: Iterable[OutgoingMessage], confirm_timeout: float) -> str:
+    """Публикует messages и ждёт подтверждений; скорость публикации считается до последнего publish."""
+    for message in messages:
+        publisher.publish(message.exchange, message.routing_key, message.body, message.properties)
+    published_in = publisher.stats().elapsed
+    publisher.wait_for_confirms(confirm_timeout)
+    return format_publish_report(publisher.stats(), published_in, publisher.window)
+
+
+def _publish(args: argparse.Namespace) -> str:
+    exchange = config.rabbitmq.notes_exchange if args.exchange is None else args.exchange
+    messages = outgoing_messages(args.kind, args.count, exchange, args.routing_key)
+    with ConfirmingPublisher(config.rabbitmq, args.window) as publisher:
+        publish_report = _publish_all(publisher, messages, args.confirm_timeout)
+    return f"kind: {args.kind}, exchange: {exchange!r}\n{publish_report}"
+
+
+def run(args: argparse.Namespace) -> str:
+    return observed_report(args, (WEBSERVER, AUTH_SERVICE), partial(_publish, args))
@@ -0,0 +1,58 @@
+"""
+Воспроизведение корпуса ResourceChangeMessage через update_resource.
+"""
+
+import argparse
+import asyncio
+
+from src.load.clients import auth_service_client, auth_service_standin, client_credentials
+from src.load.observation import observed_report
+from src.load.report import format_replay_report, format_sections
+from src.load.resource_replay import ReplaySettings, ReplayStats, load_corpus, replay_corpus
+from src.load.scenarios import AuthServiceScenario
+from src.load.service_metrics import AUTH_SERVICE, with_service_metrics
+from src.models.resource import ResourceChangeMessage
+from src.standins.auth_service import AuthServiceStandIn
+
+
+def _settings(args: argparse.Namespace) -> ReplaySettings:
+    return ReplaySettings(
+        concurrency=args.concurrency,
+        rate=args.rate,
+        fresh_request_ids=args.fresh_request_ids,
+    )
+
+
+async def _replay_resources(
+    args: argparse.Namespace,
+    messages: list[ResourceChangeMessage],
+    standin: AuthServiceStandIn | None,
+) -> str:
+    stats = ReplayStats()
+    async with (
+        auth_service_client(standin) as client,
+        AuthServiceScenario(client, client_credentials(args)) as scenario,
+    ):
+        elapsed, service_reports = await with_service_metrics(
+            {AUTH_SERVICE: client},
+            replay_corpus(
+                client,
+                messages,
+                _settings(args),
+                stats,
+                token=scenario.token,
+                x_telegram_user_id=args.x_telegram_user_id,
+            ),
+        )
+    return format_sections(f"messages: {len(messages)}\n{format_replay_report(stats, elapsed)}", *service_reports)
+
+
+def run(args: argparse.Namespace) -> str:
+    standin = auth_service_standin(args)
+    messages = load_corpus(args.corpus)
+    return observed_report(
+        args,
+        (AUTH_SERVICE,),
+        lambda: asyncio.run(_replay_resources(args, messages, standin)),
+        standin,
+    )
@@ -0,0 +1,65 @@
+"""
+Воспроизведение трафика, записанного pytest --capture-traffic.
+"""
+
+import argparse
+import asyncio
+from contextlib import AsyncExitStack
+
+from src.api_clients.capture import CapturedExchange, read_capture
+from src.config import config
+from src.load.clients import auth_service_client, client_credentials
+from src.load.observation import observed_report
+from src.load.report import format_report
+from src.load.scenarios import AuthServiceScenario
+from src.load.service_metrics import AUTH_SERVICE, WEBSERVER
+from src.load.stats import LoadStats
+from src.load.traffic_replay import TrafficReplaySettings, replay_targets, replay_traffic
+
+
+async def _token_scenario(
+    args: argparse.Namespace,
+    exchanges: list[CapturedExchange],
+    auth_base_url: str | None,
+    stack: AsyncExitStack,
+) -> AuthServiceScenario | None:
+    """Сценарий, выдающий токен запросам, записанным с Authorization; клиент и сценарий закрывает stack."""
+    # токены в запись не попадают: запросы с Authorization получают токен, выданный заново
+    if not any(exchange.authorized for exchange in exchanges):
+        return None
+    auth_client = await stack.enter_async_context(
+        auth_service_client(service_config=config.auth_service.with_base_url(auth_base_url)),
+    )
+    return await stack.enter_async_context(AuthServiceScenario(auth_client, client_credentials(args)))
+
+
+async def _replay_traffic(
+    args: argparse.Namespace,
+    exchanges: list[CapturedExchange],
+    settings: TrafficReplaySettings,
+) -> str:
+    base_urls = dict(args.base_url)
+    stats = LoadStats()
+    async with AsyncExitStack() as stack:
+        scenario = await _token_scenario(args, exchanges, base_urls.get(AUTH_SERVICE), stack)
+        elapsed = await replay_traffic(
+            exchanges,
+            settings,
+            stats,
+            replay_targets({AUTH_SERVICE: config.auth_service, WEBSERVER: config.webserver}, base_urls),
+            None if scenario is None else scenario.token,
+        )
+    return "\n".join((
+        f"exchanges: {len(exchanges)}, speed: {settings.speed:g}x",
+        format_report(stats.summarize(elapsed), elapsed),
+    ))
+
+
+def run(args: argparse.Namespace) -> str:
+    exchanges = list(read_capture(args.capture))
+    settings = TrafficReplaySettings(speed=args.speed, max_in_flight=args.max_in_flight)
+    return observed_report(
+        args,
+        (AUTH_SERVICE, WEBSERVER),
+        lambda: asyncio.run(_replay_traffic(args, exchanges, settings)),
+    )
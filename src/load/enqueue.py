@@ -0,0 +1,71 @@
+"""
+Сквозная задержка create_note: от ответа 202 веб-сервера до сообщения в очереди заметок.
+
+Сопоставление ответов и сообщений по request_id — в src.load.enqueue_tracking.
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from src.api_clients.webserver import AsyncWebServerV0APIClient
+from src.load.enqueue_tracking import EnqueueSummary, EnqueueTracker
+from src.load.open_loop import OpenLoopResult, OpenLoopSettings, run_open_loop
+from src.load.report import MS_IN_SECOND
+from src.load.scenarios import CREATE_NOTE, WebServerScenario
+from src.load.stats import PERCENTILES, LoadStats
+from src.models.models import RequestID
+
+DRAIN_POLL_INTERVAL = 0.05
+
+
+class _TrackedWebServerScenario(WebServerScenario):
+    """create_note, регистрирующий принятые запросы в tracker."""
+
+    def __init__(self, client: AsyncWebServerV0APIClient, tracker: EnqueueTracker) -> None:
+        super().__init__(client)
+        self.tracker = tracker
+
+    async def create_note(self) -> httpx.Response:
+        response = await super().create_note()
+        if response.status_code == httpx.codes.ACCEPTED:
+            accepted_at = time.monotonic()
+            request_id = RequestID.model_validate_json(response.content).request_id
+            self.tracker.accepted(str(request_id), accepted_at)
+        return response
+
+
+async def run_enqueue_latency(  # noqa: WPS211 # клиент, расписание, два накопителя и время дочитывания
+    client: AsyncWebServerV0APIClient,
+    settings: OpenLoopSettings,
+    tracker: EnqueueTracker,
+    stats: LoadStats,
+    drain: float,
+) -> OpenLoopResult:
+    """
+    Открытый прогон create_note с регистрацией принятых запросов в tracker.
+
+    После расписания ждёт до drain секунд, пока дойдут оставшиеся сообщения;
+    не дошедшие за это время считаются потерянными.
+    """
+    operations = _TrackedWebServerScenario(client, tracker).operations((CREATE_NOTE,))
+    open_loop_result = await run_open_loop(operations, settings, stats)
+    deadline = time.monotonic() + drain
+    while tracker.pending and time.monotonic() < deadline:
+        await asyncio.sleep(DRAIN_POLL_INTERVAL)
+    return open_loop_result
+
+
+def format_enqueue_report(summary: EnqueueSummary) -> str:
+    latencies = " ".join(
+        f"p{quantile:g}={summary.percentiles[quantile] * MS_IN_SECOND:.2f}"
+        for quantile in PERCENTILES
+    )
+    return "\n".join((
+        (
+            f"accepted: {summary.accepted}, delivered: {summary.delivered}, lost: {summary.lost}, "
+            f"early: {summary.early}, foreign: {summary.foreign}"
+        ),
+        f"202 -> queue, ms: {latencies} max={summary.max_latency * MS_IN_SECOND:.2f}",
+    ))
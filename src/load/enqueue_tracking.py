@@ -0,0 +1,112 @@
+"""
+Сопоставление create_note и очереди заметок по request_id.
+
+Ответы create_note регистрируются в EnqueueTracker, поток NotesQueueConsumer
+читает очередь заметок и отмечает FullMessage.request_id. Обе стороны отмечают
+время по time.monotonic().
+"""
+
+import logging
+import math
+import threading
+from dataclasses import dataclass
+
+from pydantic import ValidationError
+
+from src.brokers.consumer import QueueConsumer
+from src.config import RabbitMQConfig
+from src.load.stats import PERCENTILES, percentile
+from src.models.models import FullMessage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EnqueueSummary:
+    """
+    Итог сопоставления: принятые (202) запросы, дошедшие до очереди и потерянные.
+
+    early — сообщения, прочитанные из очереди раньше, чем клиент получил 202
+    (их задержка считается нулевой); foreign — сообщения с незнакомым request_id.
+    """
+
+    accepted: int
+    delivered: int
+    lost: int
+    early: int
+    foreign: int
+    percentiles: dict[float, float]
+    max_latency: float
+
+
+class EnqueueTracker:
+    """Потокобезопасное сопоставление принятых запросов и сообщений из очереди по request_id."""
+
+    def __init__(self) -> None:
+        self._accepted: dict[str, float] = {}
+        self._unmatched: dict[str, float] = {}
+        self._latencies: list[float] = []
+        self._early = 0
+        self._lock = threading.Lock()
+
+    def accepted(self, request_id: str, at: float) -> None:
+        with self._lock:
+            delivered_at = self._unmatched.pop(request_id, None)
+            if delivered_at is None:
+                self._accepted[request_id] = at
+                return
+            self._early += 1
+            self._latencies.append(max(delivered_at - at, 0))
+
+    def delivered(self, request_id: str, at: float) -> None:
+        with self._lock:
+            accepted_at = self._accepted.pop(request_id, None)
+            if accepted_at is None:
+                # сообщение могло опередить ответ 202 или прийти не от этого прогона
+                self._unmatched[request_id] = at
+                return
+            self._latencies.append(at - accepted_at)
+
+    @property
+    def pending(self) -> int:
+        """Принятые запросы, сообщения по которым ещё не пришли."""
+        with self._lock:
+            return len(self._accepted)
+
+    def summarize(self) -> EnqueueSummary:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return EnqueueSummary(
+                accepted=len(latencies) + len(self._accepted),
+                delivered=len(latencies),
+                lost=len(self._accepted),
+                early=self._early,
+                foreign=len(self._unmatched),
+                percentiles={quantile: percentile(latencies, quantile) for quantile in PERCENTILES},
+                max_latency=latencies[-1] if latencies else math.nan,
+            )
+
+
+class NotesQueueConsumer(QueueConsumer):
+    """Поток, передающий request_id сообщений очереди заметок в EnqueueTracker."""
+
+    def __init__(
+        self,
+        rabbitmq_config: RabbitMQConfig,
+        tracker: EnqueueTracker,
+        queue_name: str | None = None,
+    ) -> None:
+        super().__init__(
+            rabbitmq_config,
+            queue_name or rabbitmq_config.notes_queue,
+            name="notes-queue-consumer",
+        )
+        self.tracker = tracker
+
+    def process_message(self, body: bytes, received_at: float) -> None:
+        try:
+            message = FullMessage.model_validate_json(body)
+        except ValidationError:
+            logger.warning("unexpected message in %s: %r", self.queue_name, body)
+            return
+        self.tracker.delivered(str(message.request_id), received_at)
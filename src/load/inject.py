@@ -0,0 +1,60 @@
+"""
+Прямая публикация событий заметок и ресурсов в RabbitMQ в обход API сервисов.
+
+Так в очереди попадают сотни тысяч сообщений за секунды, а пропускная способность
+потребителей сервисов меряется без ограничений HTTP-слоя.
+"""
+
+import time
+import uuid
+from collections.abc import Iterator
+from dataclasses import asdict
+
+import pika
+
+from src.api_clients.encoding import JSON_CONTENT_TYPE, encode_json
+from src.brokers.publisher import OutgoingMessage, PublishStats
+from src.load.scenarios import new_note, new_note_message
+from src.models.models import FullMessage
+
+NOTES = "notes"
+RESOURCES = "resources"
+KINDS = (NOTES, RESOURCES)
+
+_JSON_PROPERTIES = pika.BasicProperties(content_type=JSON_CONTENT_TYPE, delivery_mode=2)
+
+
+def new_full_message() -> bytes:
+    """Сообщение о созданной заметке в формате очереди заметок веб-сервера."""
+    message = FullMessage.model_validate({
+        **new_note(),
+        "request_id": str(uuid.uuid4()),
+        "operation": "create",
+        "file": "",
+        "created": int(time.time()),
+    })
+    return message.model_dump_json(by_alias=True).encode()
+
+
+def _new_resource_message() -> bytes:
+    return encode_json(asdict(new_note_message()))
+
+
+def outgoing_messages(kind: str, count: int, exchange: str, routing_key: str) -> Iterator[OutgoingMessage]:
+    """count сообщений вида kind; тела создаются по мере публикации, а не заранее."""
+    if kind not in KINDS:
+        raise ValueError(f"unknown message kind: {kind}")
+    new_body = new_full_message if kind == NOTES else _new_resource_message
+    for _ in range(count):
+        yield OutgoingMessage(exchange, routing_key, new_body(), _JSON_PROPERTIES)
+
+
+def format_publish_report(stats: PublishStats, published_in: float, window: int) -> str:
+    """published_in — секунды до отправки последнего сообщения, stats.elapsed — до последнего подтверждения."""
+    publish_rate = stats.published / published_in if published_in > 0 else 0
+    return "\n".join((
+        f"published: {stats.published}, acked: {stats.acked}, nacked: {stats.nacked}, "
+        + f"unconfirmed: {stats.unconfirmed}, window: {window}",
+        f"publish: {published_in:.2f}s, {publish_rate:.1f} msg/s",
+        f"confirmed: {stats.elapsed:.2f}s, {stats.confirmed_rate:.1f} msg/s",
+    ))
@@ -0,0 +1,32 @@
+import logging
+import time
+
+import httpx
+
+from src.load.scenarios import Operation, is_success
+from src.load.stats import LoadStats
+
+logger = logging.getLogger(__name__)
+
+
+async def measure(
+    name: str,
+    operation: Operation,
+    stats: LoadStats,
+    started: float | None = None,
+) -> None:
+    """
+    Выполняет операцию и записывает задержку в stats.
+
+    started — момент отсчёта по time.perf_counter(); по умолчанию момент вызова.
+    Сетевые ошибки httpx учитываются как неуспешные запросы.
+    """
+    if started is None:
+        started = time.perf_counter()
+    try:
+        response = await operation()
+    except httpx.HTTPError as exc:
+        logger.debug("%s failed: %r", name, exc)
+        stats.record(name, time.perf_counter() - started, ok=False)
+        return
+    stats.record(name, time.perf_counter() - started, ok=is_success(response))
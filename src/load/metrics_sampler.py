@@ -0,0 +1,184 @@
+"""
+Фоновый опрос /metrics сервисов с записью временных рядов на диск.
+
+Ряды сохраняются в каталог из двух файлов:
+``series.jsonl`` — по строке на ряд (номер, сервис, имя, метки, тип семейства),
+``samples.bin`` — записи фиксированной длины ``<dId``: время (unix, секунды), номер ряда, значение.
+Формат читается read_time_series или, при желании, ``numpy.fromfile(path, dtype="<f8,<u4,<f8")``,
+так что задержки из отчёта прогона можно сопоставить с горутинами, паузами GC и пулом БД сервиса.
+"""
+
+import json
+import struct
+import threading
+import time
+from array import array
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from src.api_clients.prometheus import Labels, MetricsSnapshot
+from src.load.service_metrics import BlockingMetricsSource, scrape_blocking
+
+DEFAULT_SAMPLE_INTERVAL = 1.0
+SERIES_FILE = "series.jsonl"
+SAMPLES_FILE = "samples.bin"
+# время, номер ряда, значение
+SAMPLE_RECORD = struct.Struct("<dId")
+
+
+@dataclass(frozen=True)
+class SeriesInfo:
+    service: str
+    name: str
+    labels: Labels
+    type: str
+
+
+@dataclass
+class TimeSeries:
+    meta: SeriesInfo
+    timestamps: "array[float]" = field(default_factory=lambda: array("d"))
+    values: "array[float]" = field(default_factory=lambda: array("d"))  # noqa: WPS110 # значения ряда
+
+
+class TimeSeriesWriter:
+    """Дописывает снимки /metrics в каталог временных рядов; номера рядов выдаются при первой встрече."""
+
+    def __init__(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self._series_file = (directory / SERIES_FILE).open("w", encoding="utf-8")
+        self._samples_file = (directory / SAMPLES_FILE).open("wb")
+        self._series_ids: dict[SeriesInfo, int] = {}
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def write(self, service: str, metrics: MetricsSnapshot, timestamp: float) -> None:
+        buffer = bytearray()
+        with self._lock:
+            for family in metrics.families.values():
+                for sample in family.samples:
+                    series_id = self._series_id(SeriesInfo(service, sample.name, sample.labels, family.type))
+                    buffer += SAMPLE_RECORD.pack(timestamp, series_id, sample.value)
+            self._samples_file.write(buffer)
+            self._series_file.flush()
+            self._samples_file.flush()
+            self.records += len(buffer) // SAMPLE_RECORD.size
+
+    def close(self) -> None:
+        with self._lock:
+            self._series_file.close()
+            self._samples_file.close()
+
+    def _series_id(self, series_info: SeriesInfo) -> int:
+        series_id = self._series_ids.get(series_info)
+        if series_id is None:
+            series_id = len(self._series_ids)
+            self._series_ids[series_info] = series_id
+            self._series_file.write(json.dumps({
+                "id": series_id,
+                "service": series_info.service,
+                "name": series_info.name,
+                "labels": dict(series_info.labels),
+                "type": series_info.type,
+            }, ensure_ascii=False) + "\n")
+        return series_id
+
+
+def _parse_series(line: str) -> TimeSeries:
+    payload: dict[str, Any] = json.loads(line)
+    return TimeSeries(SeriesInfo(
+        service=payload["service"],
+        name=payload["name"],
+        labels=tuple(sorted(payload["labels"].items())),
+        type=payload["type"],
+    ))
+
+
+def _read_series(path: Path) -> list[TimeSeries]:
+    series = []
+    with path.open(encoding="utf-8") as series_file:
+        for line_number, line in enumerate(series_file, start=1):
+            try:
+                series.append(_parse_series(line))
+            except (ValueError, KeyError, AttributeError) as exc:
+                raise ValueError(f"{path}:{line_number}: invalid series") from exc
+    return series
+
+
+def _read_records(path: Path) -> Iterator[tuple[Any, ...]]:
+    samples = path.read_bytes()
+    # последняя запись может быть недописана, если процесс оборвался посреди записи
+    complete = len(samples) - len(samples) % SAMPLE_RECORD.size
+    return SAMPLE_RECORD.iter_unpack(samples[:complete])
+
+
+def read_time_series(directory: Path) -> list[TimeSeries]:
+    """Ряды каталога в порядке номеров; отсчёты внутри ряда — в порядке записи."""
+    series = _read_series(directory / SERIES_FILE)
+    for timestamp, series_id, sample_value in _read_records(directory / SAMPLES_FILE):
+        if series_id >= len(series):
+            raise ValueError(f"{directory / SAMPLES_FILE}: unknown series id {series_id}")
+        series[series_id].timestamps.append(timestamp)
+        series[series_id].values.append(sample_value)
+    return series
+
+
+class MetricsSampler(threading.Thread):
+    """
+    Опрашивает /metrics сервисов раз в interval секунд в отдельном потоке, пока не вызван stop.
+
+    Опрос идёт по расписанию от старта, а не от конца предыдущего опроса; при остановке
+    снимается ещё один, последний, снимок.
+    """
+
+    def __init__(
+        self,
+        sources: Mapping[str, BlockingMetricsSource],
+        writer: TimeSeriesWriter,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        super().__init__(name="metrics-sampler", daemon=True)
+        self.sources = sources
+        self.writer = writer
+        self.interval = interval
+        self.samples = 0
+        self._stopped = threading.Event()
+
+    def sample(self) -> None:
+        for service, source in self.sources.items():
+            metrics = scrape_blocking(service, source)
+            if metrics is not None:
+                self.writer.write(service, metrics, time.time())
+                self.samples += 1
+
+    def run(self) -> None:
+        next_sample = time.monotonic()
+        while not self._stopped.is_set():
+            self.sample()
+            # опрос дольше интервала сдвигает расписание, а не даёт серию опросов подряд
+            next_sample = max(next_sample + self.interval, time.monotonic())
+            self._stopped.wait(next_sample - time.monotonic())
+        self.sample()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
+
+    def __enter__(self) -> "MetricsSampler":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
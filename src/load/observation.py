@@ -0,0 +1,92 @@
+"""
+Что снимается вокруг прогона: /metrics в фоне (--sample-metrics), аудит auth-service (--collect-audit)
+и глубина очередей (--monitor-queues); сводки аудита и очередей добавляются к отчёту прогона.
+"""
+
+import argparse
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, closing, contextmanager
+from functools import partial
+
+from src.brokers.audit_collector import AuditCollector, collect_audit
+from src.brokers.queue_monitor import ManagementAPISource, PassiveDeclareSource, QueueMonitor, QueueStatsSource
+from src.config import config
+from src.load.clients import metrics_clients
+from src.load.metrics_sampler import MetricsSampler, TimeSeriesWriter
+from src.load.report import format_audit_report, format_queue_report, format_sections
+from src.standins.auth_service import AuthServiceStandIn
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def metrics_sampling(
+    args: argparse.Namespace,
+    services: tuple[str, ...],
+    standin: AuthServiceStandIn | None = None,
+) -> Iterator[None]:
+    """Фоновый опрос /metrics на время прогона, если задан --sample-metrics."""
+    if args.sample_metrics is None or not services:
+        yield
+        return
+    with ExitStack() as stack:
+        sources = metrics_clients(services, standin)
+        for client in sources.values():
+            stack.callback(client.close)
+        writer = stack.enter_context(closing(TimeSeriesWriter(args.sample_metrics)))
+        with MetricsSampler(sources, writer, args.sample_interval):
+            yield
+    logger.info("metrics time series: %s samples written to %s", writer.records, writer.directory)
+
+
+@contextmanager
+def audit_collection(args: argparse.Namespace) -> Iterator[AuditCollector | None]:
+    """Сборщик аудита на время прогона, если задан --collect-audit."""
+    if not args.collect_audit:
+        yield None
+        return
+    collector, consumer = collect_audit(config.rabbitmq, args.audit_connect_timeout)
+    with ExitStack() as stack:
+        stack.callback(consumer.stop)
+        yield collector
+    if consumer.error is not None:
+        raise RuntimeError("audit consumer failed, audit report is incomplete") from consumer.error
+
+
+@contextmanager
+def queue_monitoring(args: argparse.Namespace) -> Iterator[QueueMonitor | None]:
+    """Монитор очередей на время прогона, если задан --monitor-queues."""
+    if not args.monitor_queues:
+        yield None
+        return
+    queues = (config.rabbitmq.notes_queue, config.rabbitmq.auth_service_error_queue)
+    source_factory: Callable[[], QueueStatsSource]
+    if args.queue_management_api:
+        source_factory = partial(ManagementAPISource, config.rabbitmq)
+    else:
+        source_factory = partial(PassiveDeclareSource, config.rabbitmq)
+    with QueueMonitor(queues, source_factory, args.queue_interval) as monitor:
+        yield monitor
+
+
+def observed_report(
+    args: argparse.Namespace,
+    services: tuple[str, ...],
+    run: Callable[[], str],
+    standin: AuthServiceStandIn | None = None,
+) -> str:
+    """
+    Отчёт run с мониторингом очередей, опросом /metrics services и сбором аудита на время прогона.
+
+    Монитор очередей останавливается последним, и его сводка строится по финальному замеру.
+    """
+    with ExitStack() as stack:
+        monitor = stack.enter_context(queue_monitoring(args))
+        with metrics_sampling(args, services, standin), audit_collection(args) as collector:
+            sections = [run()]
+            if collector is not None:
+                sections.append(format_audit_report(collector))
+    if monitor is not None:
+        sections.append(format_queue_report(monitor.samples()))
+    return format_sections(*sections)
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from src.load.measure import measure
+from src.load.scenarios import Operation
+from src.load.stats import LoadStats
+
+
+@dataclass(frozen=True)
+class OpenLoopSettings:
+    """
+    Параметры открытого прогона с постоянной частотой запросов.
+
+    Запросы отправляются по расписанию rate в секунду независимо от того,
+    ответил ли сервис на предыдущие. max_in_flight ограничивает число
+    одновременных запросов: слот, пришедшийся на заполненное окно,
+    засчитывается как пропущенный.
+    """
+
+    rate: float
+    duration: float
+    max_in_flight: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            raise ValueError("rate must be positive")
+        if self.duration <= 0:
+            raise ValueError("duration must be positive")
+
+
+@dataclass(frozen=True)
+class OpenLoopResult:
+    """Итог расписания: сколько слотов запланировано, пропущено и насколько отставал планировщик."""
+
+    elapsed: float
+    scheduled: int
+    missed: int
+    max_send_lag: float
+
+
+class _OpenLoopRun:
+    """Расписание открытого прогона и запросы, ещё не получившие ответ."""
+
+    def __init__(
+        self,
+        operations: Mapping[str, Operation],
+        settings: OpenLoopSettings,
+        stats: LoadStats,
+    ) -> None:
+        self._operations = operations
+        self._names = list(operations)
+        self._settings = settings
+        self._stats = stats
+        self._interval = 1 / settings.rate
+        self.in_flight: set[asyncio.Task[None]] = set()
+        self.missed = 0
+        self.max_send_lag: float = 0
+        self.started = time.perf_counter()
+
+    async def wait_for_slot(self, slot: int) -> float:
+        """Ждёт запланированный момент слота и возвращает его."""
+        intended = self.started + slot * self._interval
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.max_send_lag = max(self.max_send_lag, time.perf_counter() - intended)
+        return intended
+
+    def send(self, slot: int, intended: float) -> None:
+        name = self._names[slot % len(self._names)]
+        if self._window_full():
+            self.missed += 1
+            self._stats.record_missed(name)
+            return
+        request = measure(name, self._operations[name], self._stats, started=intended)
+        task = asyncio.create_task(request)
+        self.in_flight.add(task)
+        task.add_done_callback(self.in_flight.discard)
+
+    def _window_full(self) -> bool:
+        max_in_flight = self._settings.max_in_flight
+        return max_in_flight is not None and len(self.in_flight) >= max_in_flight
+
+
+async def run_open_loop(
+    operations: Mapping[str, Operation],
+    settings: OpenLoopSettings,
+    stats: LoadStats,
+) -> OpenLoopResult:
+    """
+    Запускает открытый прогон.
+
+    Задержка отсчитывается от запланированного момента отправки, а не от
+    фактического: если сервис или сам планировщик тормозит, ожидание попадает
+    в перцентили (без coordinated omission).
+    """
+    scheduled = int(settings.duration * settings.rate)
+    open_loop = _OpenLoopRun(operations, settings, stats)
+    for slot in range(scheduled):
+        intended = await open_loop.wait_for_slot(slot)
+        open_loop.send(slot, intended)
+
+    await asyncio.gather(*open_loop.in_flight)
+    return OpenLoopResult(
+        elapsed=time.perf_counter() - open_loop.started,
+        scheduled=scheduled,
+        missed=open_loop.missed,
+        max_send_lag=open_loop.max_send_lag,
+    )
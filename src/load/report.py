@@ -0,0 +1,152 @@
+from collections import Counter
+from collections.abc import Iterable
+
+from src.brokers.audit_buffer import CollectedAudit
+from src.brokers.audit_collector import AuditCollector
+from src.brokers.queue_monitor import QueueInterval, QueueSample, queue_intervals
+from src.load.open_loop import OpenLoopResult, OpenLoopSettings
+from src.load.resource_replay import ReplayStats
+from src.load.stats import PERCENTILES, EndpointSummary
+
+MS_IN_SECOND = 1000
+# строк временного ряда на очередь в отчёте; более частые замеры объединяются
+QUEUE_REPORT_ROWS = 20
+_NAME_WIDTH = 20
+_COLUMN_WIDTH = 10
+# нет значения: операции или кода ошибки в аудите, скорости или отставания очереди
+_MISSING = "-"
+
+
+def _format_row(cells: list[str], name_width: int = _NAME_WIDTH) -> str:
+    name, *rest = cells
+    columns = "".join(cell.rjust(_COLUMN_WIDTH) for cell in rest)
+    return name.ljust(name_width) + columns
+
+
+def _name_width(names: Iterable[str]) -> int:
+    """Ширина первой колонки: длинные имена расширяют её."""
+    return max([_NAME_WIDTH, *(len(name) + 2 for name in names)])
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * MS_IN_SECOND:.2f}"
+
+
+def _tenths(number: float) -> str:
+    """Скорости, секунды интервалов и отставание — с одним знаком после запятой."""
+    return f"{number:.1f}"
+
+
+def _quantile_label(quantile: float) -> str:
+    return f"p{quantile:g}"
+
+
+def format_sections(*sections: str) -> str:
+    """Разделы отчёта через пустую строку."""
+    return "\n\n".join(sections)
+
+
+def format_report(summaries: list[EndpointSummary], elapsed: float) -> str:
+    """Таблица с итогами прогона: rps, доля ошибок и перцентили задержки в мс."""
+    header = [
+        "endpoint", "requests", "errors", "err %", "missed", "rps",
+        *(_quantile_label(quantile) for quantile in PERCENTILES),
+        "max",
+    ]
+    # например, «METHOD path» воспроизведённого трафика
+    name_width = _name_width(summary.name for summary in summaries)
+    lines = [f"elapsed: {elapsed:.2f}s", _format_row(header, name_width)]
+    for summary in summaries:
+        lines.append(_format_row([
+            summary.name,
+            str(summary.requests),
+            str(summary.errors),
+            f"{summary.error_rate * 100:.2f}",
+            str(summary.missed),
+            _tenths(summary.throughput),
+            *(_ms(summary.percentiles[quantile]) for quantile in PERCENTILES),
+            _ms(summary.max_latency),
+        ], name_width))
+    return "\n".join(lines)
+
+
+def format_open_loop_report(
+    summaries: list[EndpointSummary],
+    outcome: OpenLoopResult,
+    settings: OpenLoopSettings,
+) -> str:
+    """Таблица format_report открытого прогона и строка его расписания под ней."""
+    schedule = (
+        f"target rate: {settings.rate:g} rps, scheduled: {outcome.scheduled}, "
+        f"missed: {outcome.missed}, max send lag: {_ms(outcome.max_send_lag)}ms"
+    )
+    return "\n".join((format_report(summaries, outcome.elapsed), schedule))
+
+
+def _audit_key(collected: CollectedAudit) -> str:
+    audit = collected.message
+    operation = audit.operation or _MISSING
+    error_code = audit.error_code or _MISSING
+    return f"{operation} {audit.level} {error_code}"
+
+
+def _audit_rows(counts: Counter[str]) -> list[str]:
+    if not counts:
+        return []
+    name_width = _name_width(counts)
+    rows = [_format_row(["operation level error_code", "count"], name_width)]
+    for name, count in counts.most_common():
+        rows.append(_format_row([name, str(count)], name_width))
+    return rows
+
+
+def format_audit_report(collector: AuditCollector) -> str:
+    """Сообщения аудита, собранные за прогон, по операции, уровню и коду ошибки."""
+    snapshot = collector.snapshot()
+    summary = f"audit messages: {len(snapshot.messages)}, evicted: {snapshot.evicted}, invalid: {snapshot.invalid}"
+    counts = Counter(map(_audit_key, snapshot.messages))
+    return "\n".join([summary, *_audit_rows(counts)])
+
+
+def _optional_tenths(rate: float | None) -> str:
+    return _MISSING if rate is None else _tenths(rate)
+
+
+def _format_queue_intervals(queue: str, intervals: list[QueueInterval]) -> list[str]:
+    lines = [f"queue {queue}"]
+    lines.append(_format_row(["t, s", "depth", "consumers", "net/s", "in/s", "out/s", "lag, s"]))
+    for interval in intervals:
+        lines.append(_format_row([
+            f"{_tenths(interval.start)}-{_tenths(interval.end)}",
+            str(interval.messages),
+            str(interval.consumers),
+            _tenths(interval.net_rate),
+            _optional_tenths(interval.enqueue_rate),
+            _optional_tenths(interval.dequeue_rate),
+            _optional_tenths(interval.lag),
+        ]))
+    return lines
+
+
+def format_queue_report(samples: list[QueueSample]) -> str:
+    """
+    Глубина, потребители, скорости поступления (in) и разбора (out) и отставание по очередям во времени.
+
+    in, out и lag есть только при замерах через management API, net — изменение глубины.
+    """
+    if not samples:
+        return "queues: no samples"
+    lines = [f"queue samples: {len(samples)}"]
+    for queue, intervals in queue_intervals(samples, QUEUE_REPORT_ROWS).items():
+        peak = max(sample.messages for sample in samples if sample.queue == queue)
+        lines.append("")
+        lines.extend(_format_queue_intervals(f"{queue} (peak depth {peak})", intervals))
+    return "\n".join(lines)
+
+
+def format_replay_report(stats: ReplayStats, elapsed: float) -> str:
+    """Таблицы format_report по каждому разрезу воспроизведения корпуса."""
+    sections = []
+    for name, breakdown in stats.breakdowns.items():
+        sections.append(f"by {name}:\n{format_report(breakdown.summarize(elapsed), elapsed)}")
+    return format_sections(*sections)
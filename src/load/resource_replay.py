@@ -0,0 +1,166 @@
+"""
+Воспроизведение корпуса ResourceChangeMessage через update_resource.
+
+Корпус — JSONL, по одному сообщению в строке в формате API
+(как ``dataclasses.asdict(ResourceChangeMessage)``). Задержки раскладываются
+по change_type, operation и типу ресурса.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+import httpx
+
+from src.api_clients.auth_service import AsyncAuthServiceV0APIClient
+from src.api_clients.encoding import encode_json
+from src.load.stats import LoadStats
+from src.models.resource import ResourceChangeMessage, resource_change_message_from_dict
+
+BY_CHANGE_TYPE = "change_type"
+BY_OPERATION = "operation"
+BY_RESOURCE_TYPE = "resource_type"
+
+Breakdown = tuple[str, Callable[[ResourceChangeMessage], str]]
+
+BREAKDOWNS: tuple[Breakdown, ...] = (
+    (BY_CHANGE_TYPE, lambda message: message.change_type),
+    (BY_OPERATION, lambda message: message.operation),
+    (BY_RESOURCE_TYPE, lambda message: message.resource.type),
+)
+
+TokenSource = Callable[[], Awaitable[str]]
+
+
+@dataclass(frozen=True)
+class ReplaySettings:
+    """
+    Параметры воспроизведения.
+
+    rate — сообщений в секунду (None — без расписания, с максимальной скоростью),
+    concurrency — предел одновременных запросов. При заданном rate задержка
+    считается от запланированного момента отправки, поэтому ожидание свободного
+    слота попадает в перцентили. fresh_request_ids заменяет request_id каждого
+    сообщения новым, чтобы повторные прогоны не упирались в идемпотентность.
+    """
+
+    concurrency: int
+    rate: float | None = None
+    fresh_request_ids: bool = False
+
+    def __post_init__(self) -> None:
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError("rate must be positive")
+
+
+def load_corpus(path: Path) -> list[ResourceChangeMessage]:
+    """Читает корпус JSONL; пустые строки пропускаются."""
+    messages = []
+    with path.open(encoding="utf-8") as corpus:
+        for line_number, line in enumerate(corpus, start=1):
+            if not line.strip():
+                continue
+            try:
+                messages.append(resource_change_message_from_dict(json.loads(line)))
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ValueError(f"{path}:{line_number}: invalid ResourceChangeMessage: {exc!r}") from exc
+    return messages
+
+
+class ReplayStats:
+    """Задержки воспроизведения в разрезах BREAKDOWNS."""
+
+    def __init__(self) -> None:
+        self.breakdowns = {name: LoadStats() for name, _ in BREAKDOWNS}
+
+    def record(self, message: ResourceChangeMessage, latency: float, ok: bool) -> None:
+        for name, key in BREAKDOWNS:
+            self.breakdowns[name].record(key(message), latency, ok)
+
+
+class _CorpusReplay:
+    """Отправка сообщений корпуса с пределом одновременных запросов."""
+
+    def __init__(  # noqa: WPS211 # клиент, настройки, накопитель и заголовки запроса
+        self,
+        client: AsyncAuthServiceV0APIClient,
+        settings: ReplaySettings,
+        stats: ReplayStats,
+        token: TokenSource | None,
+        x_telegram_user_id: str | None,
+    ) -> None:
+        self._client = client
+        self._settings = settings
+        self._stats = stats
+        self._token = token
+        self._x_telegram_user_id = x_telegram_user_id
+        self._slots = asyncio.Semaphore(settings.concurrency)
+        self._in_flight: set[asyncio.Task[None]] = set()
+        self.started = time.perf_counter()
+
+    async def wait_for_slot(self, index: int) -> float:
+        """Ждёт момента отправки index-го сообщения и свободного слота; возвращает начало замера."""
+        if self._settings.rate is None:
+            await self._slots.acquire()
+            return time.perf_counter()
+        intended = self.started + index / self._settings.rate
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self._slots.acquire()
+        return intended
+
+    def start(self, message: ResourceChangeMessage, started: float) -> None:
+        """Отправляет сообщение в фоне; слот уже занят wait_for_slot."""
+        task = asyncio.create_task(self._send(message, started))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def finish(self) -> float:
+        """Ждёт незавершённые запросы и возвращает длительность прогона в секундах."""
+        await asyncio.gather(*self._in_flight)
+        return time.perf_counter() - self.started
+
+    async def _send(self, message: ResourceChangeMessage, started: float) -> None:
+        try:
+            response = await self._client.update_resource(
+                encode_json(asdict(self._prepare(message))),
+                token=None if self._token is None else await self._token(),
+                x_telegram_user_id=self._x_telegram_user_id,
+            )
+        except httpx.HTTPError:
+            self._stats.record(message, time.perf_counter() - started, ok=False)
+        else:
+            self._stats.record(message, time.perf_counter() - started, ok=response.is_success)
+        finally:
+            self._slots.release()
+
+    def _prepare(self, message: ResourceChangeMessage) -> ResourceChangeMessage:
+        if self._settings.fresh_request_ids:
+            return replace(message, request_id=str(uuid.uuid4()))
+        return message
+
+
+async def replay_corpus(  # noqa: WPS211 # клиент, корпус, настройки, накопитель и заголовки запроса
+    client: AsyncAuthServiceV0APIClient,
+    messages: Sequence[ResourceChangeMessage],
+    settings: ReplaySettings,
+    stats: ReplayStats,
+    token: TokenSource | None = None,
+    x_telegram_user_id: str | None = None,
+) -> float:
+    """
+    Отправляет сообщения по порядку и возвращает длительность прогона в секундах.
+
+    token — корутина-функция, возвращающая актуальный токен (например, AsyncTokenProvider).
+    """
+    replay = _CorpusReplay(client, settings, stats, token, x_telegram_user_id)
+    for index, message in enumerate(messages):
+        replay.start(message, await replay.wait_for_slot(index))
+    return await replay.finish()
@@ -0,0 +1,181 @@
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from dataclasses import asdict
+from types import TracebackType
+
+import httpx
+
+from src.api_clients.auth_service import AsyncAuthServiceV0APIClient
+from src.api_clients.encoding import EncodedBodyCache
+from src.api_clients.token_provider import AsyncTokenProvider, ClientCredentials
+from src.api_clients.webserver import AsyncWebServerV0APIClient
+from src.common import fields, ids
+from src.models import resource
+
+Operation = Callable[[], Awaitable[httpx.Response]]
+OperationNames = tuple[str, ...]
+
+FILTER_NOTES = "filter_notes"
+UPDATE_RESOURCE = "update_resource"
+LOGIN = "login"
+CREATE_NOTE = "create_note"
+
+AUTH_SERVICE_OPERATIONS = (FILTER_NOTES, UPDATE_RESOURCE, LOGIN)
+WEBSERVER_OPERATIONS = (CREATE_NOTE,)
+
+
+def is_success(response: httpx.Response) -> bool:
+    """Ответ считается успешным, если статус 2xx."""
+    return response.is_success
+
+
+class AuthServiceScenario:
+    """
+    Операции auth-service для нагрузочного прогона.
+
+    Данные запросов берутся из тестовых фикстур БД (src.common.ids),
+    update_resource каждый раз создаёт новую заметку в общем пространстве.
+    """
+
+    def __init__(
+        self,
+        client: AsyncAuthServiceV0APIClient,
+        credentials: ClientCredentials,
+    ) -> None:
+        self.client = client
+        self.credentials = credentials
+        # токен переживает длинные прогоны: провайдер обновляет его до истечения expires_in
+        self.tokens = AsyncTokenProvider(client)
+        self.bodies = EncodedBodyCache()
+
+    async def __aenter__(self) -> "AuthServiceScenario":
+        # токен, с которым ходят filter_notes и update_resource, получается до начала прогона
+        await self.token()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        # останавливает фоновое обновление токена
+        self.tokens.close()
+
+    async def token(self) -> str:
+        return await self.tokens.get_token(self.credentials)
+
+    def operations(self, names: tuple[str, ...] = AUTH_SERVICE_OPERATIONS) -> dict[str, Operation]:
+        available: dict[str, Operation] = {
+            FILTER_NOTES: self.filter_notes,
+            UPDATE_RESOURCE: self.update_resource,
+            LOGIN: self.login,
+        }
+        unknown = set(names) - available.keys()
+        if unknown:
+            raise ValueError(f"unknown auth-service operations: {sorted(unknown)}")
+        return {name: available[name] for name in names}
+
+    async def filter_notes(self) -> httpx.Response:
+        return await self.client.filter_notes(
+            token=await self.token(),
+            body=self.bodies.get(FILTER_NOTES, _personal_notes_filter),
+            x_telegram_user_id=ids.PERSONAL_SPACE_OWNER_USER_ID,
+        )
+
+    async def update_resource(self) -> httpx.Response:
+        return await self.client.update_resource(
+            asdict(new_note_message()),
+            token=await self.token(),
+            x_telegram_user_id=ids.SHARED_SPACE_OWNER_USER_ID,
+        )
+
+    async def login(self) -> httpx.Response:
+        return await self.client.login(self.credentials.login_request())
+
+
+class WebServerScenario:
+    """Операции веб-сервера для нагрузочного прогона."""
+
+    def __init__(self, client: AsyncWebServerV0APIClient) -> None:
+        self.client = client
+        self.bodies = EncodedBodyCache()
+
+    def operations(self, names: tuple[str, ...] = WEBSERVER_OPERATIONS) -> dict[str, Operation]:
+        available: dict[str, Operation] = {CREATE_NOTE: self.create_note}
+        unknown = set(names) - available.keys()
+        if unknown:
+            raise ValueError(f"unknown webserver operations: {sorted(unknown)}")
+        return {name: available[name] for name in names}
+
+    async def create_note(self) -> httpx.Response:
+        # тело одно на весь прогон: веб-сервер не требует уникального текста
+        return await self.client.create_note(self.bodies.get(CREATE_NOTE, new_note))
+
+
+def _select(names: OperationNames, operations: OperationNames) -> OperationNames:
+    return tuple(filter(operations.__contains__, names))
+
+
+async def mixed_operations(
+    names: OperationNames,
+    auth_client: AsyncAuthServiceV0APIClient,
+    webserver_client: AsyncWebServerV0APIClient,
+    credentials: Callable[[], ClientCredentials],
+    scenarios: AsyncExitStack,
+) -> dict[str, Operation]:
+    """
+    Операции обоих сервисов в порядке names; сценарий auth-service закрывает scenarios.
+
+    credentials вызывается, только если среди names есть операции auth-service.
+    """
+    unknown = set(names) - {*AUTH_SERVICE_OPERATIONS, *WEBSERVER_OPERATIONS}
+    if unknown:
+        raise ValueError(f"unknown operations: {sorted(unknown)}")
+
+    operations: dict[str, Operation] = {}
+    auth_names = _select(names, AUTH_SERVICE_OPERATIONS)
+    if auth_names:
+        scenario = await scenarios.enter_async_context(AuthServiceScenario(auth_client, credentials()))
+        operations.update(scenario.operations(auth_names))
+
+    webserver_names = _select(names, WEBSERVER_OPERATIONS)
+    if webserver_names:
+        operations.update(WebServerScenario(webserver_client).operations(webserver_names))
+    return {name: operations[name] for name in names}
+
+
+def _personal_notes_filter() -> dict:
+    return {
+        fields.NOTE_IDS_FIELD: ids.PERSONAL_NOTES,
+        fields.SPACE_ID_FIELD: ids.PERSONAL_SPACE_ID,
+    }
+
+
+def new_note() -> dict:
+    """Тело create_note для пользователя и пространства из БД веб-сервера."""
+    return {
+        fields.USER_ID_FIELD: ids.NOTES_USER_ID,
+        "text": f"load note {uuid.uuid4()}",
+        fields.SPACE_ID_FIELD: ids.NOTES_SPACE_ID,
+        "type": "text",
+    }
+
+
+def new_note_message() -> resource.ResourceChangeMessage:
+    """ResourceChangeMessage о новой заметке в общем пространстве."""
+    return resource.ResourceChangeMessage(
+        request_id=str(uuid.uuid4()),
+        resource=resource.ResourceRef(type=fields.ResourceType.NOTE, id=str(uuid.uuid4())),
+        operation=fields.Operation.CREATE,
+        change_type=fields.ChangeType.RESOURCE_ADDED,
+        relations=resource.ResourceRelations(
+            owner=resource.ResourceRef(type=fields.ResourceType.USER, id=ids.SHARED_SPACE_OWNER_UUID),
+            parent=resource.ResourceRef(type=fields.ResourceType.SPACE, id=ids.SHARED_SPACE_ID),
+        ),
+        context=resource.ResourceEventContext(
+            source_service=fields.NOTES_SERVICE_NAME,
+            event_type=fields.EventType.NOTE_CREATED,
+        ),
+    )
@@ -0,0 +1,170 @@
+"""
+Что видел сам сервис за прогон: снимки /metrics до и после и их разница в отчёте.
+"""
+
+import logging
+from collections.abc import Awaitable, Mapping
+from operator import itemgetter
+from typing import Protocol, TypeVar
+
+import httpx
+
+from src.api_clients.prometheus import (
+    HistogramDelta,
+    MetricsDiff,
+    MetricsSnapshot,
+    SeriesKey,
+    format_series,
+    snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+AUTH_SERVICE = "auth-service"
+WEBSERVER = "webserver"
+DEFAULT_TOP_SERIES = 15
+REPORT_QUANTILES = (0.5, 0.9, 0.99)
+_NAME_WIDTH = 20
+_COLUMN_WIDTH = 12
+
+# имя ряда и ячейки строки отчёта
+Row = tuple[str, list[str]]
+RunResult = TypeVar("RunResult")
+
+
+class MetricsSource(Protocol):
+    async def get_metrics(self) -> httpx.Response: ...
+
+
+class BlockingMetricsSource(Protocol):
+    def get_metrics(self) -> httpx.Response: ...
+
+
+async def scrape(service: str, client: MetricsSource) -> MetricsSnapshot | None:
+    """Снимок /metrics; недоступные или нечитаемые метрики не прерывают прогон."""
+    try:
+        response = await client.get_metrics()
+    except httpx.HTTPError as exc:
+        logger.warning("%s /metrics scrape failed: %r", service, exc)
+        return None
+    return _parse_response(service, response)
+
+
+def scrape_blocking(service: str, client: BlockingMetricsSource) -> MetricsSnapshot | None:
+    """То же, что scrape, через синхронный клиент."""
+    try:
+        response = client.get_metrics()
+    except httpx.HTTPError as exc:
+        logger.warning("%s /metrics scrape failed: %r", service, exc)
+        return None
+    return _parse_response(service, response)
+
+
+def _parse_response(service: str, response: httpx.Response) -> MetricsSnapshot | None:
+    if not response.is_success:
+        logger.warning("%s /metrics returned status %s", service, response.status_code)
+        return None
+    try:
+        return snapshot(response.text)
+    except ValueError as exc:
+        logger.warning("%s /metrics is not in Prometheus text format: %s", service, exc)
+        return None
+
+
+class ServiceMetricsProbe:
+    """Снимает /metrics сервиса до и после прогона."""
+
+    def __init__(self, service: str, client: MetricsSource) -> None:
+        self.service = service
+        self.client = client
+        self.before: MetricsSnapshot | None = None
+
+    async def start(self) -> None:
+        self.before = await scrape(self.service, self.client)
+
+    async def finish(self, top: int = DEFAULT_TOP_SERIES) -> str:
+        after = await scrape(self.service, self.client)
+        if self.before is None or after is None:
+            return f"{self.service} /metrics: unavailable"
+        return format_metrics_diff(self.service, MetricsDiff(self.before, after), top)
+
+
+async def with_service_metrics(
+    clients: Mapping[str, MetricsSource],
+    run: Awaitable[RunResult],
+) -> tuple[RunResult, list[str]]:
+    """Ждёт run между снимками /metrics сервисов из clients; возвращает его итог и отчёты сервисов."""
+    probes = [ServiceMetricsProbe(service, client) for service, client in clients.items()]
+    for started in probes:
+        await started.start()
+    run_result = await run
+    return run_result, [await probe.finish() for probe in probes]
+
+
+def _row(name: str, cells: list[str], name_width: int) -> str:
+    aligned = [cell.rjust(_COLUMN_WIDTH) for cell in cells]
+    return name.ljust(name_width) + "".join(aligned)
+
+
+def _name_width(names: list[str]) -> int:
+    widths = [len(name) + 2 for name in names]
+    return max([_NAME_WIDTH, *widths])
+
+
+class _Table:
+    """Таблица отчёта: имя ряда слева, ячейки справа; ширина имён — по самому длинному."""
+
+    def __init__(self, header: str, columns: list[str]) -> None:
+        self.header = header
+        self.columns = columns
+        self.rows: list[Row] = []
+
+    def add(self, name: str, cells: list[str]) -> None:
+        self.rows.append((name, cells))
+
+    def lines(self) -> list[str]:
+        if not self.rows:
+            return []
+        name_width = _name_width([name for name, _cells in self.rows])
+        rows = [_row(name, cells, name_width) for name, cells in self.rows]
+        return [_row(self.header, self.columns, name_width), *rows]
+
+
+def _top_deltas(diff: MetricsDiff, top: int) -> list[tuple[SeriesKey, float]]:
+    deltas = diff.counter_deltas()
+    changed = [(key, delta) for key, delta in deltas.items() if delta]
+    changed.sort(key=itemgetter(1), reverse=True)
+    return changed[:top]
+
+
+def _counter_lines(diff: MetricsDiff, top: int) -> list[str]:
+    """Счётчики с наибольшим приращением."""
+    rates = diff.counter_rates()
+    table = _Table("counter", ["delta", "rate/s"])
+    for key, delta in _top_deltas(diff, top):
+        table.add(format_series(key), [f"{delta:g}", f"{rates[key]:.1f}"])
+    return table.lines()
+
+
+def _histogram_cells(histogram: HistogramDelta) -> list[str]:
+    quantiles = [f"{histogram.quantile(quantile):.4g}" for quantile in REPORT_QUANTILES]
+    return [f"{histogram.count:g}", f"{histogram.mean:.4g}", *quantiles]
+
+
+def _histogram_lines(diff: MetricsDiff, top: int) -> list[str]:
+    """Число наблюдений, среднее и квантили гистограмм с наблюдениями за интервал."""
+    quantile_names = [f"p{quantile * 100:g}" for quantile in REPORT_QUANTILES]
+    table = _Table("histogram", ["count", "mean", *quantile_names])
+    observed = [histogram for histogram in diff.histograms() if histogram.count]
+    for histogram in observed[:top]:
+        table.add(histogram.name, _histogram_cells(histogram))
+    return table.lines()
+
+
+def format_metrics_diff(service: str, diff: MetricsDiff, top: int = DEFAULT_TOP_SERIES) -> str:
+    """Счётчики с наибольшим приращением и квантили гистограмм (в единицах метрики) за интервал."""
+    changes = [*_counter_lines(diff, top), *_histogram_lines(diff, top)]
+    lines = [f"{service} /metrics over {diff.elapsed:.2f}s", *changes]
+    if not changes:
+        lines.append("no counters or histograms changed")
+    return "\n".join(lines)
@@ -0,0 +1,93 @@
+import math
+from dataclasses import dataclass, field
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def percentile(sorted_values: list[float], quantile: float) -> float:
+    """Перцентиль по методу nearest-rank; список должен быть отсортирован."""
+    if not sorted_values:
+        return math.nan
+    rank = math.ceil(quantile / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+@dataclass
+class EndpointStats:
+    """Сырые измерения по одной ручке."""
+
+    name: str
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    missed: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+
+    def record_missed(self) -> None:
+        self.missed += 1
+
+
+@dataclass(frozen=True)
+class EndpointSummary:
+    """
+    Итог по ручке: пропускная способность, ошибки и перцентили задержки (секунды).
+
+    missed — слоты открытого прогона, в которые запрос не был отправлен.
+    """
+
+    name: str
+    requests: int
+    errors: int
+    missed: int
+    throughput: float
+    percentiles: dict[float, float]
+    max_latency: float
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0
+
+
+class LoadStats:
+    """Накопитель измерений нагрузочного прогона по ручкам."""
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def record(self, name: str, latency: float, ok: bool) -> None:
+        self._endpoint(name).record(latency, ok)
+
+    def record_missed(self, name: str) -> None:
+        self._endpoint(name).record_missed()
+
+    def summarize(self, elapsed: float) -> list[EndpointSummary]:
+        """Сводка по всем ручкам за прогон длительностью elapsed секунд."""
+        summaries = []
+        for endpoint in self.endpoints.values():
+            latencies = sorted(endpoint.latencies)
+            summaries.append(EndpointSummary(
+                name=endpoint.name,
+                requests=endpoint.requests,
+                errors=endpoint.errors,
+                missed=endpoint.missed,
+                throughput=endpoint.requests / elapsed if elapsed > 0 else 0,
+                percentiles={
+                    quantile: percentile(latencies, quantile) for quantile in PERCENTILES
+                },
+                max_latency=latencies[-1] if latencies else math.nan,
+            ))
+        return summaries
+
+    def _endpoint(self, name: str) -> EndpointStats:
+        endpoint = self.endpoints.get(name)
+        if endpoint is None:
+            endpoint = EndpointStats(name)
+            self.endpoints[name] = endpoint
+        return endpoint
@@ -0,0 +1,163 @@
+"""
+Воспроизведение записанного трафика (src.api_clients.capture) с исходным темпом или в speed раз быстрее.
+
+Запросы отправляются по расписанию offset / speed от начала прогона, задержка
+считается от запланированного момента. Статистика собирается по «METHOD path»
+без query-строки.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from types import TracebackType
+
+import httpx
+
+from src.api_clients.base import build_async_client
+from src.api_clients.capture import CapturedExchange, base_url_of
+from src.config import HTTPServiceConfig
+from src.load.scenarios import is_success
+from src.load.stats import LoadStats
+
+
+@dataclass(frozen=True)
+class TrafficReplaySettings:
+    """
+    speed — во сколько раз сжать исходные интервалы между запросами,
+    max_in_flight — предел одновременных запросов; слоты сверх него пропускаются.
+    """
+
+    speed: float = 1.0
+    max_in_flight: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.speed <= 0:
+            raise ValueError("speed must be positive")
+
+
+def endpoint_name(exchange: CapturedExchange) -> str:
+    path, _sep, _query = exchange.path.partition("?")
+    return f"{exchange.method} {path}"
+
+
+def replay_targets(
+    services: Mapping[str, HTTPServiceConfig],
+    base_urls: Mapping[str, str],
+) -> dict[str, HTTPServiceConfig]:
+    """
+    Конфигурации сервисов по адресу, который попадает в запись (base_url из конфигурации).
+
+    base_urls — новый адрес по имени сервиса: запросы к нему уходят туда с пулом,
+    таймаутами и лимитами этого сервиса.
+    """
+    unknown = base_urls.keys() - services.keys()
+    if unknown:
+        raise ValueError(f"unknown services: {sorted(unknown)}")
+    targets = {}
+    for name, service_config in services.items():
+        recorded = base_url_of(httpx.URL(str(service_config.base_url)))
+        targets[recorded] = service_config.with_base_url(base_urls.get(name))
+    return targets
+
+
+class _TrafficReplay:
+    """Клиенты по записанным base_url и отправка обменов по расписанию записи."""
+
+    def __init__(
+        self,
+        stats: LoadStats,
+        targets: Mapping[str, HTTPServiceConfig],
+        token: Callable[[], Awaitable[str]] | None,
+    ) -> None:
+        self._stats = stats
+        self._targets = targets
+        self._token = token
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._in_flight: set[asyncio.Task[None]] = set()
+
+    async def run(self, exchanges: Sequence[CapturedExchange], settings: TrafficReplaySettings) -> float:
+        """Отправляет обмены, упорядоченные по offset, и возвращает длительность в секундах."""
+        started = time.perf_counter()
+        for exchange in exchanges:
+            intended = started + (exchange.offset - exchanges[0].offset) / settings.speed
+            await _sleep_until(intended)
+            if settings.max_in_flight is not None and len(self._in_flight) >= settings.max_in_flight:
+                self._stats.record_missed(endpoint_name(exchange))
+                continue
+            task = asyncio.create_task(self._send(exchange, intended))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+        await asyncio.gather(*self._in_flight)
+        return time.perf_counter() - started
+
+    async def __aenter__(self) -> "_TrafficReplay":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+
+    def _client(self, base_url: str) -> httpx.AsyncClient:
+        client = self._clients.get(base_url)
+        if client is not None:
+            return client
+        service_config = self._targets.get(base_url)
+        if service_config is None:
+            # адрес не из конфигурации: отправляем туда же с настройками клиента по умолчанию
+            service_config = HTTPServiceConfig().with_base_url(base_url)
+        client = build_async_client(service_config)
+        self._clients[base_url] = client
+        return client
+
+    async def _send(self, exchange: CapturedExchange, intended: float) -> None:
+        name = endpoint_name(exchange)
+        try:
+            response = await self._client(exchange.base_url).request(
+                exchange.method,
+                exchange.path,
+                headers=exchange.replay_headers(await self._fresh_token(exchange)),
+                content=exchange.request_content(),
+            )
+        except httpx.HTTPError:
+            self._stats.record(name, time.perf_counter() - intended, ok=False)
+            return
+        latency = time.perf_counter() - intended
+        self._stats.record(name, latency, ok=is_success(response))
+
+    async def _fresh_token(self, exchange: CapturedExchange) -> str | None:
+        if self._token is None or not exchange.authorized:
+            return None
+        return await self._token()
+
+
+async def replay_traffic(
+    exchanges: Sequence[CapturedExchange],
+    settings: TrafficReplaySettings,
+    stats: LoadStats,
+    targets: Mapping[str, HTTPServiceConfig] | None = None,
+    token: Callable[[], Awaitable[str]] | None = None,
+) -> float:
+    """
+    Воспроизводит обмены и возвращает длительность прогона в секундах.
+
+    Обмены упорядочиваются по моменту отправки: в файле они лежат в порядке завершения.
+    targets — конфигурации сервисов по записанному base_url (см. replay_targets),
+    token — корутина-функция с актуальным токеном для запросов, записанных с Authorization.
+    """
+    if not exchanges:
+        return 0
+    by_offset = sorted(exchanges, key=lambda exchange: exchange.offset)
+    async with _TrafficReplay(stats, targets or {}, token) as replay:
+        return await replay.run(by_offset, settings)
+
+
+async def _sleep_until(moment: float) -> None:
+    delay = moment - time.perf_counter()
+    if delay > 0:
+        await asyncio.sleep(delay)
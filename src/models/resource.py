@@ -116,6 +116,32 @@ class ResourceChangeErrorResponse:
     meta: ResourceChangeMeta
 
 
+def _optional_ref(payload: dict[str, Any] | None) -> ResourceRef | None:
+    if payload is None:
+        return None
+    return ResourceRef(type=payload["type"], id=payload["id"])
+
+
+def resource_change_message_from_dict(payload: dict[str, Any]) -> ResourceChangeMessage:
+    """Собирает ResourceChangeMessage из dict в формате API (как после asdict); KeyError при нехватке полей."""
+    relations = payload.get("relations")
+    resource = payload["resource"]
+    return ResourceChangeMessage(
+        request_id=payload["request_id"],
+        resource=ResourceRef(type=resource["type"], id=resource["id"]),
+        operation=payload["operation"],
+        change_type=payload["change_type"],
+        relations=None if relations is None else ResourceRelations(
+            owner=_optional_ref(relations.get("owner")),
+            parent=_optional_ref(relations.get("parent")),
+        ),
+        context=ResourceEventContext(
+            source_service=payload["context"]["source_service"],
+            event_type=payload["context"]["event_type"],
+        ),
+    )
+
+
 def _serialize_api_value(raw_value: Any) -> Any:
     if isinstance(raw_value, Enum):
         serialized = raw_value.value
@@ -0,0 +1,3 @@
+"""
+Заглушки сервисов bot-zanuda для офлайн-замеров тестового стенда без Go-сервисов.
+"""
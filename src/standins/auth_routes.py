@@ -0,0 +1,170 @@
+"""
+Обработчики ручек заглушки auth-service: login, filter_notes, update_resource и health.
+
+Токены, выданные login, хранятся в памяти; filter_notes и update_resource
+принимают только их.
+"""
+
+import json
+import threading
+import uuid
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from src.api_clients import auth_service as paths
+from src.api_clients.encoding import JSON_CONTENT_TYPE, encode_json
+from src.common import errors, fields
+from src.models import resource
+
+TOKEN_LIFETIME = 3600
+BEARER_PREFIX = "Bearer "
+INVALID_BODY_ERROR = "invalid request body"
+
+
+@dataclass(frozen=True)
+class StandInResponse:
+    status_code: int
+    body: bytes
+    content_type: str = JSON_CONTENT_TYPE
+
+
+Route = Callable[[Mapping[str, str], bytes], StandInResponse]
+
+
+def json_response(status_code: int, payload: Any) -> StandInResponse:
+    return StandInResponse(status_code, encode_json(payload))
+
+
+def error_response(status_code: int, message: str) -> StandInResponse:
+    return json_response(status_code, {fields.ERROR_FIELD: message})
+
+
+def _changed_tuples(message: resource.ResourceChangeMessage) -> tuple[resource.AuthTuple, ...]:
+    """Кортежи owner/space по связям ресурса."""
+    resource_ref = resource.format_ref(message.resource.type, message.resource.id)
+    relations = message.relations or resource.ResourceRelations()
+    changed = []
+    if relations.owner is not None:
+        changed.append(resource.AuthTuple(
+            subject=resource.format_ref(relations.owner.type, relations.owner.id),
+            relation=fields.Relation.OWNER,
+            resource=resource_ref,
+        ))
+    if relations.parent is not None:
+        changed.append(resource.AuthTuple(
+            subject=resource.format_ref(relations.parent.type, relations.parent.id),
+            relation=fields.Relation.SPACE,
+            resource=resource_ref,
+        ))
+    return tuple(changed)
+
+
+def _login_error(request: Any, clients: Mapping[str, str]) -> StandInResponse | None:
+    """Ответ с ошибкой на тело login, не прошедшее проверку, иначе None."""
+    if not isinstance(request, dict) or not request:
+        return error_response(httpx.codes.BAD_REQUEST, errors.EMPTY_LOGIN_REQUEST_ERROR)
+    if request.get(fields.GRANT_TYPE_FIELD) != fields.GRANT_TYPE_CLIENT_CREDENTIALS:
+        return error_response(httpx.codes.BAD_REQUEST, errors.INVALID_GRANT_TYPE_ERROR)
+    client_secret = clients.get(request.get(fields.CLIENT_ID_FIELD, ""))
+    if client_secret is None:
+        return error_response(httpx.codes.UNAUTHORIZED, errors.INVALID_CLIENT_ERROR)
+    if request.get(fields.CLIENT_SECRET_FIELD) != client_secret:
+        return error_response(httpx.codes.UNAUTHORIZED, errors.INVALID_CLIENT_SECRET_ERROR)
+    return None
+
+
+class AuthServiceRoutes:
+    """
+    Ручки заглушки по (метод, путь); clients — client_id и секреты для login,
+    readable_notes — заметки, которые filter_notes отдаёт как доступные.
+    """
+
+    def __init__(self, clients: Mapping[str, str], readable_notes: tuple[str, ...]) -> None:
+        self.clients = clients
+        self.readable_notes = frozenset(readable_notes)
+        self._tokens: set[str] = set()
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], Route] = {
+            ("POST", paths.LOGIN_PATH): self.login,
+            ("POST", paths.FILTER_NOTES_PATH): self.filter_notes,
+            ("POST", paths.UPDATE_RESOURCE_PATH): self.update_resource,
+            ("GET", paths.HEALTH_PATH): self.health,
+        }
+
+    def get(self, method: str, path: str) -> Route | None:
+        return self._routes.get((method, path))
+
+    def login(self, _headers: Mapping[str, str], body: bytes) -> StandInResponse:
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return error_response(httpx.codes.BAD_REQUEST, errors.EMPTY_LOGIN_REQUEST_ERROR)
+        invalid = _login_error(request, self.clients)
+        if invalid is not None:
+            return invalid
+
+        access_token = f"stand-in-{uuid.uuid4()}"
+        with self._lock:
+            self._tokens.add(access_token)
+        return json_response(httpx.codes.OK, {
+            fields.ACCESS_TOKEN_FIELD: access_token,
+            fields.TOKEN_TYPE_FIELD: BEARER_PREFIX.strip(),
+            fields.EXPIRES_IN_FIELD: TOKEN_LIFETIME,
+            fields.SCOPE_FIELD: request.get(fields.SCOPE_FIELD, ""),
+        })
+
+    def filter_notes(self, headers: Mapping[str, str], body: bytes) -> StandInResponse:
+        unauthorized = self._authorize(headers)
+        if unauthorized is not None:
+            return unauthorized
+        try:
+            note_ids = json.loads(body)[fields.NOTE_IDS_FIELD]
+        except (ValueError, KeyError, TypeError):
+            return error_response(httpx.codes.BAD_REQUEST, INVALID_BODY_ERROR)
+        if not note_ids:
+            return error_response(httpx.codes.BAD_REQUEST, "note_ids is required")
+        return json_response(httpx.codes.OK, {
+            fields.NOTES_FIELD: {
+                note_id: {fields.CAN_READ_FIELD: True, fields.CAN_EDIT_FIELD: True}
+                for note_id in note_ids if note_id in self.readable_notes
+            },
+        })
+
+    def update_resource(self, headers: Mapping[str, str], body: bytes) -> StandInResponse:
+        unauthorized = self._authorize(headers)
+        if unauthorized is not None:
+            return unauthorized
+        try:
+            message = resource.resource_change_message_from_dict(json.loads(body))
+        except (ValueError, KeyError, TypeError):
+            return error_response(httpx.codes.BAD_REQUEST, INVALID_BODY_ERROR)
+
+        changed = _changed_tuples(message)
+        removed = message.change_type == fields.ChangeType.RESOURCE_REMOVED
+        return json_response(httpx.codes.OK, resource.to_api_dict(resource.ResourceChangeResponse(
+            request_id=message.request_id,
+            idempotency_key="",
+            status=fields.Status.COMPLETED,
+            operation_result=fields.OperationResult.APPLIED,
+            resource=message.resource,
+            written_tuples=() if removed else changed,
+            deleted_tuples=changed if removed else (),
+            meta=resource.ResourceChangeMeta(),
+        )))
+
+    def health(self, _headers: Mapping[str, str], _body: bytes) -> StandInResponse:
+        return json_response(httpx.codes.OK, {"status": "ok"})
+
+    def _authorize(self, headers: Mapping[str, str]) -> StandInResponse | None:
+        """Ответ 401 для запроса без выданного заглушкой токена, иначе None."""
+        authorization = headers.get("authorization", "")
+        if not authorization.startswith(BEARER_PREFIX):
+            return error_response(httpx.codes.UNAUTHORIZED, "invalid token: no prefix Bearer")
+        with self._lock:
+            known = authorization.removeprefix(BEARER_PREFIX) in self._tokens
+        if not known:
+            return error_response(httpx.codes.UNAUTHORIZED, errors.INVALID_TOKEN_ERROR)
+        return None
@@ -0,0 +1,178 @@
+"""
+Заглушка auth-service в процессе: ASGI-приложение и транспорт для синхронного httpx.Client.
+
+Реализует login, filter_notes, update_resource, health и /metrics с формой ответов,
+которую проверяют тесты. Задержка и доля ошибок 500 настраиваются; /metrics
+отвечает без задержки и ошибок, чтобы его можно было опрашивать во время прогона.
+Заглушка не проверяет права и связи: она нужна для замера стоимости клиентской стороны.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable, Mapping, MutableMapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from src.api_clients.auth_service import METRICS_PATH
+from src.common import fields, ids
+from src.standins.auth_routes import AuthServiceRoutes, StandInResponse, error_response
+from src.standins.http_metrics import RequestMetrics
+
+DEFAULT_CLIENT_SECRET = "super-strong-secret"
+INJECTED_ERROR = "stand-in injected error"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+AsgiScope = MutableMapping[str, Any]
+AsgiReceive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+AsgiSend = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class StandInSettings:
+    """
+    Поведение заглушки.
+
+    latency — задержка каждого ответа в секундах, jitter — добавка к ней,
+    равномерно распределённая на [0, jitter], error_rate — доля запросов,
+    на которые вместо обработки отвечается 500. clients — client_id и секреты
+    для login.
+    """
+
+    latency: float = 0
+    jitter: float = 0
+    error_rate: float = 0
+    seed: int | None = None
+    clients: Mapping[str, str] = field(
+        default_factory=lambda: {fields.CLIENT_ID_BOT: DEFAULT_CLIENT_SECRET},
+    )
+    readable_notes: tuple[str, ...] = ids.PERSONAL_NOTES
+
+    def __post_init__(self) -> None:
+        if self.latency < 0 or self.jitter < 0:
+            raise ValueError("latency and jitter must not be negative")
+        if not 0 <= self.error_rate <= 1:
+            raise ValueError("error_rate must be within [0, 1]")
+
+
+class _FaultInjector:
+    """Задержка и ошибки 500 по настройкам; генератор общий для потоков, поэтому под блокировкой."""
+
+    def __init__(self, settings: StandInSettings) -> None:
+        self.settings = settings
+        self._random = random.Random(settings.seed)
+        self._lock = threading.Lock()
+
+    def delay(self, path: str) -> float:
+        """Искусственная задержка ответа на path; /metrics отвечает сразу."""
+        if path == METRICS_PATH or not (self.settings.latency or self.settings.jitter):
+            return 0
+        with self._lock:
+            jitter = self._random.uniform(0, self.settings.jitter)
+        return self.settings.latency + jitter
+
+    def should_fail(self) -> bool:
+        if not self.settings.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.settings.error_rate
+
+
+class AuthServiceStandIn:
+    """Заглушка auth-service; один экземпляр можно использовать из нескольких потоков."""
+
+    def __init__(self, settings: StandInSettings | None = None) -> None:
+        self.settings = settings or StandInSettings()
+        self.faults = _FaultInjector(self.settings)
+        self.routes = AuthServiceRoutes(self.settings.clients, self.settings.readable_notes)
+        self.metrics = RequestMetrics()
+
+    async def __call__(self, scope: AsgiScope, receive: AsgiReceive, send: AsgiSend) -> None:
+        if scope["type"] != "http":
+            return
+        path = scope["path"]
+        body = await _read_body(receive)
+        delay = self.faults.delay(path)
+        if delay:
+            await asyncio.sleep(delay)
+        response = self.respond(scope["method"], path, _headers(scope), body, delay)
+        await _send_response(send, response)
+
+    def respond(  # noqa: WPS211 # части HTTP-запроса и выдержанная задержка
+        self,
+        method: str,
+        path: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        delay: float = 0,
+    ) -> StandInResponse:
+        """
+        Отвечает на запрос; ошибки error_rate учитываются.
+
+        delay — уже выдержанная искусственная задержка, она входит в гистограмму /metrics.
+        """
+        if method == "GET" and path == METRICS_PATH:
+            return StandInResponse(httpx.codes.OK, self.metrics.text().encode(), METRICS_CONTENT_TYPE)
+
+        started = time.perf_counter()
+        route = self.routes.get(method, path)
+        if route is None:
+            response = error_response(httpx.codes.NOT_FOUND, "not found")
+        elif self.faults.should_fail():
+            response = error_response(httpx.codes.INTERNAL_SERVER_ERROR, INJECTED_ERROR)
+        else:
+            response = route(headers, body)
+        duration = delay + time.perf_counter() - started
+        self.metrics.observe(path, response.status_code, duration)
+        return response
+
+    def transport(self) -> httpx.MockTransport:
+        """Транспорт для httpx.Client: задержка выдерживается time.sleep в потоке запроса."""
+        return httpx.MockTransport(self._respond_sync)
+
+    def async_transport(self) -> httpx.ASGITransport:
+        """Транспорт для httpx.AsyncClient поверх ASGI-приложения."""
+        return httpx.ASGITransport(app=self)
+
+    def _respond_sync(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        delay = self.faults.delay(path)
+        time.sleep(delay)
+        response = self.respond(request.method, path, request.headers, request.read(), delay)
+        return httpx.Response(
+            response.status_code,
+            content=response.body,
+            headers={"content-type": response.content_type},
+        )
+
+
+async def _read_body(receive: AsgiReceive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def _headers(scope: AsgiScope) -> dict[str, str]:
+    return {
+        name.decode("latin-1"): header_value.decode("latin-1")
+        for name, header_value in scope["headers"]
+    }
+
+
+async def _send_response(send: AsgiSend, response: StandInResponse) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": response.status_code,
+        "headers": [
+            (b"content-type", response.content_type.encode()),
+            (b"content-length", str(len(response.body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": response.body})
@@ -0,0 +1,63 @@
+"""
+Метрики заглушки в формате Prometheus: счётчик запросов по пути и статусу
+и гистограмма времени обработки.
+"""
+
+import threading
+from collections import Counter
+
+# границы гистограммы времени обработки, секунды
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class RequestMetrics:
+    """Потокобезопасные счётчики обработанных запросов."""
+
+    def __init__(self) -> None:
+        self._requests: Counter[tuple[str, int]] = Counter()
+        self._duration_buckets: Counter[float] = Counter()
+        self._duration_sum: float = 0
+        self._duration_count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, path: str, status_code: int, duration: float) -> None:
+        with self._lock:
+            self._requests[path, status_code] += 1
+            self._duration_sum += duration
+            self._duration_count += 1
+            for bound in DURATION_BUCKETS:
+                if duration <= bound:
+                    self._duration_buckets[bound] += 1
+                    break
+
+    def text(self) -> str:
+        """Тело ответа /metrics."""
+        with self._lock:
+            lines = [*self._request_lines(), *self._duration_lines()]
+        # текстовый формат требует перевода строки после последней метрики
+        return "\n".join((*lines, ""))
+
+    def _request_lines(self) -> list[str]:
+        lines = [
+            "# HELP http_requests_total Handled requests.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (path, status_code), count in sorted(self._requests.items()):
+            lines.append(f'http_requests_total{{path="{path}",status="{status_code}"}} {count}')
+        return lines
+
+    def _duration_lines(self) -> list[str]:
+        lines = [
+            "# HELP http_request_duration_seconds Request handling time.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        cumulative = 0
+        for bound in DURATION_BUCKETS:
+            cumulative += self._duration_buckets[bound]
+            lines.append(f'http_request_duration_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines.extend((
+            f'http_request_duration_seconds_bucket{{le="+Inf"}} {self._duration_count}',
+            f"http_request_duration_seconds_sum {self._duration_sum}",
+            f"http_request_duration_seconds_count {self._duration_count}",
+        ))
+        return lines
@@ -0,0 +1,656 @@
+"""
+Брокер RabbitMQ в памяти процесса с интерфейсом pika.BlockingConnection.
+
+Поддерживает обменники direct/fanout/topic и обменник по умолчанию, очереди,
+basic_publish, basic_get, basic_consume с доставкой в process_data_events,
+ack/nack/reject, подтверждения публикации и пассивные объявления. Ошибки
+отдаются исключениями pika, как от настоящего брокера. Сообщения не
+переживают процесс; exclusive и auto_delete очереди удаляются при закрытии
+объявившего их соединения.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+
+from pika import exceptions, spec
+from pika.exchange_type import ExchangeType
+from pika.frame import Method
+
+DEFAULT_EXCHANGE = ""
+# сколько сообщений выдаётся одному потребителю за вызов process_data_events
+DELIVERY_BATCH = 1000
+NOT_FOUND = 404
+PRECONDITION_FAILED = 406
+
+OnMessageCallback = Callable[[Any, Any, Any, bytes], None]
+ThreadsafeCallback = Callable[[], None]
+
+
+@dataclass
+class _Message:
+    exchange: str
+    routing_key: str
+    body: bytes
+    properties: Any
+    redelivered: bool = False
+
+
+@dataclass(frozen=True)
+class _Delivery:
+    delivery_tag: int
+    message: _Message
+    # сколько сообщений осталось в очереди после выдачи
+    message_count: int = 0
+
+
+@dataclass
+class _Consumer:
+    tag: str
+    queue: str
+    callback: OnMessageCallback
+    auto_ack: bool
+    channel: "InMemoryChannel"
+
+
+@dataclass
+class _Queue:
+    name: str
+    durable: bool = False
+    exclusive_owner: "InMemoryConnection | None" = None
+    auto_delete: bool = False
+    messages: deque[_Message] = field(default_factory=deque)
+    consumers: list[_Consumer] = field(default_factory=list)
+
+
+@dataclass
+class _Exchange:
+    name: str
+    exchange_type: str
+    # (routing_key, очередь)
+    bindings: list[tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class _ChannelState:
+    """Выданные каналу и ещё не подтверждённые сообщения."""
+
+    delivery_tags: Iterator[int] = field(default_factory=lambda: itertools.count(1))
+    # delivery_tag -> (очередь, сообщение)
+    unacked: dict[int, tuple[str, _Message]] = field(default_factory=dict)
+    prefetch_count: int = 0
+
+    def can_deliver(self) -> bool:
+        return not self.prefetch_count or len(self.unacked) < self.prefetch_count
+
+
+def _not_found(kind: str, name: str) -> exceptions.ChannelClosedByBroker:
+    return exceptions.ChannelClosedByBroker(NOT_FOUND, f"NOT_FOUND - no {kind} '{name}' in vhost '/'")
+
+
+def _precondition_failed(reply_text: str) -> exceptions.ChannelClosedByBroker:
+    return exceptions.ChannelClosedByBroker(PRECONDITION_FAILED, f"PRECONDITION_FAILED - {reply_text}")
+
+
+def _exchange_matches(exchange_type: str, binding_key: str, routing_key: str) -> bool:
+    if exchange_type == ExchangeType.fanout.value:
+        return True
+    if exchange_type == ExchangeType.topic.value:
+        return topic_matches(binding_key, routing_key)
+    return binding_key == routing_key
+
+
+def topic_matches(pattern: str, routing_key: str) -> bool:
+    """Совпадение ключа с шаблоном topic-обменника: * — одно слово, # — ноль и более слов."""
+    return _match_words(pattern.split("."), routing_key.split(".") if routing_key else [])
+
+
+def _match_words(pattern: list[str], words: list[str]) -> bool:
+    if not pattern:
+        return not words
+    head, rest = pattern[0], pattern[1:]
+    if head == "#":
+        offsets = range(len(words) + 1)
+        return any(_match_words(rest, words[offset:]) for offset in offsets)
+    if not words or head not in {"*", words[0]}:
+        return False
+    return _match_words(rest, words[1:])
+
+
+class InMemoryBroker:
+    """
+    Общее состояние брокера; соединения создаются через connect().
+
+    Все операции берут блокировку брокера сами, каналы и соединения только вызывают их.
+    Ошибки брокера — exceptions.ChannelClosedByBroker, канал закрывается по ним сам.
+    """
+
+    def __init__(self) -> None:
+        self._queues: dict[str, _Queue] = {}
+        self._exchanges: dict[str, _Exchange] = {}
+        self._channels: dict[InMemoryChannel, _ChannelState] = {}
+        self._callbacks: dict[InMemoryConnection, deque[ThreadsafeCallback]] = {}
+        self._condition = threading.Condition()
+        self._tags = itertools.count(1)
+
+    def connect(self, _connection_parameters: Any = None) -> "InMemoryConnection":
+        """Фабрика соединений, совместимая по вызову с pika.BlockingConnection(parameters)."""
+        return InMemoryConnection(self)
+
+    def next_tag(self) -> int:
+        """Номер для имён очередей и тегов потребителей, которые выбирает брокер."""
+        with self._condition:
+            return next(self._tags)
+
+    # Топология
+
+    def declare_queue(
+        self,
+        name: str,
+        durable: bool = True,
+        owner: "InMemoryConnection | None" = None,
+        auto_delete: bool = False,
+    ) -> spec.Queue.DeclareOk:
+        """Объявляет очередь; пустое имя — очередь с именем от брокера, owner — эксклюзивная очередь."""
+        with self._condition:
+            name = name or f"amq.gen-{next(self._tags)}"
+            declared = self._queues.setdefault(name, _Queue(
+                name=name,
+                durable=durable,
+                exclusive_owner=owner,
+                auto_delete=auto_delete,
+            ))
+            return self._declare_ok(declared)
+
+    def queue_status(self, name: str) -> spec.Queue.DeclareOk:
+        """Пассивное объявление: состояние существующей очереди."""
+        with self._condition:
+            return self._declare_ok(self._queue(name))
+
+    def declare_exchange(self, name: str, exchange_type: str = ExchangeType.direct.value) -> None:
+        with self._condition:
+            existing = self._exchanges.setdefault(name, _Exchange(name=name, exchange_type=exchange_type))
+            if existing.exchange_type != exchange_type:
+                raise _precondition_failed(f"inequivalent arg 'type' for exchange '{name}'")
+
+    def check_exchange(self, name: str) -> None:
+        """Пассивное объявление обменника."""
+        with self._condition:
+            self._exchange(name)
+
+    def bind(self, queue: str, exchange: str, routing_key: str = "") -> None:
+        with self._condition:
+            bindings = self._exchange(exchange).bindings
+            bindings.append((routing_key, self._queue(queue).name))
+
+    def purge(self, queue: str) -> int:
+        with self._condition:
+            messages = self._queue(queue).messages
+            count = len(messages)
+            messages.clear()
+            return count
+
+    def delete_queue(self, queue: str) -> int:
+        with self._condition:
+            deleted = self._queues.pop(queue, None)
+        return 0 if deleted is None else len(deleted.messages)
+
+    # Сообщения
+
+    def publish(self, exchange: str, routing_key: str, body: bytes, properties: Any = None) -> int:
+        """Маршрутизирует сообщение и возвращает число очередей, куда оно попало."""
+        with self._condition:
+            targets = self._route(exchange, routing_key)
+            for queue_name in targets:
+                self._queues[queue_name].messages.append(
+                    _Message(exchange, routing_key, body, properties),
+                )
+            if targets:
+                self._condition.notify_all()
+            return len(targets)
+
+    def message_count(self, queue: str) -> int:
+        with self._condition:
+            return len(self._queue(queue).messages)
+
+    def get(self, channel: "InMemoryChannel", queue: str, auto_ack: bool) -> _Delivery | None:
+        """basic_get: первое сообщение очереди или None, если она пуста."""
+        with self._condition:
+            messages = self._queue(queue).messages
+            if not messages:
+                return None
+            message = messages.popleft()
+            delivery_tag = self._track(self._channels[channel], queue, message, auto_ack)
+            return _Delivery(delivery_tag, message, len(messages))
+
+    def ack(self, channel: "InMemoryChannel", delivery_tag: int, multiple: bool) -> None:
+        with self._condition:
+            state = self._channels[channel]
+            for tag in _settled_tags(state, delivery_tag, multiple):
+                state.unacked.pop(tag)
+
+    def nack(self, channel: "InMemoryChannel", delivery_tag: int, multiple: bool, requeue: bool) -> None:
+        with self._condition:
+            state = self._channels[channel]
+            for tag in _settled_tags(state, delivery_tag, multiple):
+                queue, message = state.unacked.pop(tag)
+                if requeue:
+                    self._requeue(queue, message)
+
+    def requeue(self, channel: "InMemoryChannel", queue: str, delivery: _Delivery) -> None:
+        """Возвращает в очередь выданное, но не переданное потребителю сообщение."""
+        with self._condition:
+            state = self._channels.get(channel)
+            if state is not None:
+                state.unacked.pop(delivery.delivery_tag, None)
+            self._requeue(queue, delivery.message)
+
+    # Каналы и потребители
+
+    def open_channel(self, channel: "InMemoryChannel") -> None:
+        with self._condition:
+            self._channels[channel] = _ChannelState()
+
+    def set_prefetch(self, channel: "InMemoryChannel", prefetch_count: int) -> None:
+        with self._condition:
+            self._channels[channel].prefetch_count = prefetch_count
+            self._condition.notify_all()
+
+    def consume(self, consumer: _Consumer) -> None:
+        with self._condition:
+            self._queue(consumer.queue).consumers.append(consumer)
+            self._condition.notify_all()
+
+    def cancel(self, consumer: _Consumer) -> None:
+        """Снимает потребителя; auto_delete очередь удаляется вместе с последним."""
+        with self._condition:
+            queue = self._queues.get(consumer.queue)
+            if queue is None or consumer not in queue.consumers:
+                return
+            queue.consumers.remove(consumer)
+            if queue.auto_delete and not queue.consumers:
+                self._queues.pop(queue.name)
+
+    def close_channel(self, channel: "InMemoryChannel") -> None:
+        """Неподтверждённые сообщения возвращаются в очередь, как при закрытии канала брокером."""
+        with self._condition:
+            state = self._channels.pop(channel, None)
+            if state is None:
+                return
+            for queue, message in state.unacked.values():
+                self._requeue(queue, message)
+
+    def take_deliveries(self, connection: "InMemoryConnection") -> list[tuple[_Consumer, _Delivery]]:
+        """Забирает до DELIVERY_BATCH сообщений на каждого потребителя соединения."""
+        with self._condition:
+            return [
+                (consumer, delivery)
+                for queue, consumer in self._consumers_of(connection)
+                for delivery in self._take(queue, consumer)
+            ]
+
+    # Соединения
+
+    def add_callback(self, connection: "InMemoryConnection", callback: ThreadsafeCallback) -> None:
+        with self._condition:
+            self._callbacks.setdefault(connection, deque()).append(callback)
+            self._condition.notify_all()
+
+    def pop_callbacks(self, connection: "InMemoryConnection") -> list[ThreadsafeCallback]:
+        with self._condition:
+            return list(self._callbacks.pop(connection, ()))
+
+    def wait(self, connection: "InMemoryConnection", timeout: float | None) -> None:
+        """Ждёт до timeout секунд колбэка или сообщения для соединения."""
+        with self._condition:
+            self._condition.wait_for(partial(self._has_work, connection), timeout)
+
+    def close_connection(self, connection: "InMemoryConnection") -> None:
+        """Удаляет эксклюзивные очереди соединения."""
+        with self._condition:
+            self._callbacks.pop(connection, None)
+            exclusive = [queue.name for queue in self._queues.values() if queue.exclusive_owner is connection]
+            for name in exclusive:
+                self._queues.pop(name)
+
+    # Дальше — методы, которые вызываются под блокировкой брокера.
+
+    def _route(self, exchange: str, routing_key: str) -> list[str]:
+        if exchange == DEFAULT_EXCHANGE:
+            return [routing_key] if routing_key in self._queues else []
+        target = self._exchange(exchange)
+        routed: list[str] = []
+        for binding_key, queue_name in target.bindings:
+            if queue_name in routed or queue_name not in self._queues:
+                continue
+            if _exchange_matches(target.exchange_type, binding_key, routing_key):
+                routed.append(queue_name)
+        return routed
+
+    def _consumers_of(self, connection: "InMemoryConnection") -> list[tuple[_Queue, _Consumer]]:
+        return [
+            (queue, consumer)
+            for queue in self._queues.values()
+            for consumer in queue.consumers
+            if consumer.channel.connection is connection and consumer.channel in self._channels
+        ]
+
+    def _take(self, queue: _Queue, consumer: _Consumer) -> list[_Delivery]:
+        state = self._channels[consumer.channel]
+        deliveries: list[_Delivery] = []
+        while queue.messages and state.can_deliver() and len(deliveries) < DELIVERY_BATCH:
+            message = queue.messages.popleft()
+            delivery_tag = self._track(state, queue.name, message, consumer.auto_ack)
+            deliveries.append(_Delivery(delivery_tag, message))
+        return deliveries
+
+    def _has_work(self, connection: "InMemoryConnection") -> bool:
+        if self._callbacks.get(connection):
+            return True
+        return any(
+            queue.messages and self._channels[consumer.channel].can_deliver()
+            for queue, consumer in self._consumers_of(connection)
+        )
+
+    def _track(self, state: _ChannelState, queue: str, message: _Message, auto_ack: bool) -> int:
+        """Выдаёт delivery_tag; без auto_ack сообщение ждёт подтверждения."""
+        delivery_tag = next(state.delivery_tags)
+        if not auto_ack:
+            state.unacked[delivery_tag] = (queue, message)
+        return delivery_tag
+
+    def _requeue(self, queue_name: str, message: _Message) -> None:
+        queue = self._queues.get(queue_name)
+        if queue is not None:
+            message.redelivered = True
+            queue.messages.appendleft(message)
+            self._condition.notify_all()
+
+    def _declare_ok(self, queue: _Queue) -> spec.Queue.DeclareOk:
+        return spec.Queue.DeclareOk(
+            queue=queue.name,
+            message_count=len(queue.messages),
+            consumer_count=len(queue.consumers),
+        )
+
+    def _queue(self, name: str) -> _Queue:
+        queue = self._queues.get(name)
+        if queue is None:
+            raise _not_found("queue", name)
+        return queue
+
+    def _exchange(self, name: str) -> _Exchange:
+        exchange = self._exchanges.get(name)
+        if exchange is None:
+            raise _not_found("exchange", name)
+        return exchange
+
+
+def _settled_tags(state: _ChannelState, delivery_tag: int, multiple: bool) -> list[int]:
+    if multiple:
+        return [tag for tag in state.unacked if delivery_tag == 0 or tag <= delivery_tag]
+    if delivery_tag not in state.unacked:
+        raise _precondition_failed(f"unknown delivery tag {delivery_tag}")
+    return [delivery_tag]
+
+
+class InMemoryConnection:
+    """Аналог pika.BlockingConnection: колбэки потребителей вызываются в process_data_events."""
+
+    def __init__(self, broker: InMemoryBroker) -> None:
+        self.broker = broker
+        self._channels: list[InMemoryChannel] = []
+        self._channel_numbers = itertools.count(1)
+        self._closed = False
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    @property
+    def is_open(self) -> bool:
+        return not self._closed
+
+    def channel(self, channel_number: int | None = None) -> "InMemoryChannel":
+        self._ensure_open()
+        channel = InMemoryChannel(self, channel_number or next(self._channel_numbers))
+        self._channels.append(channel)
+        return channel
+
+    def process_data_events(self, time_limit: float | None = 0) -> None:
+        """
+        Выполняет колбэки add_callback_threadsafe и доставляет сообщения потребителям соединения.
+
+        Если делать нечего, ждёт до time_limit секунд (None — без предела) первого колбэка или сообщения.
+        """
+        self._ensure_open()
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        while not self._dispatch():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return
+            self.broker.wait(self, remaining)
+
+    def sleep(self, duration: float) -> None:
+        deadline = time.monotonic() + duration
+        remaining = duration
+        while remaining > 0:
+            self.process_data_events(time_limit=remaining)
+            remaining = deadline - time.monotonic()
+
+    def add_callback_threadsafe(self, callback: ThreadsafeCallback) -> None:
+        """Выполняет callback в потоке, вызывающем process_data_events."""
+        self.broker.add_callback(self, callback)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        for channel in self._channels:
+            channel.close()
+        self.broker.close_connection(self)
+        self._closed = True
+
+    def _dispatch(self) -> bool:
+        """Один проход: колбэки, затем доставки; True, если что-то было сделано."""
+        callbacks = self.broker.pop_callbacks(self)
+        for callback in callbacks:
+            callback()
+        deliveries = self.broker.take_deliveries(self)
+        for consumer, delivery in deliveries:
+            consumer.channel.deliver(consumer, delivery)
+        return bool(callbacks or deliveries)
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise exceptions.ConnectionWrongStateError("Connection is closed")
+
+
+class InMemoryChannel:
+    """Аналог pika BlockingChannel поверх операций InMemoryBroker."""
+
+    def __init__(self, connection: InMemoryConnection, channel_number: int) -> None:
+        self.connection = connection
+        self.channel_number = channel_number
+        self._broker = connection.broker
+        self._consumers: dict[str, _Consumer] = {}
+        self._confirm = False
+        self._consuming = False
+        self._closed = False
+        self._broker.open_channel(self)
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    @property
+    def is_open(self) -> bool:
+        return not self._closed
+
+    @property
+    def consumer_tags(self) -> list[str]:
+        return list(self._consumers)
+
+    def exchange_declare(  # noqa: WPS211 # сигнатура pika
+        self,
+        exchange: str,
+        exchange_type: ExchangeType | str = ExchangeType.direct,
+        passive: bool = False,
+        durable: bool = False,
+        auto_delete: bool = False,
+        internal: bool = False,
+        arguments: dict[str, Any] | None = None,
+    ) -> Method:
+        kind = exchange_type.value if isinstance(exchange_type, ExchangeType) else exchange_type
+        if passive:
+            self._call(self._broker.check_exchange, exchange)
+        else:
+            self._call(self._broker.declare_exchange, exchange, kind)
+        return Method(self.channel_number, spec.Exchange.DeclareOk())
+
+    def queue_declare(  # noqa: WPS211 # сигнатура pika
+        self,
+        queue: str,
+        passive: bool = False,
+        durable: bool = False,
+        exclusive: bool = False,
+        auto_delete: bool = False,
+        arguments: dict[str, Any] | None = None,
+    ) -> Method:
+        if passive:
+            return Method(self.channel_number, self._call(self._broker.queue_status, queue))
+        owner = self.connection if exclusive else None
+        declared = self._call(self._broker.declare_queue, queue, durable, owner, auto_delete)
+        return Method(self.channel_number, declared)
+
+    def queue_bind(
+        self,
+        queue: str,
+        exchange: str,
+        routing_key: str | None = None,
+        arguments: dict[str, Any] | None = None,
+    ) -> Method:
+        binding_key = queue if routing_key is None else routing_key
+        self._call(self._broker.bind, queue, exchange, binding_key)
+        return Method(self.channel_number, spec.Queue.BindOk())
+
+    def queue_purge(self, queue: str) -> Method:
+        count = self._call(self._broker.purge, queue)
+        return Method(self.channel_number, spec.Queue.PurgeOk(message_count=count))
+
+    def queue_delete(self, queue: str, if_unused: bool = False, if_empty: bool = False) -> Method:
+        count = self._call(self._broker.delete_queue, queue)
+        return Method(self.channel_number, spec.Queue.DeleteOk(message_count=count))
+
+    def basic_publish(  # noqa: WPS211 # сигнатура pika
+        self,
+        exchange: str,
+        routing_key: str,
+        body: bytes,
+        properties: Any = None,
+        mandatory: bool = False,
+    ) -> None:
+        routed = self._call(self._broker.publish, exchange, routing_key, body, properties)
+        if mandatory and not routed and self._confirm:
+            raise exceptions.UnroutableError([])
+
+    def basic_get(self, queue: str, auto_ack: bool = False) -> tuple[Any, Any, bytes | None]:
+        delivery = self._call(self._broker.get, self, queue, auto_ack)
+        if delivery is None:
+            return None, None, None
+        message = delivery.message
+        method = spec.Basic.GetOk(
+            delivery_tag=delivery.delivery_tag,
+            redelivered=message.redelivered,
+            exchange=message.exchange,
+            routing_key=message.routing_key,
+            message_count=delivery.message_count,
+        )
+        return method, message.properties or spec.BasicProperties(), message.body
+
+    def basic_consume(  # noqa: WPS211 # сигнатура pika
+        self,
+        queue: str,
+        on_message_callback: OnMessageCallback,
+        auto_ack: bool = False,
+        exclusive: bool = False,
+        consumer_tag: str | None = None,
+        arguments: dict[str, Any] | None = None,
+    ) -> str:
+        self._ensure_open()
+        tag = consumer_tag or f"ctag{self.channel_number}.{self._broker.next_tag()}"
+        consumer = _Consumer(tag, queue, on_message_callback, auto_ack, self)
+        self._call(self._broker.consume, consumer)
+        self._consumers[tag] = consumer
+        return tag
+
+    def basic_cancel(self, consumer_tag: str) -> list[Any]:
+        consumer = self._consumers.pop(consumer_tag, None)
+        if consumer is not None:
+            self._broker.cancel(consumer)
+        return []
+
+    def basic_ack(self, delivery_tag: int = 0, multiple: bool = False) -> None:
+        self._call(self._broker.ack, self, delivery_tag, multiple)
+
+    def basic_nack(self, delivery_tag: int = 0, multiple: bool = False, requeue: bool = True) -> None:
+        self._call(self._broker.nack, self, delivery_tag, multiple, requeue)
+
+    def basic_reject(self, delivery_tag: int, requeue: bool = True) -> None:
+        self.basic_nack(delivery_tag, multiple=False, requeue=requeue)
+
+    def basic_qos(self, prefetch_size: int = 0, prefetch_count: int = 0, global_qos: bool = False) -> None:
+        self._call(self._broker.set_prefetch, self, prefetch_count)
+
+    def confirm_delivery(self) -> None:
+        """Публикация подтверждается сразу: сообщение уже лежит в очередях к возврату basic_publish."""
+        self._confirm = True
+
+    def start_consuming(self) -> None:
+        self._consuming = True
+        while self._consuming and self._consumers and not self._closed:
+            self.connection.process_data_events(time_limit=None)
+
+    def stop_consuming(self, consumer_tag: str | None = None) -> None:
+        self._consuming = False
+
+    def deliver(self, consumer: _Consumer, delivery: _Delivery) -> None:
+        """Передаёт выданное брокером сообщение в колбэк потребителя."""
+        if self._closed or consumer.tag not in self._consumers:
+            # потребителя отменили посреди пачки: сообщение возвращается в очередь
+            self._broker.requeue(self, consumer.queue, delivery)
+            return
+        message = delivery.message
+        method = spec.Basic.Deliver(
+            consumer_tag=consumer.tag,
+            delivery_tag=delivery.delivery_tag,
+            redelivered=message.redelivered,
+            exchange=message.exchange,
+            routing_key=message.routing_key,
+        )
+        consumer.callback(self, method, message.properties or spec.BasicProperties(), message.body)
+
+    def close(self, reply_code: int = 0, reply_text: str = "Normal shutdown") -> None:
+        if self._closed:
+            return
+        for tag in list(self._consumers):
+            self.basic_cancel(tag)
+        self._broker.close_channel(self)
+        self._closed = True
+
+    def _call(self, operation: Callable[..., Any], *args: Any) -> Any:
+        """Вызывает операцию брокера на открытом канале; ошибка брокера закрывает канал, как в pika."""
+        self._ensure_open()
+        try:
+            return operation(*args)
+        except exceptions.ChannelClosedByBroker:
+            self.close()
+            raise
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise exceptions.ChannelWrongStateError("Channel is closed.")
@@ -2,18 +2,29 @@
 Тесты для проверки здоровья сервиса авторизации
 """
 
+import asyncio
 import httpx
 import logging
-from src.api_clients.auth_service import AuthServiceV0APIClient
+from src.api_clients.auth_service import AsyncAuthServiceV0APIClient, AuthServiceV0APIClient
 from src.common.server_error_logging import log_internal_server_error
 from src.common.fields import ERROR_FIELD
 
 logger = logging.getLogger(__name__)
 
+async def _get_health_async() -> httpx.Response:
+    async with AsyncAuthServiceV0APIClient() as client:
+        return await client.get_health()
+
+
 class TestAuthServiceV0Health:
     """Тесты для проверки здоровья сервиса авторизации"""
 
     def test_health(self, auth_service_v0_api_client: AuthServiceV0APIClient) -> None:
         response = auth_service_v0_api_client.get_health()
         log_internal_server_error(response, logger, ERROR_FIELD)
-        assert response.status_code == httpx.codes.OK
\ No newline at end of file
+        assert response.status_code == httpx.codes.OK
+
+    def test_health_async(self) -> None:
+        response = asyncio.run(_get_health_async())
+        log_internal_server_error(response, logger, ERROR_FIELD)
+        assert response.status_code == httpx.codes.OK
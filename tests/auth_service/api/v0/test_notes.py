@@ -1,4 +1,4 @@
-import logging, time  
+import logging, math, time  
 from collections.abc import Callable
 from dataclasses import dataclass
 
@@ -11,6 +11,7 @@ import src.common.fields as fields
 
 import src.common.ids as ids 
 from tests.fixtures.auth_jwt import TokenFields
+from tests.fixtures.latency import LatencyBenchmark
 from typing import ContextManager, Optional
 
 logger = logging.getLogger(__name__)
@@ -795,3 +796,45 @@ class TestAuthServiceV0Notes:
 
         if invalid_case.expected_response is not None:
             assert invalid_case.expected_response == response.json()
+
+    def test_filter_notes_chunked(
+        self,
+        auth_service_v0_api_client: AuthServiceV0APIClient,
+        login: str,
+    ) -> None:
+        """
+        Большой список note_ids, разбитый на чанки, даёт тот же результат, что и один запрос.
+        """
+        chunk_size = 100
+        chunked = auth_service_v0_api_client.filter_notes_chunked(
+            body={fields.NOTE_IDS_FIELD: ids.BIG_LIST_WITH_EXISTING_PERSONAL_NOTES, fields.SPACE_ID_FIELD: ids.PERSONAL_SPACE_ID},
+            token=login,
+            x_telegram_user_id=ids.PERSONAL_SPACE_OWNER_USER_ID,
+            chunk_size=chunk_size,
+        )
+
+        for response in chunked.failed:
+            log_internal_server_error(response, logger, fields.ERROR_FIELD)
+        assert chunked.ok, [response.text for response in chunked.failed]
+        expected_chunks = math.ceil(len(ids.BIG_LIST_WITH_EXISTING_PERSONAL_NOTES) / chunk_size)
+        assert len(chunked.responses) == expected_chunks
+        assert chunked.notes == {
+            note_id: {fields.CAN_READ_FIELD: True, fields.CAN_EDIT_FIELD: True}
+            for note_id in ids.PERSONAL_NOTES
+        }
+
+    @pytest.mark.latency("filter_notes")
+    def test_filter_notes_latency(
+        self,
+        auth_service_v0_api_client: AuthServiceV0APIClient,
+        login: str,
+        latency_benchmark: LatencyBenchmark,
+    ) -> None:
+        """
+        filter_notes по личному пространству укладывается в бюджет задержки.
+        """
+        latency_benchmark(lambda: auth_service_v0_api_client.filter_notes(
+            token=login,
+            body={fields.NOTE_IDS_FIELD: ids.PERSONAL_NOTES, fields.SPACE_ID_FIELD: ids.PERSONAL_SPACE_ID},
+            x_telegram_user_id=ids.PERSONAL_SPACE_OWNER_USER_ID,
+        ))
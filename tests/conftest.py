@@ -4,4 +4,8 @@ pytest_plugins = [
     "tests.fixtures.auth_service",
     "tests.fixtures.vault",
     "tests.fixtures.postgres",
+    "tests.fixtures.timing",
+    "tests.fixtures.http_clients",
+    "tests.fixtures.service_metrics",
+    "tests.fixtures.latency",
 ]
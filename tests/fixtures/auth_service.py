@@ -1,9 +1,11 @@
-from collections.abc import Callable
+from collections.abc import Callable, Generator
 from functools import partial
-from typing import Any
 import pytest
-import httpx
 from src.api_clients.auth_service import AuthServiceAPIClient, AuthServiceV0APIClient
+from src.api_clients.base import HTTPClientRegistry
+from src.api_clients.capture import CaptureWriter
+from src.api_clients.timing import InMemoryTimingRecorder
+from src.api_clients.token_provider import ClientCredentials, TokenProvider
 from src.config import config
 from tests.fixtures.auth_jwt import make_jwt_token
 
@@ -26,23 +28,39 @@ def jwt_token_factory() -> Callable[..., str]:
 
 
 @pytest.fixture(scope="session")
-def auth_service_v0_api_client() -> AuthServiceV0APIClient:
-    return AuthServiceV0APIClient()
+def auth_service_v0_api_client(
+    timing_recorder: InMemoryTimingRecorder,
+    http_client_registry: HTTPClientRegistry,
+    traffic_capture: CaptureWriter | None,
+) -> AuthServiceV0APIClient:
+    return AuthServiceV0APIClient(timing_recorder, http_client_registry, traffic_capture)
 
 
 @pytest.fixture(scope="session")
-def auth_service_api_client() -> AuthServiceAPIClient:
-    return AuthServiceAPIClient()
+def auth_service_api_client(
+    timing_recorder: InMemoryTimingRecorder,
+    http_client_registry: HTTPClientRegistry,
+    traffic_capture: CaptureWriter | None,
+) -> AuthServiceAPIClient:
+    return AuthServiceAPIClient(timing_recorder, http_client_registry, traffic_capture)
 
 @pytest.fixture(scope="session")
-def login() -> Any:
-    response = AuthServiceV0APIClient().login(dict[str, str](
-        grant_type="client_credentials",
+def token_provider(
+    auth_service_v0_api_client: AuthServiceV0APIClient,
+) -> Generator[TokenProvider, None, None]:
+    """Общий на сессию кэш токенов client_credentials с фоновым обновлением."""
+    provider = TokenProvider(auth_service_v0_api_client)
+    try:
+        yield provider
+    finally:
+        provider.close()
+
+
+@pytest.fixture()
+def login(token_provider: TokenProvider) -> str:
+    """Токен на время теста: провайдер отдаёт кэшированный или обновляет истекающий."""
+    return token_provider.get_token(ClientCredentials(
         client_id="bot",
         client_secret="super-strong-secret",
         scope="bot",
     ))
-
-    assert response.status_code == httpx.codes.OK, response.text
-    
-    return response.json()["access_token"]
\ No newline at end of file
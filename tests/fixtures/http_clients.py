@@ -0,0 +1,41 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from src.api_clients.base import HTTPClientRegistry, http_clients
+from src.api_clients.capture import CaptureWriter
+
+CAPTURE_TRAFFIC_OPTION = "--capture-traffic"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        CAPTURE_TRAFFIC_OPTION,
+        default=None,
+        type=Path,
+        help="дописывать запросы и ответы API-клиентов в JSONL для python -m src.load traffic",
+    )
+
+
+@pytest.fixture(scope="session")
+def traffic_capture(pytestconfig: pytest.Config) -> Generator[CaptureWriter | None, None, None]:
+    """Запись трафика сессии, если задан --capture-traffic."""
+    path = pytestconfig.getoption(CAPTURE_TRAFFIC_OPTION)
+    if path is None:
+        yield None
+        return
+    writer = CaptureWriter(path)
+    try:
+        yield writer
+    finally:
+        writer.close()
+
+
+@pytest.fixture(scope="session")
+def http_client_registry() -> Generator[HTTPClientRegistry, None, None]:
+    """Общие на сессию httpx.Client: один пул соединений на сервис, закрываются в конце сессии."""
+    try:
+        yield http_clients
+    finally:
+        http_clients.close()
@@ -0,0 +1,163 @@
+"""
+Микробенчмарк задержки для тестов с маркером ``@pytest.mark.latency``.
+
+Бюджет (число замеров, прогрев, p50_ms и p99_ms) задаётся в маркере: ``latency(runs=200, p99_ms=100)``,
+по имени из ``latency_budgets`` в config.yaml: ``latency("filter_notes")``, или так и так сразу —
+тогда поля бюджета из конфига заменяют поля маркера. Имени без полей в маркере должен соответствовать
+бюджет в конфиге, иначе сбор тестов падает. Тест передаёт в фикстуру latency_benchmark вызов API; фикстура делает
+warmup прогревочных вызовов, затем runs замеров и падает, если перцентиль выходит за бюджет.
+Такие тесты нагружают сервис и зависят от окружения, поэтому запускаются только с ``--latency``.
+"""
+
+import json
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import allure
+import httpx
+import pytest
+
+from src.config import LatencyBudgetConfig
+from src.config import config as tests_config
+from src.load.report import MS_IN_SECOND
+from src.load.stats import percentile
+
+LATENCY_MARKER = "latency"
+LATENCY_FIXTURE = "latency_benchmark"
+LATENCY_OPTION = "--latency"
+MEDIAN = 50
+P90 = 90
+P99 = 99
+_BUDGET_FIELDS = frozenset(LatencyBudgetConfig.model_fields)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        LATENCY_OPTION,
+        action="store_true",
+        help="запускать тесты с маркером latency (бюджеты — latency_budgets в config.yaml)",
+    )
+
+
+def _configured_fields(budget_name: str, inline: Mapping[str, Any]) -> dict[str, Any]:
+    """Поля бюджета budget_name из config.yaml; без них бюджет целиком задают поля маркера inline."""
+    budget = tests_config.latency_budgets.get(budget_name)
+    if budget is not None:
+        return budget.model_dump(exclude_unset=True)
+    if not inline:
+        raise ValueError(f"latency budget {budget_name!r} is not in latency_budgets of config.yaml")
+    return {}
+
+
+def _marker_budget(marker: pytest.Mark) -> LatencyBudgetConfig:
+    """Бюджет маркера latency: поля маркера, поверх них — бюджет из latency_budgets по имени."""
+    if len(marker.args) > 1 or not (marker.args or marker.kwargs):
+        raise ValueError(
+            f'use @pytest.mark.{LATENCY_MARKER}("<budget>") with a budget from latency_budgets '
+            + f"or @pytest.mark.{LATENCY_MARKER}(runs=..., p50_ms=..., p99_ms=...)",
+        )
+    unknown = marker.kwargs.keys() - _BUDGET_FIELDS
+    if unknown:
+        raise ValueError(f"unknown latency budget fields: {sorted(unknown)}")
+    configured = _configured_fields(marker.args[0], marker.kwargs) if marker.args else {}
+    return LatencyBudgetConfig(**{**marker.kwargs, **configured})
+
+
+def _misuse(test: pytest.Item) -> str | None:
+    """Ошибка сочетания маркера latency и фикстуры latency_benchmark в тесте, иначе None."""
+    marker = test.get_closest_marker(LATENCY_MARKER)
+    uses_fixture = LATENCY_FIXTURE in getattr(test, "fixturenames", ())
+    if marker is None:
+        return f"{test.nodeid}: {LATENCY_FIXTURE} requires @pytest.mark.{LATENCY_MARKER}" if uses_fixture else None
+    if not uses_fixture:
+        return f"{test.nodeid}: @pytest.mark.{LATENCY_MARKER} requires the {LATENCY_FIXTURE} fixture"
+    try:
+        _marker_budget(marker)
+    except ValueError as exc:
+        return f"{test.nodeid}: {exc}"
+    return None
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config,
+    items: list[pytest.Item],  # noqa: WPS110 # имя параметра хука задаёт pytest
+) -> None:
+    """Неверное использование маркера latency валит сбор; без --latency такие тесты пропускаются."""
+    errors = [error for error in map(_misuse, items) if error is not None]
+    if errors:
+        raise pytest.UsageError("\n".join(errors))
+    if config.getoption(LATENCY_OPTION):
+        return
+    skip = pytest.mark.skip(reason=f"latency budgets run only with {LATENCY_OPTION}")
+    for test in items:
+        if test.get_closest_marker(LATENCY_MARKER) is not None:
+            test.add_marker(skip)
+
+
+@dataclass(frozen=True)
+class LatencyResult:
+    """Отсортированные задержки замеров, секунды."""
+
+    latencies: list[float]
+
+    def percentile_ms(self, quantile: float) -> float:
+        return percentile(self.latencies, quantile) * MS_IN_SECOND
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "runs": len(self.latencies),
+            "p50_ms": self.percentile_ms(MEDIAN),
+            "p90_ms": self.percentile_ms(P90),
+            "p99_ms": self.percentile_ms(P99),
+            "max_ms": self.latencies[-1] * MS_IN_SECOND,
+        }, indent=2)
+
+
+def _violations(budget: LatencyBudgetConfig, measured: LatencyResult) -> list[str]:
+    violations = []
+    for quantile, limit in ((MEDIAN, budget.p50_ms), (P99, budget.p99_ms)):
+        observed = measured.percentile_ms(quantile)
+        if limit is not None and observed > limit:
+            violations.append(f"p{quantile} {observed:.2f}ms exceeds budget {limit:g}ms")
+    return violations
+
+
+class LatencyBenchmark:
+    """
+    Замеряет вызов API по бюджету.
+
+    Учитываются только успешные ответы: первый неуспешный ответ валит тест сразу.
+    """
+
+    def __init__(self, budget: LatencyBudgetConfig) -> None:
+        self.budget = budget
+
+    def __call__(self, call: Callable[[], httpx.Response]) -> LatencyResult:
+        for _ in range(self.budget.warmup):
+            call()
+        latencies = [self._measure(call) for _ in range(self.budget.runs)]
+        measured = LatencyResult(sorted(latencies))
+        allure.attach(
+            measured.to_json(),
+            name="latency",
+            attachment_type=allure.attachment_type.JSON,
+        )
+        violations = _violations(self.budget, measured)
+        if violations:
+            pytest.fail("; ".join(violations))
+        return measured
+
+    def _measure(self, call: Callable[[], httpx.Response]) -> float:
+        started = time.perf_counter()
+        response = call()
+        elapsed = time.perf_counter() - started
+        assert response.is_success, response.text
+        return elapsed
+
+
+@pytest.fixture
+def latency_benchmark(request: pytest.FixtureRequest) -> LatencyBenchmark:
+    """Бенчмарк по бюджету из маркера latency теста; маркер проверен при сборе тестов."""
+    return LatencyBenchmark(_marker_budget(request.node.get_closest_marker(LATENCY_MARKER)))
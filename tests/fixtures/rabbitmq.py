@@ -1,18 +1,80 @@
 import logging
+import os
+import uuid
 from contextlib import contextmanager
-from typing import ContextManager, Generator, Optional
+from typing import ContextManager, Final, Generator, Iterable, Optional
 
-import pika
 import pytest
 
-from src.brokers.rabbitmq import RabbitMQ
+from src.brokers.audit_collector import AuditCollector, collect_audit
+from src.brokers.consumer import Binding, consuming
+from src.brokers.message_buffer import BufferingConsumer, MessageBuffer
+from src.brokers.rabbitmq import RabbitMQ, receive_one
 from src.config import config
+from src.standins.rabbitmq import InMemoryBroker
 
 logger = logging.getLogger(__name__)
 
-@pytest.fixture(scope="session")
-def rabbitmq() -> Generator[RabbitMQ, None, None]:
-    with RabbitMQ(config.rabbitmq) as rabbitmq:
+RABBITMQ_STANDIN_OPTION = "--rabbitmq-standin"
+PRIVATE_QUEUES_OPTION = "--private-queues"
+# секунды на подписку потоков-потребителей очередей
+CONSUMER_READY_TIMEOUT = 10.0
+# Final: pytest.fixture принимает scope только литералом
+SESSION_SCOPE: Final = "session"
+FUNCTION_SCOPE: Final = "function"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        RABBITMQ_STANDIN_OPTION,
+        action="store_true",
+        help="брокер RabbitMQ в памяти процесса вместо сервера из config.yaml",
+    )
+    parser.addoption(
+        PRIVATE_QUEUES_OPTION,
+        action="store_true",
+        help="читать сообщения сервисов из собственных эксклюзивных очередей воркера и теста, а не из общих",
+    )
+
+
+@pytest.fixture(scope=SESSION_SCOPE)
+def in_memory_broker(pytestconfig: pytest.Config) -> Optional[InMemoryBroker]:
+    """Брокер в памяти с очередями из конфига, если задан --rabbitmq-standin."""
+    if not pytestconfig.getoption(RABBITMQ_STANDIN_OPTION):
+        return None
+    rabbitmq_config = config.rabbitmq
+    broker = InMemoryBroker()
+    broker.declare_queue(rabbitmq_config.notes_queue)
+    broker.declare_queue(rabbitmq_config.auth_service_error_queue)
+    broker.declare_exchange(rabbitmq_config.notes_exchange)
+    broker.declare_exchange(rabbitmq_config.auth_service_error_exchange)
+    broker.bind(rabbitmq_config.notes_queue, rabbitmq_config.notes_exchange, rabbitmq_config.notes_routing_key)
+    broker.bind(
+        rabbitmq_config.auth_service_error_queue,
+        rabbitmq_config.auth_service_error_exchange,
+        rabbitmq_config.auth_service_error_routing_key,
+    )
+    return broker
+
+
+@pytest.fixture(scope=SESSION_SCOPE)
+def private_queue_prefix(pytestconfig: pytest.Config) -> Optional[str]:
+    """
+    Префикс собственных очередей воркера, если задан --private-queues.
+
+    Такие очереди эксклюзивные и auto-delete: параллельные воркеры и прогоны получают каждый
+    свою копию сообщений сервисов, а остатки прошлых прогонов удаляет брокер.
+    """
+    if not pytestconfig.getoption(PRIVATE_QUEUES_OPTION):
+        return None
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    return f"pytests.{worker}.{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture(scope=SESSION_SCOPE)
+def rabbitmq(in_memory_broker: Optional[InMemoryBroker]) -> Generator[RabbitMQ, None, None]:
+    connection_factory = None if in_memory_broker is None else in_memory_broker.connect
+    with RabbitMQ(config.rabbitmq, connection_factory) as rabbitmq:
         yield rabbitmq
 
 
@@ -20,36 +82,17 @@ def rabbitmq() -> Generator[RabbitMQ, None, None]:
 def _get_messages_from_queue(
     rabbitmq: RabbitMQ, queue_name: str
 ) -> Generator[Optional[bytes], None, None]:
-    """Контекстный менеджер для получения сообщений из очереди заметок"""
-    if rabbitmq.connection is None:
-        raise RuntimeError("RabbitMQ connection is not established")
-    channel = rabbitmq.connection.channel()
+    """Контекстный менеджер для получения сообщений из очереди заметок; канал берётся из пула соединения"""
+    with rabbitmq.channel() as channel:
+        message = receive_one(channel, queue_name, rabbitmq.config.queue_wait_timeout)
+    if message is None:
+        logger.info("No messages in queue after %.1fs", rabbitmq.config.queue_wait_timeout)
+    else:
+        logger.info("Received message: %s", message)
+    yield message
 
-    try:
-        yield _get_single_message(channel, queue_name, rabbitmq.config.queue_poll_attempts)
-    finally:
-        if channel and not channel.is_closed:
-            channel.close()
-
-
-def _get_single_message(
-    channel: pika.channel.Channel, queue_name: str, queue_poll_attempts: int
-) -> Optional[bytes]:
-    """Получает одно сообщение из очереди, ожидая публикации из auth-service."""
-    for attempt in range(queue_poll_attempts):
-        method_frame, _header_frame, body = channel.basic_get(
-            queue=queue_name, auto_ack=True
-        )
-
-        if method_frame:
-            logger.info("Received message: %s", body)
-            return body if isinstance(body, bytes) else None
 
-    logger.info("No messages in queue")
-    return None
-
-
-@pytest.fixture(scope="function")
+@pytest.fixture(scope=FUNCTION_SCOPE)
 def note_messages_from_rabbitmq(
     rabbitmq: RabbitMQ,
 ) -> ContextManager[Optional[bytes]]:
@@ -58,9 +101,103 @@ def note_messages_from_rabbitmq(
     return _get_messages_from_queue(rabbitmq, rabbitmq.config.notes_queue)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope=SESSION_SCOPE)
+def audit_collector(
+    rabbitmq: RabbitMQ, private_queue_prefix: Optional[str]
+) -> Generator[AuditCollector, None, None]:
+    """
+    Один на сессию поток, собирающий очередь ошибок сервиса авторизации в кольцевой буфер AuditMessage.
+
+    С --private-queues поток читает собственную очередь воркера, привязанную к обменнику ошибок.
+    """
+    private_queue = None
+    if private_queue_prefix is not None:
+        private_queue = f"{private_queue_prefix}.{rabbitmq.config.auth_service_error_queue}"
+    collector, consumer = collect_audit(
+        rabbitmq.config, CONSUMER_READY_TIMEOUT, rabbitmq.connection_factory, private_queue,
+    )
+    try:
+        yield collector
+    finally:
+        consumer.stop()
+        _log_audit_summary(collector)
+
+
+def _log_audit_summary(collector: AuditCollector) -> None:
+    snapshot = collector.snapshot()
+    logger.info(
+        "audit collector: %s kept, %s evicted, %s invalid",
+        len(snapshot.messages), snapshot.evicted, snapshot.invalid,
+    )
+
+
+@contextmanager
+def _next_audit_message(
+    collector: AuditCollector, since: int, timeout: float
+) -> Generator[Optional[bytes], None, None]:
+    """Первое сообщение аудита, собранное после since, не дольше timeout секунд."""
+    collected = collector.wait_for(lambda _message: True, timeout, since)
+    if collected is None:
+        logger.info("No audit messages after %.1fs", timeout)
+        yield None
+        return
+    logger.info("Received message: %s", collected.body)
+    yield collected.body
+
+
+@pytest.fixture(scope=FUNCTION_SCOPE)
 def auth_service_error_messages_from_rabbitmq(
-    rabbitmq: RabbitMQ,
+    audit_collector: AuditCollector,
 ) -> ContextManager[Optional[bytes]]:
-    """Фикстура, возвращающая сообщение из очереди ошибок сервиса авторизации"""
-    return _get_messages_from_queue(rabbitmq, rabbitmq.config.auth_service_error_queue)
+    """Фикстура, возвращающая первое сообщение из очереди ошибок сервиса авторизации, пришедшее во время теста"""
+    return _next_audit_message(
+        audit_collector, audit_collector.cursor(), config.rabbitmq.queue_wait_timeout,
+    )
+
+
+@contextmanager
+def _buffered_queue(
+    rabbitmq: RabbitMQ, queue_name: str, bindings: Iterable[Binding] = ()
+) -> Generator[MessageBuffer, None, None]:
+    """Буфер всех сообщений очереди, пришедших, пока открыт контекст."""
+    buffer = MessageBuffer()
+    consumer = BufferingConsumer(rabbitmq.config, queue_name, buffer, rabbitmq.connection_factory, bindings)
+    with consuming(consumer, CONSUMER_READY_TIMEOUT):
+        yield buffer
+
+
+@pytest.fixture(scope=FUNCTION_SCOPE)
+def note_message_buffer(
+    rabbitmq: RabbitMQ, private_queue_prefix: Optional[str]
+) -> Generator[MessageBuffer, None, None]:
+    """
+    Сообщения очереди заметок за время теста с поиском по request_id, trace_id и user_id.
+
+    Пока тест идёт, очередь читает только буфер: не сочетать с note_messages_from_rabbitmq.
+    С --private-queues у теста своя очередь, привязанная к обменнику заметок, и общая очередь не трогается.
+    """
+    rabbitmq_config = rabbitmq.config
+    if private_queue_prefix is None:
+        buffered = _buffered_queue(rabbitmq, rabbitmq_config.notes_queue)
+    else:
+        buffered = _buffered_queue(
+            rabbitmq,
+            f"{private_queue_prefix}.{rabbitmq_config.notes_queue}.{uuid.uuid4().hex[:8]}",
+            (Binding(rabbitmq_config.notes_exchange, rabbitmq_config.notes_routing_key),),
+        )
+    with buffered as buffer:
+        yield buffer
+
+
+@pytest.fixture(scope=FUNCTION_SCOPE)
+def auth_service_error_message_buffer(
+    audit_collector: AuditCollector,
+) -> Generator[MessageBuffer, None, None]:
+    """
+    Сообщения очереди ошибок сервиса авторизации за время теста с поиском по request_id, trace_id и user_id.
+
+    Очередь читает сессионный audit_collector, буфер получает копии сообщений.
+    """
+    buffer = MessageBuffer()
+    with audit_collector.forward_to(buffer.add):
+        yield buffer
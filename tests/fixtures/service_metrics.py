@@ -0,0 +1,47 @@
+from collections.abc import Generator
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from src.api_clients.auth_service import AuthServiceV0APIClient
+from src.api_clients.webserver import WebServerV0APIClient
+from src.load.metrics_sampler import DEFAULT_SAMPLE_INTERVAL, MetricsSampler, TimeSeriesWriter
+from src.load.service_metrics import AUTH_SERVICE, WEBSERVER
+
+SAMPLE_METRICS_OPTION = "--sample-metrics"
+SAMPLE_INTERVAL_OPTION = "--sample-interval"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        SAMPLE_METRICS_OPTION,
+        default=None,
+        type=Path,
+        help="каталог для временных рядов /metrics auth-service и webserver, снимаемых в фоне",
+    )
+    parser.addoption(
+        SAMPLE_INTERVAL_OPTION,
+        default=DEFAULT_SAMPLE_INTERVAL,
+        type=float,
+        help="период опроса /metrics, секунды",
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def service_metrics_sampler(pytestconfig: pytest.Config) -> Generator[MetricsSampler | None, None, None]:
+    """Фоновый опрос /metrics сервисов на всю сессию, если задан --sample-metrics."""
+    directory = pytestconfig.getoption(SAMPLE_METRICS_OPTION)
+    if directory is None:
+        yield None
+        return
+    auth_service_client = AuthServiceV0APIClient()
+    webserver_client = WebServerV0APIClient()
+    writer = TimeSeriesWriter(directory)
+    sampler = MetricsSampler(
+        {AUTH_SERVICE: auth_service_client, WEBSERVER: webserver_client},
+        writer,
+        pytestconfig.getoption(SAMPLE_INTERVAL_OPTION),
+    )
+    with closing(auth_service_client), closing(webserver_client), closing(writer), sampler:
+        yield sampler
@@ -0,0 +1,28 @@
+from collections.abc import Generator
+
+import allure
+import pytest
+
+from src.api_clients.timing import InMemoryTimingRecorder, timings_to_json
+
+
+@pytest.fixture(scope="session")
+def timing_recorder() -> InMemoryTimingRecorder:
+    """Общий на сессию приёмник замеров фаз HTTP-запросов API-клиентов."""
+    return InMemoryTimingRecorder()
+
+
+@pytest.fixture(autouse=True)
+def attach_request_timings(
+    timing_recorder: InMemoryTimingRecorder,
+) -> Generator[None, None, None]:
+    """Прикладывает к allure-отчёту теста замеры запросов, сделанных во время теста."""
+    start = len(timing_recorder)
+    yield
+    timings = timing_recorder.records(start)
+    if timings:
+        allure.attach(
+            timings_to_json(timings),
+            name="request timings",
+            attachment_type=allure.attachment_type.JSON,
+        )
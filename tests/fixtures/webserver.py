@@ -1,16 +1,27 @@
 import pytest
 
+from src.api_clients.base import HTTPClientRegistry
+from src.api_clients.capture import CaptureWriter
+from src.api_clients.timing import InMemoryTimingRecorder
 from src.api_clients.webserver import WebServerAPIClient, WebServerV0APIClient
 
 
 @pytest.fixture(scope="session")
-def webserver_v0_api_client() -> WebServerV0APIClient:
-    return WebServerV0APIClient()
+def webserver_v0_api_client(
+    timing_recorder: InMemoryTimingRecorder,
+    http_client_registry: HTTPClientRegistry,
+    traffic_capture: CaptureWriter | None,
+) -> WebServerV0APIClient:
+    return WebServerV0APIClient(timing_recorder, http_client_registry, traffic_capture)
 
 
 @pytest.fixture(scope="session")
-def webserver_api_client() -> WebServerAPIClient:
-    return WebServerAPIClient()
+def webserver_api_client(
+    timing_recorder: InMemoryTimingRecorder,
+    http_client_registry: HTTPClientRegistry,
+    traffic_capture: CaptureWriter | None,
+) -> WebServerAPIClient:
+    return WebServerAPIClient(timing_recorder, http_client_registry, traffic_capture)
 
 
 
@@ -0,0 +1,110 @@
+"""
+Тесты сборщика аудита: кольцевой буфер, ожидание по предикату и ошибка потока-потребителя
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.brokers.audit_buffer import AuditPredicate
+from src.brokers.audit_collector import AuditCollector
+from src.common.audit import AUTH_SERVICE_NAME, AuditMessage, Level
+
+MAX_MESSAGES = 3
+MAX_AGE = 10
+WAIT_TIMEOUT = 5
+NO_WAIT = 0.01
+ADD_DELAY = 0.01
+INVALID_BODY = b"not json"
+REQUEST_ID = "request"
+
+
+def _body(request_id: str) -> bytes:
+    message = AuditMessage(service_name=AUTH_SERVICE_NAME, level=Level.ERROR, request_id=request_id)
+    return message.model_dump_json().encode()
+
+
+def _with_request_id(request_id: str) -> AuditPredicate:
+    return lambda message: message.request_id == request_id
+
+
+def _request_ids(collector: AuditCollector, since: int = 0) -> list[str | None]:
+    return [collected.message.request_id for collected in collector.snapshot(since).messages]
+
+
+class TestRingBuffer:
+    """Сквозные номера и вытеснение по числу сообщений и возрасту"""
+
+    def test_sequences_and_cursor(self) -> None:
+        collector = AuditCollector(MAX_MESSAGES)
+        first = collector.add(_body("first"))
+        assert first is not None
+        assert first.sequence == 0
+        cursor = collector.cursor()
+        collector.add(_body("second"))
+        assert _request_ids(collector, since=cursor) == ["second"]
+
+    def test_evicts_oldest_over_max_messages(self) -> None:
+        collector = AuditCollector(MAX_MESSAGES)
+        for index in range(MAX_MESSAGES + 2):
+            collector.add(_body(str(index)))
+        snapshot = collector.snapshot()
+        assert [collected.sequence for collected in snapshot.messages] == [2, 3, 4]
+        assert snapshot.evicted == 2
+
+    def test_evicts_older_than_max_age(self) -> None:
+        collector = AuditCollector(MAX_MESSAGES, max_age=MAX_AGE)
+        now = time.monotonic()
+        collector.add(_body("old"), received_at=now - MAX_AGE - 1)
+        collector.add(_body("new"), received_at=now)
+        assert _request_ids(collector) == ["new"]
+        assert collector.snapshot().evicted == 1
+
+    def test_invalid_messages_are_counted(self) -> None:
+        collector = AuditCollector(MAX_MESSAGES)
+        forwarded: list[bytes] = []
+        with collector.forward_to(lambda body, _received_at: forwarded.append(body)):
+            assert collector.add(INVALID_BODY) is None
+        collector.add(_body("after"))
+        assert forwarded == [INVALID_BODY]
+        assert collector.snapshot().invalid == 1
+
+    def test_rejects_empty_buffer(self) -> None:
+        with pytest.raises(ValueError, match="max_messages"):
+            AuditCollector(0)
+
+
+class TestWaitFor:
+    """Ожидание сообщения по предикату начиная с курсора"""
+
+    def test_skips_messages_before_cursor(self) -> None:
+        collector = AuditCollector(MAX_MESSAGES)
+        collector.add(_body(REQUEST_ID))
+        cursor = collector.cursor()
+        assert collector.wait_for(_with_request_id(REQUEST_ID), NO_WAIT, since=cursor) is None
+
+    def test_waits_for_message_from_another_thread(self) -> None:
+        collector = AuditCollector(MAX_MESSAGES)
+        timer = threading.Timer(ADD_DELAY, collector.add, (_body(REQUEST_ID),))
+        timer.start()
+        collected = collector.wait_for(_with_request_id(REQUEST_ID), WAIT_TIMEOUT)
+        timer.join()
+        assert collected is not None
+        assert collected.message.request_id == REQUEST_ID
+
+    def test_consumer_failure_wakes_waiter(self) -> None:
+        collector = AuditCollector(MAX_MESSAGES)
+        error = ConnectionError("connection lost")
+        timer = threading.Timer(ADD_DELAY, collector.fail, (error,))
+        timer.start()
+        with pytest.raises(RuntimeError, match="audit consumer failed") as failed:
+            collector.wait_for(_with_request_id(REQUEST_ID), WAIT_TIMEOUT)
+        timer.join()
+        assert failed.value.__cause__ is error
+
+    def test_collected_message_after_failure(self) -> None:
+        collector = AuditCollector(MAX_MESSAGES)
+        collector.add(_body(REQUEST_ID))
+        collector.fail(ConnectionError("connection lost"))
+        assert collector.wait_for(_with_request_id(REQUEST_ID), NO_WAIT) is not None
@@ -0,0 +1,159 @@
+"""
+Тесты заглушки auth-service: ручки, внесение задержки и ошибок, /metrics
+"""
+
+import asyncio
+import time
+from collections.abc import Iterator
+from types import MappingProxyType
+
+import httpx
+import pytest
+
+from src.api_clients.auth_service import FILTER_NOTES_PATH, HEALTH_PATH, LOGIN_PATH, METRICS_PATH
+from src.common import errors, fields, ids
+from src.standins.auth_service import (
+    DEFAULT_CLIENT_SECRET,
+    INJECTED_ERROR,
+    AuthServiceStandIn,
+    StandInSettings,
+)
+
+BASE_URL = "http://auth-service"
+LATENCY = 0.05
+JITTER = 0.02
+SEED = 42
+ATTEMPTS = 20
+UNKNOWN_NOTE = "00000000-0000-0000-0000-000000000000"
+LOGIN_REQUEST = MappingProxyType({
+    fields.GRANT_TYPE_FIELD: fields.GRANT_TYPE_CLIENT_CREDENTIALS,
+    fields.CLIENT_ID_FIELD: fields.CLIENT_ID_BOT,
+    fields.CLIENT_SECRET_FIELD: DEFAULT_CLIENT_SECRET,
+})
+
+
+def _client(standin: AuthServiceStandIn) -> httpx.Client:
+    return httpx.Client(base_url=BASE_URL, transport=standin.transport())
+
+
+@pytest.fixture()
+def client() -> Iterator[httpx.Client]:
+    with _client(AuthServiceStandIn()) as standin_client:
+        yield standin_client
+
+
+def _login(standin_client: httpx.Client) -> str:
+    response = standin_client.post(LOGIN_PATH, json=dict(LOGIN_REQUEST))
+    assert response.status_code == httpx.codes.OK
+    token: str = response.json()[fields.ACCESS_TOKEN_FIELD]
+    return token
+
+
+async def _timed_health(standin: AuthServiceStandIn) -> float:
+    async with httpx.AsyncClient(base_url=BASE_URL, transport=standin.async_transport()) as async_client:
+        started = time.perf_counter()
+        await async_client.get(HEALTH_PATH)
+        return time.perf_counter() - started
+
+
+class TestRoutes:
+    """login, filter_notes и проверка токена"""
+
+    def test_login_then_filter_notes(self, client: httpx.Client) -> None:
+        token = _login(client)
+        readable = ids.PERSONAL_NOTES[0]
+        response = client.post(
+            FILTER_NOTES_PATH,
+            json={fields.NOTE_IDS_FIELD: [readable, UNKNOWN_NOTE]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == httpx.codes.OK
+        assert list(response.json()[fields.NOTES_FIELD]) == [readable]
+
+    def test_filter_notes_without_token(self, client: httpx.Client) -> None:
+        response = client.post(FILTER_NOTES_PATH, json={fields.NOTE_IDS_FIELD: [UNKNOWN_NOTE]})
+        assert response.status_code == httpx.codes.UNAUTHORIZED
+
+    def test_filter_notes_with_foreign_token(self, client: httpx.Client) -> None:
+        response = client.post(
+            FILTER_NOTES_PATH,
+            json={fields.NOTE_IDS_FIELD: [UNKNOWN_NOTE]},
+            headers={"Authorization": "Bearer not-issued"},
+        )
+        assert response.status_code == httpx.codes.UNAUTHORIZED
+        assert response.json()[fields.ERROR_FIELD] == errors.INVALID_TOKEN_ERROR
+
+    def test_login_with_wrong_secret(self, client: httpx.Client) -> None:
+        response = client.post(LOGIN_PATH, json={**LOGIN_REQUEST, fields.CLIENT_SECRET_FIELD: "wrong"})
+        assert response.status_code == httpx.codes.UNAUTHORIZED
+        assert response.json()[fields.ERROR_FIELD] == errors.INVALID_CLIENT_SECRET_ERROR
+
+    def test_unknown_path(self, client: httpx.Client) -> None:
+        assert client.get("/api/v0/unknown").status_code == httpx.codes.NOT_FOUND
+
+
+class TestFaultInjection:
+    """Задержка, ошибки 500 и воспроизводимость по seed"""
+
+    def test_error_rate_one_fails_every_request(self) -> None:
+        with _client(AuthServiceStandIn(StandInSettings(error_rate=1))) as standin_client:
+            response = standin_client.get(HEALTH_PATH)
+        assert response.status_code == httpx.codes.INTERNAL_SERVER_ERROR
+        assert response.json()[fields.ERROR_FIELD] == INJECTED_ERROR
+
+    def test_metrics_are_never_failed(self) -> None:
+        with _client(AuthServiceStandIn(StandInSettings(error_rate=1))) as standin_client:
+            assert standin_client.get(METRICS_PATH).status_code == httpx.codes.OK
+
+    def test_seed_repeats_faults(self) -> None:
+        settings = StandInSettings(jitter=JITTER, error_rate=0.5, seed=SEED)
+        runs = []
+        for _ in range(2):
+            faults = AuthServiceStandIn(settings).faults
+            delays = [faults.delay(HEALTH_PATH) for _ in range(ATTEMPTS)]
+            runs.append((delays, [faults.should_fail() for _ in range(ATTEMPTS)]))
+        assert runs[0] == runs[1]
+
+    def test_delay_is_within_jitter(self) -> None:
+        faults = AuthServiceStandIn(StandInSettings(latency=LATENCY, jitter=JITTER, seed=SEED)).faults
+        delays = [faults.delay(HEALTH_PATH) for _ in range(ATTEMPTS)]
+        assert all(LATENCY <= delay <= LATENCY + JITTER for delay in delays)
+        assert faults.delay(METRICS_PATH) == 0
+
+    def test_async_transport_waits_for_latency(self) -> None:
+        elapsed = asyncio.run(_timed_health(AuthServiceStandIn(StandInSettings(latency=LATENCY))))
+        assert elapsed >= LATENCY
+
+    def test_sync_transport_waits_for_latency(self) -> None:
+        with _client(AuthServiceStandIn(StandInSettings(latency=LATENCY))) as standin_client:
+            started = time.perf_counter()
+            standin_client.get(HEALTH_PATH)
+        assert time.perf_counter() - started >= LATENCY
+
+    @pytest.mark.parametrize(("latency", "jitter", "error_rate"), [
+        (-1, 0, 0),
+        (0, -1, 0),
+        (0, 0, 2),
+    ])
+    def test_rejects_invalid_settings(self, latency: float, jitter: float, error_rate: float) -> None:
+        with pytest.raises(ValueError):
+            StandInSettings(latency=latency, jitter=jitter, error_rate=error_rate)
+
+
+class TestMetrics:
+    """Счётчики и гистограмма /metrics"""
+
+    def test_counts_requests_by_path_and_status(self, client: httpx.Client) -> None:
+        client.get(HEALTH_PATH)
+        client.post(FILTER_NOTES_PATH, json={})
+        metrics = client.get(METRICS_PATH).text
+        assert f'http_requests_total{{path="{HEALTH_PATH}",status="200"}} 1' in metrics
+        assert f'http_requests_total{{path="{FILTER_NOTES_PATH}",status="401"}} 1' in metrics
+        assert "http_request_duration_seconds_count 2" in metrics
+
+    def test_histogram_includes_injected_latency(self) -> None:
+        with _client(AuthServiceStandIn(StandInSettings(latency=LATENCY))) as standin_client:
+            standin_client.get(HEALTH_PATH)
+            metrics = standin_client.get(METRICS_PATH).text
+        assert 'http_request_duration_seconds_bucket{le="0.025"} 0' in metrics
+        assert 'http_request_duration_seconds_bucket{le="0.1"} 1' in metrics
@@ -0,0 +1,53 @@
+"""
+Тесты записи трафика: учётные данные не попадают в файл записи
+"""
+
+import json
+from pathlib import Path
+
+import httpx
+
+from src.api_clients.auth_service import LOGIN_PATH
+from src.api_clients.capture import REDACTED, CaptureWriter, capture_event_hooks, read_capture
+from src.common import fields
+from src.standins.auth_service import DEFAULT_CLIENT_SECRET, AuthServiceStandIn
+
+BASE_URL = "http://auth-service"
+
+
+def _captured_login(path: Path) -> str:
+    """Логинится в заглушку с записью трафика в path и возвращает выданный токен."""
+    writer = CaptureWriter(path)
+    with httpx.Client(
+        base_url=BASE_URL,
+        transport=AuthServiceStandIn().transport(),
+        event_hooks=capture_event_hooks(writer),
+    ) as client:
+        response = client.post(LOGIN_PATH, json={
+            fields.GRANT_TYPE_FIELD: fields.GRANT_TYPE_CLIENT_CREDENTIALS,
+            fields.CLIENT_ID_FIELD: fields.CLIENT_ID_BOT,
+            fields.CLIENT_SECRET_FIELD: DEFAULT_CLIENT_SECRET,
+        })
+    writer.close()
+    assert response.status_code == httpx.codes.OK
+    token: str = response.json()[fields.ACCESS_TOKEN_FIELD]
+    return token
+
+
+class TestRedaction:
+    """client_secret и access_token в JSON-телах заменяются на REDACTED"""
+
+    def test_login_secrets_are_not_written(self, tmp_path: Path) -> None:
+        path = tmp_path / "traffic.jsonl"
+        token = _captured_login(path)
+        captured = path.read_text(encoding="utf-8")
+        assert DEFAULT_CLIENT_SECRET not in captured
+        assert token not in captured
+
+    def test_other_fields_are_kept(self, tmp_path: Path) -> None:
+        path = tmp_path / "traffic.jsonl"
+        _captured_login(path)
+        exchange = next(read_capture(path))
+        request = json.loads(exchange.request_content())
+        assert request[fields.CLIENT_SECRET_FIELD] == REDACTED
+        assert request[fields.CLIENT_ID_FIELD] == fields.CLIENT_ID_BOT
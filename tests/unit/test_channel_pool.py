@@ -0,0 +1,70 @@
+"""
+Тесты пула каналов поверх брокера RabbitMQ в памяти: повторное использование и проверки канала
+"""
+
+from collections.abc import Iterator
+
+import pytest
+
+from src.brokers.rabbitmq import ChannelPool
+from src.standins.rabbitmq import InMemoryBroker, InMemoryConnection
+
+MAX_IDLE = 2
+
+
+@pytest.fixture()
+def connection() -> Iterator[InMemoryConnection]:
+    connection = InMemoryBroker().connect()
+    yield connection
+    connection.close()
+
+
+@pytest.fixture()
+def pool(connection: InMemoryConnection) -> ChannelPool:
+    return ChannelPool(connection, MAX_IDLE)
+
+
+class TestReuse:
+    """Здоровый канал возвращается в пул и выдаётся снова"""
+
+    def test_one_channel_is_reused(self, pool: ChannelPool) -> None:
+        for _ in range(3):
+            with pool.channel() as channel:
+                assert channel.is_open
+        assert (pool.opened, pool.reused, len(pool)) == (1, 2, 1)
+
+    def test_idle_channels_are_limited(self, pool: ChannelPool) -> None:
+        with pool.channel(), pool.channel(), pool.channel():
+            assert pool.opened == MAX_IDLE + 1
+        assert len(pool) == MAX_IDLE
+
+
+class TestHealthChecks:
+    """Неисправный канал закрывается и не выдаётся повторно"""
+
+    def test_error_discards_channel(self, pool: ChannelPool) -> None:
+        with pytest.raises(RuntimeError):
+            with pool.channel() as channel:
+                raise RuntimeError
+        assert not channel.is_open
+        assert len(pool) == 0
+
+    def test_channel_closed_by_broker_is_not_reused(
+        self,
+        connection: InMemoryConnection,
+        pool: ChannelPool,
+    ) -> None:
+        with pool.channel() as pooled:
+            closed = pooled.channel
+        # Channel.Close от брокера доходит до клиента при следующем обращении к соединению
+        connection.add_callback_threadsafe(closed.close)
+        with pool.channel() as pooled:
+            assert pooled.channel is not closed
+            assert pooled.is_open
+        assert (pool.opened, pool.reused) == (2, 0)
+
+    def test_confirm_mode_channel_is_not_returned(self, pool: ChannelPool) -> None:
+        with pool.channel() as channel:
+            channel.confirm_delivery()
+        assert not channel.is_open
+        assert len(pool) == 0
@@ -0,0 +1,72 @@
+"""
+Тесты подбора размера чанка filter_notes без обращения к auth-service
+"""
+
+import asyncio
+import math
+
+import httpx
+
+from src.api_clients.auth_service import AsyncAuthServiceV0APIClient
+from src.common import fields
+from src.load.chunking import ChunkSizeMeasurement, benchmark_chunk_sizes, best_chunk_size, format_chunk_report
+
+CHUNK_SIZES = (1, 2)
+REPEATS = 3
+LIST_SIZE = 4
+# медианы замеров, секунды
+FAST = 0.01
+MEDIUM = 0.02
+SLOW = 0.03
+
+
+class FailingFirstRequest:
+    """Транспорт, у которого первый запрос падает с ошибкой соединения, остальные отвечают пустыми notes."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.requests == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(httpx.codes.OK, json={fields.NOTES_FIELD: {}})
+
+
+async def _benchmark(transport: httpx.MockTransport) -> list[ChunkSizeMeasurement]:
+    body = {fields.NOTE_IDS_FIELD: [str(index) for index in range(LIST_SIZE)]}
+    async with AsyncAuthServiceV0APIClient(transport=transport) as client:
+        return await benchmark_chunk_sizes(client, body, CHUNK_SIZES, REPEATS)
+
+
+def _measurement(chunk_size: int, p50: float, errors: int = 0) -> ChunkSizeMeasurement:
+    return ChunkSizeMeasurement(chunk_size=chunk_size, chunks=1, p50=p50, p99=p50, errors=errors)
+
+
+class TestBenchmark:
+    """Ошибка прогревочного вызова не прерывает подбор"""
+
+    def test_failed_warmup_does_not_abort(self) -> None:
+        measurements = asyncio.run(_benchmark(httpx.MockTransport(FailingFirstRequest())))
+        assert [measurement.chunk_size for measurement in measurements] == list(CHUNK_SIZES)
+        assert all(measurement.errors == 0 for measurement in measurements)
+
+
+class TestBestChunkSize:
+    """Лучший размер выбирается только среди прогонов без ошибок"""
+
+    def test_lowest_median_without_errors(self) -> None:
+        measurements = [
+            _measurement(1, FAST, errors=1),
+            _measurement(2, SLOW),
+            _measurement(3, MEDIUM),
+        ]
+        assert best_chunk_size(measurements) == measurements[2]
+
+    def test_none_when_every_size_failed(self) -> None:
+        measurements = [
+            _measurement(1, FAST, errors=1),
+            _measurement(2, math.nan, errors=REPEATS),
+        ]
+        assert best_chunk_size(measurements) is None
+        assert "every chunk size had errors" in format_chunk_report(measurements, LIST_SIZE)
@@ -0,0 +1,220 @@
+"""
+Тесты брокера RabbitMQ в памяти: маршрутизация, выдача, подтверждения и ошибки pika
+"""
+
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+import pika
+import pytest
+from pika.exchange_type import ExchangeType
+
+from src.standins.rabbitmq import (
+    NOT_FOUND,
+    PRECONDITION_FAILED,
+    InMemoryBroker,
+    InMemoryChannel,
+    topic_matches,
+)
+
+QUEUE = "notes"
+EXCHANGE = "notes_exchange"
+ROUTING_KEY = "notes.created"
+BODY = b"body"
+FIRST = b"first"
+SECOND = b"second"
+FANOUT = "fanout"
+TOPIC = "topic"
+PREFETCH = 2
+WAIT_TIMEOUT = 5
+CALLBACK_DELAY = 0.01
+
+
+@pytest.fixture()
+def broker() -> InMemoryBroker:
+    broker = InMemoryBroker()
+    broker.declare_queue(QUEUE)
+    broker.declare_exchange(EXCHANGE)
+    broker.bind(QUEUE, EXCHANGE, ROUTING_KEY)
+    return broker
+
+
+@pytest.fixture()
+def channel(broker: InMemoryBroker) -> Iterator[InMemoryChannel]:
+    connection = broker.connect()
+    yield connection.channel()
+    connection.close()
+
+
+class _Received:
+    """Колбэк basic_consume, запоминающий тела и delivery_tag."""
+
+    def __init__(self) -> None:
+        self.bodies: list[bytes] = []
+        self.delivery_tags: list[int] = []
+
+    def __call__(self, _channel: Any, method: Any, _properties: Any, body: bytes) -> None:
+        self.bodies.append(body)
+        self.delivery_tags.append(method.delivery_tag)
+
+
+@pytest.mark.parametrize(("pattern", "routing_key", "matched"), [
+    ("notes.*", "notes.created", True),
+    ("notes.*", "notes.created.v2", False),
+    ("notes.#", "notes", True),
+    ("notes.#", "notes.created.v2", True),
+    ("#.v2", "notes.created.v2", True),
+    ("*.created", "notes.removed", False),
+])
+def test_topic_matches(pattern: str, routing_key: str, matched: bool) -> None:
+    assert topic_matches(pattern, routing_key) is matched
+
+
+class TestRouting:
+    """Обменники direct, fanout, topic и обменник по умолчанию"""
+
+    def test_direct_exchange(self, broker: InMemoryBroker) -> None:
+        assert broker.publish(EXCHANGE, ROUTING_KEY, BODY) == 1
+        assert broker.publish(EXCHANGE, "other", BODY) == 0
+        assert broker.message_count(QUEUE) == 1
+
+    def test_default_exchange_routes_by_queue_name(self, broker: InMemoryBroker) -> None:
+        assert broker.publish("", QUEUE, BODY) == 1
+        assert broker.publish("", "missing", BODY) == 0
+
+    def test_fanout_exchange(self, broker: InMemoryBroker) -> None:
+        broker.declare_queue("copy")
+        broker.declare_exchange(FANOUT, ExchangeType.fanout.value)
+        broker.bind(QUEUE, FANOUT)
+        broker.bind("copy", FANOUT)
+        assert broker.publish(FANOUT, "any", BODY) == 2
+
+    def test_topic_exchange(self, broker: InMemoryBroker) -> None:
+        broker.declare_exchange(TOPIC, ExchangeType.topic.value)
+        broker.bind(QUEUE, TOPIC, "notes.*")
+        assert broker.publish(TOPIC, ROUTING_KEY, BODY) == 1
+        assert broker.publish(TOPIC, "resources.created", BODY) == 0
+
+    def test_unroutable_mandatory_publish(self, channel: InMemoryChannel) -> None:
+        channel.confirm_delivery()
+        with pytest.raises(pika.exceptions.UnroutableError):
+            channel.basic_publish(EXCHANGE, "other", BODY, mandatory=True)
+
+
+class TestChannel:
+    """basic_get, подтверждения и ошибки канала"""
+
+    def test_basic_get(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        broker.publish(EXCHANGE, ROUTING_KEY, FIRST)
+        broker.publish(EXCHANGE, ROUTING_KEY, SECOND)
+        method, _properties, body = channel.basic_get(QUEUE)
+        assert body == FIRST
+        assert method.message_count == 1
+        assert method.routing_key == ROUTING_KEY
+
+    def test_basic_get_from_empty_queue(self, channel: InMemoryChannel) -> None:
+        assert channel.basic_get(QUEUE) == (None, None, None)
+
+    def test_nack_requeues_to_head(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        broker.publish(EXCHANGE, ROUTING_KEY, FIRST)
+        broker.publish(EXCHANGE, ROUTING_KEY, SECOND)
+        method, _properties, _body = channel.basic_get(QUEUE)
+        channel.basic_nack(method.delivery_tag)
+        redelivered = channel.basic_get(QUEUE)
+        assert redelivered[2] == FIRST
+        assert redelivered[0].redelivered
+
+    def test_ack_removes_message(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        broker.publish(EXCHANGE, ROUTING_KEY, BODY)
+        method, _properties, _body = channel.basic_get(QUEUE)
+        channel.basic_ack(method.delivery_tag)
+        channel.close()
+        assert broker.message_count(QUEUE) == 0
+
+    def test_close_requeues_unacked(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        broker.publish(EXCHANGE, ROUTING_KEY, BODY)
+        channel.basic_get(QUEUE)
+        assert broker.message_count(QUEUE) == 0
+        channel.close()
+        assert broker.message_count(QUEUE) == 1
+
+
+class TestChannelErrors:
+    """Объявления и ошибки брокера, закрывающие канал"""
+
+    def test_unknown_delivery_tag_closes_channel(self, channel: InMemoryChannel) -> None:
+        with pytest.raises(pika.exceptions.ChannelClosedByBroker) as closed:
+            channel.basic_ack(1)
+        assert closed.value.reply_code == PRECONDITION_FAILED
+        assert channel.is_closed
+
+    def test_passive_declare_of_missing_queue(self, channel: InMemoryChannel) -> None:
+        with pytest.raises(pika.exceptions.ChannelClosedByBroker) as closed:
+            channel.queue_declare("missing", passive=True)
+        assert closed.value.reply_code == NOT_FOUND
+        with pytest.raises(pika.exceptions.ChannelWrongStateError):
+            channel.basic_get(QUEUE)
+
+    def test_exchange_type_mismatch(self, channel: InMemoryChannel) -> None:
+        with pytest.raises(pika.exceptions.ChannelClosedByBroker) as closed:
+            channel.exchange_declare(EXCHANGE, ExchangeType.fanout)
+        assert closed.value.reply_code == PRECONDITION_FAILED
+
+    def test_queue_declare_counts(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        broker.publish(EXCHANGE, ROUTING_KEY, BODY)
+        channel.basic_consume(QUEUE, _Received())
+        declared = channel.queue_declare(QUEUE, passive=True).method
+        assert (declared.message_count, declared.consumer_count) == (1, 1)
+
+    def test_server_named_queue(self, channel: InMemoryChannel) -> None:
+        declared = channel.queue_declare("", exclusive=True).method
+        assert declared.queue.startswith("amq.gen-")
+
+
+class TestConsume:
+    """Доставка в process_data_events, prefetch и удаление очередей"""
+
+    def test_delivers_in_process_data_events(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        received = _Received()
+        channel.basic_consume(QUEUE, received, auto_ack=True)
+        broker.publish(EXCHANGE, ROUTING_KEY, BODY)
+        assert not received.bodies
+        channel.connection.process_data_events()
+        assert received.bodies == [BODY]
+        assert broker.message_count(QUEUE) == 0
+
+    def test_prefetch_limits_unacked_deliveries(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        for _ in range(PREFETCH + 1):
+            broker.publish(EXCHANGE, ROUTING_KEY, BODY)
+        received = _Received()
+        channel.basic_qos(prefetch_count=PREFETCH)
+        channel.basic_consume(QUEUE, received)
+        channel.connection.process_data_events()
+        assert len(received.bodies) == PREFETCH
+        channel.basic_ack(received.delivery_tags[-1], multiple=True)
+        channel.connection.process_data_events()
+        assert len(received.bodies) == PREFETCH + 1
+
+    def test_cancel_deletes_auto_delete_queue(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        channel.queue_declare("temporary", auto_delete=True)
+        tag = channel.basic_consume("temporary", _Received())
+        channel.basic_cancel(tag)
+        with pytest.raises(pika.exceptions.ChannelClosedByBroker):
+            broker.message_count("temporary")
+
+    def test_connection_close_deletes_exclusive_queue(self, broker: InMemoryBroker) -> None:
+        connection = broker.connect()
+        connection.channel().queue_declare("exclusive", exclusive=True)
+        connection.close()
+        assert broker.publish("", "exclusive", BODY) == 0
+
+    def test_threadsafe_callback_wakes_connection(self, broker: InMemoryBroker) -> None:
+        connection = broker.connect()
+        called = threading.Event()
+        timer = threading.Timer(CALLBACK_DELAY, connection.add_callback_threadsafe, (called.set,))
+        timer.start()
+        connection.process_data_events(time_limit=WAIT_TIMEOUT)
+        timer.join()
+        assert called.is_set()
+        connection.close()
@@ -0,0 +1,169 @@
+"""
+Тесты разбора текстового формата Prometheus и квантилей по приращениям гистограмм
+"""
+
+import math
+
+import pytest
+
+from src.api_clients import prometheus
+
+METRICS_BEFORE = """
+# HELP http_requests_total Handled requests.
+# TYPE http_requests_total counter
+http_requests_total{path="/a",status="200"} 10
+http_requests_total{path="/b",status="500"} 3
+# TYPE goroutines gauge
+goroutines 12
+# TYPE duration_seconds histogram
+duration_seconds_bucket{path="/a",le="0.1"} 4
+duration_seconds_bucket{path="/a",le="0.5"} 8
+duration_seconds_bucket{path="/a",le="+Inf"} 10
+duration_seconds_sum{path="/a"} 2.5
+duration_seconds_count{path="/a"} 10
+"""
+
+METRICS_AFTER = """
+# TYPE http_requests_total counter
+http_requests_total{path="/a",status="200"} 30
+http_requests_total{path="/b",status="500"} 3
+# TYPE goroutines gauge
+goroutines 20
+# TYPE duration_seconds histogram
+duration_seconds_bucket{path="/a",le="0.1"} 4
+duration_seconds_bucket{path="/a",le="0.5"} 18
+duration_seconds_bucket{path="/a",le="+Inf"} 20
+duration_seconds_sum{path="/a"} 5.5
+duration_seconds_count{path="/a"} 20
+duration_seconds_bucket{path="/b",le="0.1"} 10
+duration_seconds_bucket{path="/b",le="0.5"} 10
+duration_seconds_bucket{path="/b",le="+Inf"} 10
+duration_seconds_sum{path="/b"} 0.5
+duration_seconds_count{path="/b"} 10
+"""
+
+ELAPSED = 10
+HISTOGRAM = "duration_seconds"
+SERIES_A = (("path", "/a"), ("status", "200"))
+LABEL_PATH = "path"
+LOWER_BOUND = 0.1
+UPPER_BOUND = 0.5
+# середина бакета (0.1, 0.5]
+MIDPOINT = 0.3
+P75 = 0.75
+P99 = 0.99
+# приращение http_requests_total /a и наблюдения гистограммы по /a и /b за интервал
+NEW_REQUESTS = 20
+OBSERVED = 20
+OBSERVED_SUM = 3.5
+
+
+def _diff() -> prometheus.MetricsDiff:
+    return prometheus.MetricsDiff(
+        prometheus.snapshot(METRICS_BEFORE, taken_at=0),
+        prometheus.snapshot(METRICS_AFTER, taken_at=ELAPSED),
+    )
+
+
+class TestParse:
+    """Строки рядов, метки и семейства"""
+
+    def test_families_and_types(self) -> None:
+        families = prometheus.parse_metrics(METRICS_BEFORE)
+        assert families["http_requests_total"].type == prometheus.COUNTER
+        assert families["http_requests_total"].help == "Handled requests."
+        assert families["goroutines"].type == prometheus.GAUGE
+        # служебные ряды гистограммы попадают в её семейство
+        assert len(families[HISTOGRAM].samples) == 5
+
+    def test_sample_without_labels(self) -> None:
+        sample = prometheus.parse_sample("process_open_fds 42 1700000000000")
+        assert (sample.name, sample.labels, sample.value) == ("process_open_fds", (), 42)
+
+    def test_labels_are_sorted_and_unescaped(self) -> None:
+        sample = prometheus.parse_sample(r'errors{z="1", a="say \"hi\"\nbye",} 1')
+        assert sample.labels == (("a", 'say "hi"\nbye'), ("z", "1"))
+
+    def test_label_value_with_comma_and_brace(self) -> None:
+        sample = prometheus.parse_sample('requests{path="/a,b",query="{id}"} 7')
+        assert sample.label(LABEL_PATH) == "/a,b"
+        assert sample.label("query") == "{id}"
+
+    @pytest.mark.parametrize("raw_value", ["+Inf", "-Inf"])
+    def test_infinite_values(self, raw_value: str) -> None:
+        assert math.isinf(prometheus.parse_sample(f"value {raw_value}").value)
+
+    @pytest.mark.parametrize("line", [
+        "no_value",
+        'broken{path=unquoted} 1',
+        "not_a_number{} abc",
+    ])
+    def test_invalid_lines(self, line: str) -> None:
+        with pytest.raises(ValueError, match="invalid metrics line"):
+            prometheus.parse_sample(line)
+
+    def test_other_comments_are_skipped(self) -> None:
+        families = prometheus.parse_metrics("# just a comment\n# EOF\nup 1\n")
+        assert list(families) == ["up"]
+
+
+class TestBucketQuantile:
+    """Интерполяция внутри бакета"""
+
+    def test_interpolates_inside_bucket(self) -> None:
+        buckets = ((LOWER_BOUND, 0), (UPPER_BOUND, 10), (math.inf, 10))
+        assert prometheus.bucket_quantile(0.5, buckets) == pytest.approx(MIDPOINT)
+
+    def test_inf_bucket_returns_last_finite_bound(self) -> None:
+        buckets = ((LOWER_BOUND, 1), (math.inf, 10))
+        assert prometheus.bucket_quantile(P99, buckets) == LOWER_BOUND
+
+    def test_empty_histogram(self) -> None:
+        assert math.isnan(prometheus.bucket_quantile(0.5, ()))
+        assert math.isnan(prometheus.bucket_quantile(0.5, ((math.inf, 0),)))
+
+
+class TestMetricsDiff:
+    """Приращения счётчиков, изменения gauge и гистограммы между снимками"""
+
+    def test_counter_deltas_and_rates(self) -> None:
+        diff = _diff()
+        key = ("http_requests_total", SERIES_A)
+        assert diff.counter_deltas()[key] == NEW_REQUESTS
+        assert diff.counter_rates()[key] == pytest.approx(NEW_REQUESTS / ELAPSED)
+
+    def test_counter_reset_counts_from_zero(self) -> None:
+        diff = prometheus.MetricsDiff(
+            prometheus.snapshot("# TYPE c counter\nc 100\n", taken_at=0),
+            prometheus.snapshot("# TYPE c counter\nc 5\n", taken_at=1),
+        )
+        assert diff.counter_deltas() == {("c", ()): 5}
+
+    def test_gauge_changes(self) -> None:
+        assert _diff().gauge_changes() == {("goroutines", ()): (12, 20)}
+
+    def test_histogram_delta_merges_series(self) -> None:
+        histogram = _diff().histogram(HISTOGRAM)
+        # /a: 10 новых наблюдений, /b появился после первого снимка и идёт целиком
+        assert histogram.count == OBSERVED
+        assert histogram.sum == pytest.approx(OBSERVED_SUM)
+        expected = ((LOWER_BOUND, 10), (UPPER_BOUND, OBSERVED), (math.inf, OBSERVED))
+        assert histogram.buckets == expected
+
+    def test_histogram_delta_quantiles(self) -> None:
+        histogram = _diff().histogram(HISTOGRAM)
+        assert histogram.quantile(0.5) == pytest.approx(LOWER_BOUND)
+        assert histogram.quantile(P75) == pytest.approx(MIDPOINT)
+        assert histogram.mean == pytest.approx(OBSERVED_SUM / OBSERVED)
+
+    def test_histogram_reset_uses_after_snapshot(self) -> None:
+        restarted = METRICS_BEFORE.replace("} 10\n", "} 2\n").replace("} 8\n", "} 2\n")
+        diff = prometheus.MetricsDiff(
+            prometheus.snapshot(METRICS_BEFORE, taken_at=0),
+            prometheus.snapshot(restarted, taken_at=ELAPSED),
+        )
+        assert diff.histogram(HISTOGRAM).count == 2
+
+    def test_format_series(self) -> None:
+        assert prometheus.format_series(("up", ())) == "up"
+        assert prometheus.format_series(("requests", SERIES_A)) == 'requests{path="/a",status="200"}'
@@ -0,0 +1,78 @@
+"""
+Тесты ожидания сообщения подпиской (receive_one) и перевода устаревшего queue_poll_attempts
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from src.brokers.rabbitmq import receive_one
+from src.config import QUEUE_POLL_ATTEMPT_SECONDS, RabbitMQConfig
+from src.standins.rabbitmq import InMemoryBroker, InMemoryChannel
+
+QUEUE = "notes"
+FIRST = b"first"
+SECOND = b"second"
+# секунды
+WAIT_TIMEOUT = 5
+SHORT_TIMEOUT = 0.05
+PUBLISH_DELAY = 0.05
+POLL_ATTEMPTS = 5
+
+
+@pytest.fixture()
+def broker() -> InMemoryBroker:
+    broker = InMemoryBroker()
+    broker.declare_queue(QUEUE)
+    return broker
+
+
+@pytest.fixture()
+def channel(broker: InMemoryBroker) -> Iterator[InMemoryChannel]:
+    connection = broker.connect()
+    yield connection.channel()
+    connection.close()
+
+
+class TestReceiveOne:
+    """Первое сообщение, ожидание до срока и остаток очереди"""
+
+    def test_returns_as_soon_as_message_arrives(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        publisher = threading.Timer(PUBLISH_DELAY, broker.publish, args=("", QUEUE, FIRST))
+        started = time.monotonic()
+        publisher.start()
+        assert receive_one(channel, QUEUE, WAIT_TIMEOUT) == FIRST
+        publisher.join()
+        assert time.monotonic() - started < WAIT_TIMEOUT / 2
+
+    def test_returns_none_after_deadline(self, channel: InMemoryChannel) -> None:
+        started = time.monotonic()
+        assert receive_one(channel, QUEUE, SHORT_TIMEOUT) is None
+        assert time.monotonic() - started >= SHORT_TIMEOUT
+
+    def test_other_messages_stay_in_queue(self, broker: InMemoryBroker, channel: InMemoryChannel) -> None:
+        broker.publish("", QUEUE, FIRST)
+        broker.publish("", QUEUE, SECOND)
+        assert receive_one(channel, QUEUE, WAIT_TIMEOUT) == FIRST
+        assert broker.message_count(QUEUE) == 1
+        assert not channel.consumer_tags
+        assert receive_one(channel, QUEUE, WAIT_TIMEOUT) == SECOND
+
+
+class TestQueuePollAttempts:
+    """Устаревший queue_poll_attempts переводится в queue_wait_timeout с предупреждением"""
+
+    def test_attempts_map_to_wait_timeout(self) -> None:
+        with pytest.warns(DeprecationWarning, match="queue_poll_attempts"):
+            config = RabbitMQConfig.model_validate({"queue_poll_attempts": POLL_ATTEMPTS})
+        assert config.queue_wait_timeout == pytest.approx(POLL_ATTEMPTS * QUEUE_POLL_ATTEMPT_SECONDS)
+
+    def test_explicit_wait_timeout_wins(self) -> None:
+        with pytest.warns(DeprecationWarning):
+            config = RabbitMQConfig.model_validate({
+                "queue_poll_attempts": POLL_ATTEMPTS,
+                "queue_wait_timeout": WAIT_TIMEOUT,
+            })
+        assert config.queue_wait_timeout == WAIT_TIMEOUT
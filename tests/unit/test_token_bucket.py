@@ -0,0 +1,131 @@
+"""
+Тесты ведра токенов и лимитера API-клиентов без обращения к сервисам
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+import pytest
+
+from src.api_clients import rate_limit
+from src.config import RateLimitConfig, RateLimitRule
+
+FILTER_PATH = "/api/v0/auth/notes/filter"
+HEALTH_PATH = "/api/v0/health"
+RATE = 10
+# секунды между слотами при RATE запросов в секунду
+SLOT = 1 / RATE
+BURST = 2
+
+AsyncHook = Callable[[httpx.Request], Awaitable[None]]
+
+
+class FakeClock:
+    """Подменяет модуль time в rate_limit: время идёт только по sleep и advance."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+def _filter_request() -> httpx.Request:
+    return httpx.Request("GET", f"http://service{FILTER_PATH}")
+
+
+async def _call_twice(hook: AsyncHook, request: httpx.Request) -> None:
+    await hook(request)
+    await hook(request)
+
+
+class TestTokenBucket:
+    """Резервирование токенов и пополнение со временем"""
+
+    def test_burst_is_free(self, clock: FakeClock) -> None:
+        bucket = rate_limit.TokenBucket(rate=RATE, burst=BURST)
+        assert [bucket.reserve() for _ in range(BURST)] == [0, 0]
+
+    def test_delay_grows_after_burst(self, clock: FakeClock) -> None:
+        bucket = rate_limit.TokenBucket(rate=RATE, burst=1)
+        bucket.reserve()
+        # каждый следующий вызывающий получает свой слот на SLOT позже предыдущего
+        assert bucket.reserve() == pytest.approx(SLOT)
+        assert bucket.reserve() == pytest.approx(SLOT * 2)
+
+    def test_refills_with_time(self, clock: FakeClock) -> None:
+        bucket = rate_limit.TokenBucket(rate=RATE, burst=BURST)
+        bucket.reserve()
+        bucket.reserve()
+        clock.advance(SLOT)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(SLOT)
+
+    def test_refill_is_capped_by_burst(self, clock: FakeClock) -> None:
+        bucket = rate_limit.TokenBucket(rate=RATE, burst=BURST)
+        clock.advance(SLOT * RATE * BURST * 3)
+        assert [bucket.reserve() for _ in range(BURST)] == [0, 0]
+        assert bucket.reserve() == pytest.approx(SLOT)
+
+    @pytest.mark.parametrize("rate", [0, -1])
+    def test_rejects_non_positive_rate(self, rate: float) -> None:
+        with pytest.raises(ValueError, match="rate"):
+            rate_limit.TokenBucket(rate=rate, burst=1)
+
+    def test_rejects_empty_burst(self) -> None:
+        with pytest.raises(ValueError, match="burst"):
+            rate_limit.TokenBucket(rate=RATE, burst=0)
+
+
+class TestRateLimiter:
+    """Выбор самого строгого ведра и ожидание в event hooks"""
+
+    def test_strictest_bucket_wins(self, clock: FakeClock) -> None:
+        limiter = rate_limit.RateLimiter.from_config(RateLimitConfig(
+            rps=RATE,
+            burst=1,
+            endpoints={FILTER_PATH: RateLimitRule(rps=1, burst=1)},
+        ))
+        assert limiter.reserve(FILTER_PATH) == 0
+        assert limiter.reserve(FILTER_PATH) == pytest.approx(1)
+        # остальные пути ждут только общее ведро, в котором уже два запроса
+        assert limiter.reserve(HEALTH_PATH) == pytest.approx(SLOT * 2)
+
+    def test_without_limits_never_waits(self, clock: FakeClock) -> None:
+        limiter = rate_limit.RateLimiter.from_config(RateLimitConfig())
+        delays = {limiter.reserve(FILTER_PATH) for _ in range(RATE)}
+        assert delays == {0}
+
+    def test_sync_hook_sleeps_for_reserved_delay(self, clock: FakeClock) -> None:
+        limiter = rate_limit.RateLimiter(global_bucket=rate_limit.TokenBucket(rate=RATE, burst=1))
+        hooks = rate_limit.rate_limit_event_hooks(limiter)["request"]
+        request = _filter_request()
+        for hook in hooks + hooks:
+            hook(request)
+        assert clock.sleeps == [pytest.approx(SLOT)]
+
+    def test_async_hook_waits_in_event_loop(self, clock: FakeClock) -> None:
+        limiter = rate_limit.RateLimiter(global_bucket=rate_limit.TokenBucket(rate=RATE, burst=1))
+        hook = rate_limit.async_rate_limit_event_hooks(limiter)["request"][0]
+        started = time.perf_counter()
+        asyncio.run(_call_twice(hook, _filter_request()))
+        # второй запрос ждёт свой слот в asyncio.sleep, а не в time.sleep
+        assert time.perf_counter() - started >= SLOT
+        assert not clock.sleeps
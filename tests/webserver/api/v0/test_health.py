@@ -2,9 +2,16 @@
 Тесты для проверки здоровья веб-сервера
 """
 
+import asyncio
+
 import httpx
 
-from src.api_clients.webserver import WebServerV0APIClient
+from src.api_clients.webserver import AsyncWebServerV0APIClient, WebServerV0APIClient
+
+
+async def _get_health_async() -> httpx.Response:
+    async with AsyncWebServerV0APIClient() as client:
+        return await client.get_health()
 
 
 class TestWebServerV0Health:
@@ -13,3 +20,7 @@ class TestWebServerV0Health:
     def test_health(self, webserver_v0_api_client: WebServerV0APIClient) -> None:
         response = webserver_v0_api_client.get_health()
         assert response.status_code == httpx.codes.OK
+
+    def test_health_async(self) -> None:
+        response = asyncio.run(_get_health_async())
+        assert response.status_code == httpx.codes.OK
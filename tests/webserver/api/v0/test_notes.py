@@ -3,6 +3,7 @@
 """
 
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import ContextManager, Optional
 from zoneinfo import ZoneInfo
@@ -11,6 +12,8 @@ import httpx
 import pytest
 
 from src.api_clients.webserver import WebServerV0APIClient
+from src.brokers.message_buffer import REQUEST_ID, MessageBuffer, correlation_key
+from src.config import config
 from src.models.models import FullMessage, RequestID
 from utils.string_generator import generate_long_string, generate_test_string
 
@@ -23,11 +26,13 @@ ERROR_FIELD = "error"
 
 # Constants for test data values
 TEXT_TYPE = "text"
+CREATE_OPERATION = "create"
 VALID_SPACE_ID = "869dc163-62aa-4889-9019-07f9c764ce38"
 INVALID_SPACE_ID = "6eabae90-5724-4445-84d8-510774bdee03"
 USER_ID = 123456789
 
 RANDOM_STRING_LENGTH = 100000
+CONCURRENT_NOTES = 10
 
 # Constants for test data messages
 GENERATED_MSG = generate_long_string(RANDOM_STRING_LENGTH)
@@ -54,7 +59,7 @@ class TestWebServerV0Notes:
                     TEXT_FIELD: "Test Note1",
                     SPACE_ID_FIELD: VALID_SPACE_ID,
                     TYPE_FIELD: TEXT_TYPE,
-                    "operation": "create",
+                    "operation": CREATE_OPERATION,
                     "file": "",
                 },
                 id="create text note success",
@@ -214,7 +219,7 @@ class TestWebServerV0Notes:
                     TEXT_FIELD: GENERATED_MSG,
                     SPACE_ID_FIELD: VALID_SPACE_ID,
                     TYPE_FIELD: TEXT_TYPE,
-                    "operation": "create",
+                    "operation": CREATE_OPERATION,
                     "file": "",
                 },
                 id="very long text",
@@ -233,7 +238,7 @@ class TestWebServerV0Notes:
                     TEXT_FIELD: GENERATED_MSG_WITH_DIFFERENT_CHARACTERS,
                     SPACE_ID_FIELD: VALID_SPACE_ID,
                     TYPE_FIELD: TEXT_TYPE,
-                    "operation": "create",
+                    "operation": CREATE_OPERATION,
                     "file": "",
                 },
                 id="very long text with different characters",
@@ -302,6 +307,46 @@ class TestWebServerV0Notes:
             case _:
                 assert response.json() == expected_response
 
+    def test_create_notes_concurrently(
+        self,
+        note_message_buffer: MessageBuffer,
+        webserver_v0_api_client: WebServerV0APIClient,
+    ) -> None:
+        """
+        Параллельно созданные заметки: сообщение каждой находится в очереди по её request_id.
+        """
+        notes = [
+            {
+                USER_ID_FIELD: USER_ID,
+                TEXT_FIELD: f"concurrent note {uuid.uuid4()}",
+                SPACE_ID_FIELD: VALID_SPACE_ID,
+                TYPE_FIELD: TEXT_TYPE,
+            }
+            for _ in range(CONCURRENT_NOTES)
+        ]
+        with ThreadPoolExecutor(max_workers=CONCURRENT_NOTES) as executor:
+            responses = list(executor.map(webserver_v0_api_client.create_note, notes))
+
+        for note, response in zip(notes, responses):
+            check_note_message(note_message_buffer, note, response)
+
+
+def check_note_message(note_message_buffer: MessageBuffer, note: dict, response: httpx.Response) -> None:
+    """
+    Проверяет сообщение о создании заметки, найденное в буфере по request_id ответа.
+    """
+    assert response.status_code == httpx.codes.ACCEPTED, response.text
+    request_id = RequestID.model_validate(response.json()).request_id
+    buffered = note_message_buffer.wait_for(
+        correlation_key(REQUEST_ID, request_id),
+        config.rabbitmq.queue_wait_timeout,
+    )
+    assert buffered is not None, f"no message for request_id {request_id}"
+    real_message = FullMessage.model_validate_json(buffered.body)
+    assert real_message.text == note[TEXT_FIELD]
+    assert real_message.user_id == note[USER_ID_FIELD]
+    assert real_message.operation == CREATE_OPERATION
+
 
 def check_time_difference(
     message_time: datetime, current_time: datetime, max_allowed_diff: int = 2